@@ -18,7 +18,19 @@ OUTPUT_DIR = PROJECT_ROOT / "output"
 
 # v2 paths
 VECTORDB_DIR = DATA_DIR / "vectordb"
+DIVISION_INDEX_FILE = DATA_DIR / "division_index.sqlite"
+LEXICAL_INDEX_FILE = DATA_DIR / "lexical_index.sqlite"
 REGISTRY_FILE = DATA_DIR / "registry.json"
+REGISTRY_DB_FILE = DATA_DIR / "registry.sqlite"
+
+# Registry backend: "sqlite" (WAL, indexli) | "json" (eski registry.json)
+# sqlite ilk acilista registry.json'daki kitaplari bir kez tasir
+REGISTRY_BACKEND = "sqlite"
+
+# PDF hash'i (book_id) bu boyutta parcalarla okunur; dosya bellege alinmaz.
+# Sonuc registry'de (yol, boyut, mtime, inode) parmak iziyle saklanir,
+# degismemis dosyalar tekrar okunmaz.
+PDF_HASH_CHUNK_SIZE = 1024 * 1024
 
 # Create directories
 for directory in [DATA_DIR, INPUT_DIR, PROCESSED_DIR, OUTPUT_DIR, VECTORDB_DIR]:
@@ -57,6 +69,10 @@ DIVISION_PATTERNS = [
     r'(?:Division|Tümen|Tumen)\s+(?:No\.?\s*)?(\d{1,3})',
 ]
 
+# Hizli on filtre: bu kelimelerden hicbirini icermeyen metin regex'e girmez.
+# Yeni bir pattern eklenirse anahtar kelimesi de buraya eklenmeli.
+DIVISION_KEYWORDS = ["Tümen", "Tumen", "Fırka", "Firka", "Division"]
+
 def load_divisions():
     """JSON dosyasından tümen listesini yükle"""
     import json
@@ -100,6 +116,17 @@ if not DIVISIONS_FILE.exists():
 EXTRACTION_CONFIDENCE_THRESHOLD = 0.5
 VERBOSE = True
 
+# PDF parse paralelligi (1 = sirali). Process pool kucuk PDF'lerde ve
+# uygulama icinde (Streamlit) kazanc getirmez; buyuk PDF'lerde
+# "python run.py ingest -j N" ile acilir.
+PDF_PARSE_WORKERS = 1
+PDF_PARSE_PAGES_PER_TASK = 50
+
+# Sayfa metni cache'i (PDF hash + sayfa + parser versiyonu)
+PAGE_CACHE_ENABLED = True
+PAGE_CACHE_FILE = PROCESSED_DIR / "page_cache.sqlite"
+PAGE_CACHE_MAX_MB = 512
+
 # ============================================================================
 # v2 - EMBEDDING & VECTORDB
 # ============================================================================
@@ -107,12 +134,97 @@ VERBOSE = True
 # Embedding model
 EMBEDDING_MODEL = "sentence-transformers/paraphrase-multilingual-MiniLM-L12-v2"
 EMBEDDING_BATCH_SIZE = 32
+EMBEDDING_WARMUP = True  # Model yuklenince kisa bir warmup encode'u
+
+# Embedding backend: "torch" | "onnx" | "int8"
+#   onnx: sentence-transformers ONNX backend'i (pip install optimum[onnxruntime])
+#   int8: torch dinamik int8 quantization (CPU, ek bagimlilik yok)
+# torch disi backend'ler asagidaki metinlerde torch ile ortalama cosine uyumu
+# EMBEDDING_BACKEND_MIN_AGREEMENT'in altinda kalirsa aktif edilmez.
+# Benchmark: python scripts/bench_embedding_backends.py
+EMBEDDING_BACKEND = "torch"
+EMBEDDING_BACKEND_MIN_AGREEMENT = 0.99
+EMBEDDING_BACKEND_CHECK_TEXTS = [
+    "5 nci Kafkas Tümeni Sarıkamış'a doğru ilerlemeye başladı.",
+    "36 ncı Fırka Erzurum'un kuzeyinde savunma mevzilerini tuttu.",
+    "Ordu karargâhı kış şartları nedeniyle ikmal hatlarının kesildiğini bildirdi.",
+    "The 24th Division was ordered to hold the line along the Aras valley.",
+    "Kolordu kumandanı taarruzun şafakla birlikte başlamasını emretti.",
+    "Süvari Tümeni düşmanın sol kanadını çevirmek üzere harekete geçti.",
+    "Bu sayfa bilerek boş bırakılmıştır.",
+    "Sarıkamış",
+]
+
+# Uzunluga gore batch'leme: batch basina (en uzun token x eleman) ust siniri
+EMBEDDING_TOKEN_BUDGET = 4096
+EMBEDDING_MAX_BATCH_SIZE = 256
+
+# Multi-process CPU encode (opt-in): 0/1 = tek process, >1 = worker sayisi.
+# Pool sadece EMBEDDING_POOL_MIN_TEXTS'ten buyuk listelerde kullanilir.
+EMBEDDING_WORKERS = 0
+EMBEDDING_POOL_MIN_TEXTS = 512
+
+# Embedding cache: (model, normalize metin hash'i) -> float32 vektor
+EMBEDDING_CACHE_ENABLED = True
+EMBEDDING_CACHE_FILE = DATA_DIR / "embedding_cache.sqlite"
+EMBEDDING_CACHE_MAX_ENTRIES = 200_000  # 384 boyut ~ 300 MB
+
+# Ingest: parse edilen paragraflar bu boyutta chunk'larla embed edilip
+# VectorDB'ye yazilir (add_book default'u; client'in max batch boyutunu asmaz).
+# Client max batch boyutu bildirmezse delete/update de bu boyutta gruplanir.
+INGEST_BATCH_SIZE = 256
+
+# Paralel ingest_folder (run.py ingest --parallel):
+#   hash + parse -> INGEST_PARSE_WORKERS process (spawn; kitap basina bir gorev)
+#   embedding    -> INGEST_EMBED_THREADS thread
+#   yazma        -> tek yazici (ChromaDB, indexler, registry)
+# Parse edilen paragraflar INGEST_BATCH_SIZE'lik chunk'lar halinde akar;
+# asamalar arasi kuyruklar INGEST_QUEUE_SIZE chunk ile sinirli, bellek
+# kitap boyutundan bagimsiz kalir.
+INGEST_PARSE_WORKERS = max(1, min(4, (os.cpu_count() or 1) // 2))
+INGEST_EMBED_THREADS = 1
+INGEST_QUEUE_SIZE = 4
 
 # ChromaDB
 CHROMA_COLLECTION_NAME = "pagegeneral_docs"
 
+# add_book: chunk N yazilirken chunk N+1 embed edilir; kuyrukta en fazla
+# VECTORDB_PIPELINE_DEPTH hazir chunk bekler (chunk boyutu: INGEST_BATCH_SIZE)
+VECTORDB_PIPELINE_DEPTH = 2
+
 # VectorDB search
 DEFAULT_TOP_K = 20
+QUERY_CACHE_SIZE = 1024  # Sorgu embedding LRU cache'i (process geneli)
+
+# Arama sonucu cache'i: (sorgu, kitaplar, top_k, ...) + koleksiyon versiyonu.
+# add_book/delete_book versiyonu artirir, eski kayitlar kendiliginden gecersiz
+# olur. TTL, baska process'in (or. CLI ingest) yaptigi degisiklikler icin.
+SEARCH_CACHE_ENABLED = True
+SEARCH_CACHE_MAX_ENTRIES = 512
+SEARCH_CACHE_MAX_MB = 64
+SEARCH_CACHE_TTL_SECONDS = 600
+
+# Eszamanli oturumlarin sorgulari tek encode'da toplanir
+QUERY_BATCHING_ENABLED = True
+QUERY_BATCH_MAX_SIZE = 32
+QUERY_BATCH_MAX_WAIT_MS = 5
+QUERY_BATCH_TIMEOUT_SECONDS = 60  # embed() en fazla bu kadar bekler
+
+# Division metadata yenileme (run.py redetect) okuma/yazma batch boyutu
+REDETECT_BATCH_SIZE = 1000
+
+# search_many: sorgular tek seferde embed edilir, ChromaDB'ye bu boyutta
+# query_embeddings chunk'lari halinde gonderilir
+SEARCH_MANY_CHUNK_SIZE = 100
+
+# Hybrid search (BM25 + vector): her ayaktan en az bu kadar aday alinir,
+# siralamalar reciprocal rank fusion ile birlestirilir (skor = sum 1 / (k + rank))
+HYBRID_CANDIDATES = 50
+HYBRID_RRF_K = 60
+
+# VectorDB'den okuma (export, ozet, liste) sayfa boyutu: bellek kullanimi
+# koleksiyon boyutundan bagimsiz olarak bu kadar paragrafla sinirli kalir
+VECTORDB_PAGE_SIZE = 1000
 
 # ============================================================================
 # v2 - LOGGING
@@ -4,8 +4,16 @@ PageGeneral - CLI
 
 Kullanım:
   python run.py ingest              # PDF'leri VectorDB'ye yükle
+  python run.py ingest -p           # Paralel ingest (parse/embed/yazma aşamaları)
+  python run.py ingest kitap.pdf -j 4  # Büyük PDF: sayfaları 4 process'te çıkar
+  python run.py ingest --resume     # Yarım kalan ingest'e kaldığı yerden devam
+  python run.py ingest yeni.pdf -u ID  # Yeni baskı: sadece değişen sayfalar
   python run.py query -s            # Tümen özeti
   python run.py query -d            # Sadece tümen içeren paragrafları export et
+  python run.py query -t 24         # 24. Tümen referansları (bağlamıyla)
+  python run.py search -f q.txt     # Toplu arama (satır başına sorgu), NDJSON çıktı
+  python run.py redetect            # Pattern değişince tümen metadata'sını yenile
+  python run.py migrate             # Eski VectorDB'ye tümen filtre anahtarlarını ekle
 """
 
 # PyTorch DLL fix
@@ -15,6 +23,8 @@ except ImportError:
     pass
 
 import argparse
+import json
+import sys
 from pathlib import Path
 
 
@@ -22,20 +32,28 @@ def cmd_ingest(args):
     """PDF → VectorDB"""
     from src.ingest import IngestPipeline
 
-    pipeline = IngestPipeline()
+    pipeline = IngestPipeline(embed_workers=args.embed_workers, parse_workers=args.parse_workers)
 
     if args.path:
         path = Path(args.path)
-        if path.is_file():
-            result = pipeline.ingest_pdf(path, force=args.force)
+        if path.is_file() and args.update:
+            result = pipeline.update_pdf(path, args.update)
+        elif path.is_file():
+            result = pipeline.ingest_pdf(path, force=args.force, resume=args.resume)
         else:
-            result = pipeline.ingest_folder(path, force=args.force)
+            result = pipeline.ingest_folder(
+                path, force=args.force, parallel=args.parallel, parse_workers=args.parse_workers, resume=args.resume
+            )
     else:
-        result = pipeline.ingest_folder(force=args.force)
+        result = pipeline.ingest_folder(
+            force=args.force, parallel=args.parallel, parse_workers=args.parse_workers, resume=args.resume
+        )
 
     if result["status"] == "success":
         count = result.get('processed', result.get('paragraphs', 0))
         print(f"\n[OK] VectorDB'ye yuklendi: {count}")
+        if "added" in result:
+            print(f"     Eklenen: {result['added']}, korunan: {result['kept']}, silinen: {result['deleted']}")
     elif result["status"] == "skipped":
         print(f"\n[SKIP] Zaten yuklu")
     else:
@@ -55,6 +73,13 @@ def cmd_query(args):
             print(f"  - {b['title']} ({b['paragraphs']} paragraf)")
         return
 
+    if args.division:
+        lines = query.concordance(args.division, book_id=args.book)
+        print(f"\n{args.division}. Tumen: {len(lines)} referans")
+        for line in lines:
+            print(f"  [{line['book_name']} s.{line['page']}] ...{line['left']} [{line['match']}] {line['right']}...")
+        return
+
     if args.summary:
         summary = query.get_divisions_summary(args.book)
         print(f"\nOzet:")
@@ -75,6 +100,64 @@ def cmd_query(args):
     print(f"  Tumenler: {result['divisions_found']}")
 
 
+def cmd_search(args):
+    """Semantic search; --queries-file ile toplu, sonuclar NDJSON"""
+    from src.vector_store import VectorStore
+
+    if args.queries_file:
+        with open(args.queries_file, encoding="utf-8") as f:
+            queries = [line.strip() for line in f if line.strip()]
+    elif args.query:
+        queries = [args.query]
+    else:
+        print("[ERROR] Sorgu veya --queries-file gerekli")
+        return
+
+    store = VectorStore()
+    results = store.iter_search_many(
+        queries,
+        book_ids=args.book,
+        top_k=args.top_k,
+        divisions=args.division
+    )
+    # Her satir bir sorgu: {"query": "...", "results": [...]}
+    for query, hits in results:
+        sys.stdout.write(json.dumps({"query": query, "results": hits}, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+
+def cmd_redetect(args):
+    """VectorDB'deki division metadata'sini yeniden tespit et (embedding yok)"""
+    from src.vector_store import VectorStore
+
+    store = VectorStore()
+    result = store.redetect_divisions(book_id=args.book)
+    index = store.division_index.get_stats()
+
+    print(f"\n[OK] Division metadata yenilendi")
+    print(f"  Taranan: {result['scanned']}")
+    print(f"  Guncellenen: {result['updated']}")
+    print(f"  Index: {index['mentions']} referans")
+    print(f"  Sure: {result['seconds']}s")
+
+
+def cmd_migrate(args):
+    """Eski koleksiyonlara has_division / div_<no> metadata'sini ekle, division ve BM25 index'lerini olustur"""
+    from src.vector_store import VectorStore
+
+    store = VectorStore()
+    result = store.migrate_division_metadata()
+    index = store.division_index.rebuild(store)
+    lexical = store.lexical_index.rebuild(store)
+
+    print(f"\n[OK] Division metadata migrate edildi")
+    print(f"  Taranan: {result['scanned']}")
+    print(f"  Guncellenen: {result['updated']}")
+    print(f"  Index: {index['mentions']} referans")
+    print(f"  BM25 index: {lexical['paragraphs']} paragraf")
+    print(f"  Sure: {result['seconds']}s")
+
+
 def main():
     parser = argparse.ArgumentParser(description="PageGeneral CLI")
     subparsers = parser.add_subparsers(dest="command")
@@ -83,6 +166,11 @@ def main():
     p1 = subparsers.add_parser("ingest", help="PDF → VectorDB")
     p1.add_argument("path", nargs="?", help="PDF/klasör")
     p1.add_argument("-f", "--force", action="store_true")
+    p1.add_argument("-w", "--embed-workers", type=int, help="Multi-process embedding worker sayısı")
+    p1.add_argument("-j", "--parse-workers", type=int, help="PDF parse process sayısı (varsayılan: 1, sıralı)")
+    p1.add_argument("-p", "--parallel", action="store_true", help="Klasör: aşamalı paralel ingest (parse/embed/yazma)")
+    p1.add_argument("-r", "--resume", action="store_true", help="Yarım kalan kitaplara checkpoint'ten devam et")
+    p1.add_argument("-u", "--update", metavar="BOOK_ID", help="PDF: kitabın yeni baskısı (sadece değişen sayfalar)")
 
     # query
     p2 = subparsers.add_parser("query", help="VectorDB → JSON")
@@ -91,6 +179,22 @@ def main():
     p2.add_argument("-s", "--summary", action="store_true")
     p2.add_argument("-l", "--list", action="store_true")
     p2.add_argument("-o", "--output", help="Çıktı dosyası")
+    p2.add_argument("-t", "--division", help="Tümen no: referansları bağlamıyla göster")
+
+    # redetect
+    p3 = subparsers.add_parser("redetect", help="Tümen metadata'sını yeniden tespit et")
+    p3.add_argument("-b", "--book", help="Kitap ID (varsayılan: hepsi)")
+
+    # search
+    p4 = subparsers.add_parser("search", help="Semantic search (NDJSON)")
+    p4.add_argument("query", nargs="?", help="Sorgu")
+    p4.add_argument("-f", "--queries-file", help="Satır başına bir sorgu içeren dosya")
+    p4.add_argument("-b", "--book", action="append", help="Kitap ID (tekrarlanabilir)")
+    p4.add_argument("-t", "--division", action="append", help="Tümen no (tekrarlanabilir)")
+    p4.add_argument("-k", "--top-k", type=int, help="Sorgu başına sonuç sayısı")
+
+    # migrate
+    subparsers.add_parser("migrate", help="Tümen filtre metadata'sını ve index'leri oluştur (eski VectorDB)")
 
     args = parser.parse_args()
 
@@ -98,6 +202,12 @@ def main():
         cmd_ingest(args)
     elif args.command == "query":
         cmd_query(args)
+    elif args.command == "search":
+        cmd_search(args)
+    elif args.command == "redetect":
+        cmd_redetect(args)
+    elif args.command == "migrate":
+        cmd_migrate(args)
     else:
         parser.print_help()
 
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+PAGEGENERAL - Division Detection Micro-Benchmark
+Eski (her çağrıda compile + findall) ile önceden compile edilmiş detector karşılaştırması
+
+Kullanım:
+  python scripts/bench_divisions.py                 # Sentetik metin
+  python scripts/bench_divisions.py kitap.pdf       # Gerçek PDF paragrafları
+"""
+
+import sys
+import random
+import re
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.pdf_parser import PDFParser, get_detector
+
+
+def legacy_detect_divisions(text: str):
+    """Eski implementasyon: her çağrıda compile, pattern başına findall"""
+    divisions = set()
+    patterns = [re.compile(p, re.IGNORECASE) for p in config.DIVISION_PATTERNS]
+    for pattern in patterns:
+        for match in pattern.findall(text):
+            div_num = str(match).strip()
+            if div_num.isdigit():
+                divisions.add(div_num)
+    return divisions
+
+
+def synthetic_pages(num_pages: int = 700, paragraphs_per_page: int = 6):
+    """Sentetik sayfalar: paragrafların ~%15'i tümen referansı içerir"""
+    random.seed(42)
+    words = ("Sarıkamış Erzurum harekât cephe ordu kolordu alay tabur taarruz "
+             "savunma kış Aras vadisi mevzi ikmal kuvvet").split()
+    # Son ikisi farklı pattern'lerin örtüşen eşleşmeleri (ör. "Tümen 7" ve "Tümen 191")
+    mentions = ["{n} nci Tümen", "{n}. Fırka", "{n}th Division", "Tümen No. {n}", "{n} ncı Kafkas Tümeni",
+                "{n}. Tümen {m} alay", "{n} üncü Tümen 1915"]
+
+    pages = []
+    for _ in range(num_pages):
+        paragraphs = []
+        for _ in range(paragraphs_per_page):
+            text = " ".join(random.choice(words) for _ in range(random.randint(5, 120)))
+            if random.random() < 0.15:
+                text += " " + random.choice(mentions).format(n=random.randint(1, 60), m=random.randint(1, 9))
+            paragraphs.append(text)
+        pages.append(paragraphs)
+    return pages
+
+
+def pdf_pages(pdf_path: Path):
+    """PDF'ten sayfa bazlı paragraf metinleri"""
+    parser = PDFParser()
+    return [
+        [p["text"] for p in page_paragraphs]
+        for _, _, page_paragraphs in parser.iter_pages(pdf_path)
+        if page_paragraphs
+    ]
+
+
+def timed(label: str, func, repeat: int = 3):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    print(f"  {label:<32} {best * 1000:9.1f} ms")
+    return best, result
+
+
+def main():
+    config.VERBOSE = False
+    pages = pdf_pages(Path(sys.argv[1])) if len(sys.argv) > 1 else synthetic_pages()
+    paragraphs = [p for page in pages for p in page]
+    detector = get_detector()
+
+    print(f"\n{len(pages)} sayfa, {len(paragraphs)} paragraf\n")
+
+    legacy_time, legacy = timed("eski (paragraf başına)", lambda: [legacy_detect_divisions(p) for p in paragraphs])
+    single_time, single = timed("detector.detect (paragraf)", lambda: [set(detector.detect(p)[0]) for p in paragraphs])
+    batch_time, batch = timed(
+        "detector.detect_many (sayfa)",
+        lambda: [set(divs) for page in pages for divs, _ in detector.detect_many(page)]
+    )
+
+    agree = sum(1 for a, b in zip(legacy, batch) if a == b)
+    print(f"\n  Hızlanma (paragraf): {legacy_time / single_time:6.1f}x")
+    print(f"  Hızlanma (sayfa):    {legacy_time / batch_time:6.1f}x")
+    print(f"  Eski ile uyum:       {agree}/{len(paragraphs)} paragraf")
+    if single != batch:
+        print("  [WARN] detect ve detect_many sonuçları farklı")
+
+
+if __name__ == "__main__":
+    main()
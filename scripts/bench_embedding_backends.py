@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+PAGEGENERAL - Embedding Backend Benchmark
+torch / onnx / int8 backend'lerinin yükleme süresi, hız ve torch ile uyumu
+
+Kullanım:
+  python scripts/bench_embedding_backends.py                 # VectorDB'deki paragraflar
+  python scripts/bench_embedding_backends.py kitap.pdf       # Gerçek PDF paragrafları
+  python scripts/bench_embedding_backends.py kitap.pdf 500   # En fazla 500 paragraf
+
+Uyum, get_model()'un backend kontrolunde kullandigi
+EMBEDDING_BACKEND_CHECK_TEXTS disindaki metinlerde olculur.
+"""
+
+import sys
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.embedder import _load_backend, backend_agreement
+from src.pdf_parser import PDFParser
+from src.vector_store import VectorStore
+
+BACKENDS = ["torch", "onnx", "int8"]
+
+
+def pdf_paragraphs(pdf_path: Path, limit: int):
+    """PDF'ten ilk `limit` paragraf"""
+    texts = []
+    for paragraph in PDFParser().iter_paragraphs(pdf_path):
+        texts.append(paragraph["text"])
+        if len(texts) >= limit:
+            break
+    return texts
+
+
+def collection_paragraphs(limit: int):
+    """VectorDB'deki ilk `limit` paragraf (kontrol metinleri haric)"""
+    check_texts = set(config.EMBEDDING_BACKEND_CHECK_TEXTS)
+    texts = []
+    for batch in VectorStore().iter_paragraphs(include=["documents"]):
+        texts.extend(text for text in batch["documents"] if text not in check_texts)
+        if len(texts) >= limit:
+            break
+    return texts[:limit]
+
+
+def main():
+    config.VERBOSE = False
+    if len(sys.argv) > 1:
+        limit = int(sys.argv[2]) if len(sys.argv) > 2 else 256
+        texts = pdf_paragraphs(Path(sys.argv[1]), limit)
+    else:
+        texts = collection_paragraphs(256)
+    if not texts:
+        print("Olculecek paragraf yok: once kitap yukleyin veya bir PDF verin")
+        return
+
+    print(f"\nModel: {config.EMBEDDING_MODEL}")
+    print(f"{len(texts)} metin, eşik: ortalama cosine >= {config.EMBEDDING_BACKEND_MIN_AGREEMENT}\n")
+    print(f"  {'backend':<8} {'yükleme':>9} {'metin/s':>9} {'ort. cos':>9} {'min cos':>9}  durum")
+
+    reference = None
+    for backend in BACKENDS:
+        start = time.perf_counter()
+        try:
+            model = _load_backend(config.EMBEDDING_MODEL, backend)
+        except Exception as e:
+            print(f"  {backend:<8} yüklenemedi: {e}")
+            continue
+        load_seconds = time.perf_counter() - start
+
+        model.encode(texts[:8], show_progress_bar=False)
+        start = time.perf_counter()
+        model.encode(texts, batch_size=config.EMBEDDING_BATCH_SIZE, show_progress_bar=False)
+        throughput = len(texts) / (time.perf_counter() - start)
+
+        if reference is None:
+            reference = model
+        agreement = backend_agreement(model, reference, texts)
+        passed = agreement["mean"] >= config.EMBEDDING_BACKEND_MIN_AGREEMENT
+        print(
+            f"  {backend:<8} {load_seconds:8.2f}s {throughput:9.1f} "
+            f"{agreement['mean']:9.4f} {agreement['min']:9.4f}  {'OK' if passed else 'RED'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
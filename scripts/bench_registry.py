@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+PAGEGENERAL - Registry Benchmark
+JSON (registry.json) ve SQLite registry backend'lerinin karşılaştırması
+
+Kullanım:
+  python scripts/bench_registry.py              # 10.000 kitap
+  python scripts/bench_registry.py 50000        # Kitap sayısı
+"""
+
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import config
+from src.registry import BookRegistry, SQLiteBookRegistry
+
+OPERATIONS = 200
+
+
+def synthetic_books(count: int):
+    """Sentetik registry kayıtları"""
+    return [
+        {
+            "id": f"{i:012x}",
+            "filename": f"kitap_{i}.pdf",
+            "title": f"Kitap {i}",
+            "pages": random.randint(50, 800),
+            "paragraphs": random.randint(100, 5000),
+            "ingested_at": "2025-01-01T00:00:00",
+            "status": random.choice(["ready", "ready", "ready", "error"])
+        }
+        for i in range(count)
+    ]
+
+
+def timed(label: str, func, count: int = OPERATIONS) -> float:
+    start = time.perf_counter()
+    for i in range(count):
+        func(i)
+    per_op = (time.perf_counter() - start) / count * 1000
+    print(f"  {label:<28} {per_op:9.3f} ms/işlem")
+    return per_op
+
+
+def bench(registry, ids):
+    results = {}
+    results["exists_by_id"] = timed("exists_by_id", lambda i: registry.exists_by_id(random.choice(ids)))
+    results["get"] = timed("get", lambda i: registry.get(random.choice(ids)))
+    results["get_by_filename"] = timed(
+        "get_by_filename", lambda i: registry.get_by_filename(f"kitap_{random.randrange(len(ids))}.pdf")
+    )
+    results["update_status"] = timed("update_status", lambda i: registry.update_status(random.choice(ids), "ready"))
+    results["update_metadata"] = timed(
+        "update_metadata", lambda i: registry.update_metadata(random.choice(ids), {"paragraphs": i})
+    )
+    results["list_ready"] = timed("list_ready", lambda i: registry.list_ready(), count=20)
+    results["get_stats"] = timed("get_stats", lambda i: registry.get_stats(), count=20)
+    return results
+
+
+def main():
+    config.VERBOSE = False
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    random.seed(42)
+    books = synthetic_books(count)
+    ids = [book["id"] for book in books]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = Path(tmp) / "registry.json"
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({"books": books}, f, ensure_ascii=False, indent=2)
+
+        print(f"\n{count} kitap\n")
+        print("JSON:")
+        json_results = bench(BookRegistry(json_path), ids)
+
+        print("\nSQLite:")
+        start = time.perf_counter()
+        sqlite_registry = SQLiteBookRegistry(Path(tmp) / "registry.sqlite", json_path)
+        sqlite_registry.get_stats()
+        print(f"  {'JSON migration':<28} {(time.perf_counter() - start) * 1000:9.1f} ms (bir kez)")
+        sqlite_results = bench(sqlite_registry, ids)
+
+    print("\nHızlanma (JSON / SQLite):")
+    for name, json_ms in json_results.items():
+        print(f"  {name:<28} {json_ms / max(sqlite_results[name], 1e-6):9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
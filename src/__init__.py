@@ -8,7 +8,7 @@ Modül 2: query  - VectorDB → JSON
 from .pdf_parser import PDFParser
 from .embedder import Embedder
 from .vector_store import VectorStore
-from .registry import BookRegistry
+from .registry import BookRegistry, SQLiteBookRegistry, get_registry
 from .ingest import IngestPipeline
 from .query import DivisionQuery
 
@@ -17,6 +17,8 @@ __all__ = [
     "Embedder",
     "VectorStore",
     "BookRegistry",
+    "SQLiteBookRegistry",
+    "get_registry",
     "IngestPipeline",
     "DivisionQuery"
 ]
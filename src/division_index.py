@@ -0,0 +1,296 @@
+"""
+PageGeneral v2 - Division Index
+Tumen no -> (kitap, paragraf, sayfa, eslesme konumu) ters indeksi (SQLite)
+"""
+
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import DIVISION_INDEX_FILE, get_logger
+from src.pdf_parser import get_detector
+from src.sqlite_store import SQLiteStore
+
+logger = get_logger(__name__)
+
+
+class DivisionIndex(SQLiteStore):
+    """
+    Tumen referanslarinin kalici ters indeksi.
+
+    VectorDB'nin yaninda tutulur: paragraflari IngestPipeline ekler, silme ve
+    redetect VectorStore.division_index uzerinden ayni anda uygulanir.
+    Sadece tumen iceren paragraflar (metinleriyle birlikte) saklanir;
+    "24. tumeni anan tum paragraflar" sorgusu koleksiyon taramasi
+    yapmadan index uzerinden cevaplanir.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS paragraphs (
+            para_id TEXT PRIMARY KEY,
+            book_id TEXT NOT NULL,
+            book_name TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            text TEXT NOT NULL
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS mentions (
+            division TEXT NOT NULL,
+            book_id TEXT NOT NULL,
+            para_id TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            start INTEGER NOT NULL,
+            end INTEGER NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_mentions_division ON mentions(division, book_id, page)",
+        "CREATE INDEX IF NOT EXISTS idx_mentions_para ON mentions(para_id)",
+        "CREATE INDEX IF NOT EXISTS idx_mentions_book ON mentions(book_id)",
+        "CREATE INDEX IF NOT EXISTS idx_paragraphs_book ON paragraphs(book_id)",
+    )
+
+    def __init__(self, db_path: Path = None):
+        super().__init__(db_path or DIVISION_INDEX_FILE)
+
+    def add_paragraphs(self, book_id: str, ids: List[str], paragraphs: List[Dict]) -> int:
+        """
+        Paragraflardaki tumen referanslarini indekse ekle.
+
+        Eslesme konumlari detector ile bulunur; tumen icermeyen paragraflar
+        atlanir. Ayni ID tekrar eklenirse eski kayitlar degistirilir.
+
+        Args:
+            book_id: Kitap ID
+            ids: VectorDB paragraf ID'leri
+            paragraphs: Paragraflar ("text", "page", "division", "book_name")
+
+        Returns:
+            Eklenen referans sayisi
+        """
+        detector = get_detector()
+        para_rows = []
+        mention_rows = []
+
+        for para_id, para in zip(ids, paragraphs):
+            if not para.get("division"):
+                continue
+            text = para["text"]
+            page = para.get("page", 0)
+            para_rows.append((para_id, book_id, para.get("book_name", ""), page, text))
+            for division, start, end in detector.find(text):
+                mention_rows.append((division, book_id, para_id, page, start, end))
+
+        if not para_rows:
+            return 0
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "DELETE FROM mentions WHERE para_id = ?",
+                [(row[0],) for row in para_rows]
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO paragraphs (para_id, book_id, book_name, page, text) VALUES (?, ?, ?, ?, ?)",
+                para_rows
+            )
+            conn.executemany(
+                "INSERT INTO mentions (division, book_id, para_id, page, start, end) VALUES (?, ?, ?, ?, ?, ?)",
+                mention_rows
+            )
+
+        return len(mention_rows)
+
+    def add_records(self, ids: List[str], documents: List[str], metadatas: List[Dict]) -> Dict:
+        """
+        VectorDB kayitlarini (ID, dokuman, metadata) indekse ekle.
+
+        Kayitlar birden fazla kitaba ait olabilir; tumen listesi metadata'daki
+        "division" string'inden okunur.
+
+        Returns:
+            {"paragraphs": 12, "mentions": 15}
+        """
+        by_book = {}
+        for para_id, document, meta in zip(ids, documents, metadatas):
+            division_str = meta.get("division", "")
+            if not division_str:
+                continue
+            book_ids, paras = by_book.setdefault(meta.get("book_id", ""), ([], []))
+            book_ids.append(para_id)
+            paras.append({
+                "text": document,
+                "page": meta.get("page", 0),
+                "book_name": meta.get("book_name", ""),
+                "division": division_str.split(",")
+            })
+
+        paragraphs = 0
+        mentions = 0
+        for book_id, (book_ids, paras) in by_book.items():
+            mentions += self.add_paragraphs(book_id, book_ids, paras)
+            paragraphs += len(book_ids)
+        return {"paragraphs": paragraphs, "mentions": mentions}
+
+    def delete_paragraphs(self, ids: List[str]):
+        """Verilen paragraflarin kayitlarini sil"""
+        rows = [(para_id,) for para_id in ids]
+        with self._transaction() as conn:
+            conn.executemany("DELETE FROM mentions WHERE para_id = ?", rows)
+            conn.executemany("DELETE FROM paragraphs WHERE para_id = ?", rows)
+
+    def delete_book(self, book_id: str):
+        """Kitabin tum kayitlarini sil"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM mentions WHERE book_id = ?", (book_id,))
+            conn.execute("DELETE FROM paragraphs WHERE book_id = ?", (book_id,))
+
+    def rebuild(self, vector_store, book_id: str = None) -> Dict:
+        """
+        Indeksi VectorDB'deki division metadata'sindan yeniden olustur.
+
+        Pattern degisikligi (redetect) veya mevcut koleksiyonlar icin;
+        sadece has_division=True olan paragraflar okunur.
+
+        Returns:
+            {"paragraphs": 45, "mentions": 61, "seconds": 0.3}
+        """
+        start = time.perf_counter()
+        with self._transaction() as conn:
+            if book_id:
+                conn.execute("DELETE FROM mentions WHERE book_id = ?", (book_id,))
+                conn.execute("DELETE FROM paragraphs WHERE book_id = ?", (book_id,))
+            else:
+                conn.execute("DELETE FROM mentions")
+                conn.execute("DELETE FROM paragraphs")
+
+        paragraphs = 0
+        mentions = 0
+        for page in vector_store.iter_paragraphs(book_id, where={"has_division": True}):
+            added = self.add_records(page["ids"], page["documents"], page["metadatas"])
+            paragraphs += added["paragraphs"]
+            mentions += added["mentions"]
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Division index olusturuldu: {paragraphs} paragraf, {mentions} referans ({elapsed:.1f}s)")
+        return {
+            "paragraphs": paragraphs,
+            "mentions": mentions,
+            "seconds": round(elapsed, 2)
+        }
+
+    def lookup(self, division: str, book_id: str = None, limit: int = None) -> List[Dict]:
+        """
+        Tumeni anan paragraflar (kitap ve sayfa sirasiyla).
+
+        Returns:
+            [
+                {
+                    "id": "abc123_para_5",
+                    "book_id": "abc123",
+                    "book_name": "Kitap Adi",
+                    "page": 241,
+                    "text": "Paragraf metni...",
+                    "spans": [[12, 25]]
+                }
+            ]
+        """
+        sql = (
+            "SELECT m.para_id, m.book_id, p.book_name, m.page, p.text, m.start, m.end "
+            "FROM mentions m JOIN paragraphs p ON p.para_id = m.para_id "
+            "WHERE m.division = ?"
+        )
+        params = [str(division)]
+        if book_id:
+            sql += " AND m.book_id = ?"
+            params.append(book_id)
+        sql += " ORDER BY m.book_id, m.page, m.para_id, m.start"
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+
+        results = []
+        by_id = {}
+        for para_id, book, book_name, page, text, start, end in rows:
+            entry = by_id.get(para_id)
+            if entry is None:
+                if limit and len(results) >= limit:
+                    continue
+                entry = {
+                    "id": para_id,
+                    "book_id": book,
+                    "book_name": book_name,
+                    "page": page,
+                    "text": text,
+                    "spans": []
+                }
+                by_id[para_id] = entry
+                results.append(entry)
+            entry["spans"].append([start, end])
+        return results
+
+    def concordance(
+        self,
+        division: str,
+        width: int = 60,
+        book_id: str = None,
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        Keyword-in-context: her referans icin solunda/saginda width karakter.
+
+        Returns:
+            [{"id": ..., "book_name": ..., "page": 241,
+              "left": "...", "match": "24 ncu Tumen", "right": "..."}]
+        """
+        lines = []
+        for entry in self.lookup(division, book_id):
+            text = entry["text"]
+            for start, end in entry["spans"]:
+                if limit and len(lines) >= limit:
+                    return lines
+                lines.append({
+                    "id": entry["id"],
+                    "book_id": entry["book_id"],
+                    "book_name": entry["book_name"],
+                    "page": entry["page"],
+                    "left": " ".join(text[max(0, start - width):start].split()),
+                    "match": text[start:end],
+                    "right": " ".join(text[end:end + width].split())
+                })
+        return lines
+
+    def list_divisions(self, book_id: str = None) -> Dict[str, int]:
+        """Tumen no -> referans iceren paragraf sayisi"""
+        sql = "SELECT division, COUNT(DISTINCT para_id) FROM mentions"
+        params = []
+        if book_id:
+            sql += " WHERE book_id = ?"
+            params.append(book_id)
+        sql += " GROUP BY division"
+
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return dict(sorted(rows, key=lambda x: int(x[0]) if x[0].isdigit() else 0))
+
+    def get_stats(self) -> dict:
+        """Index istatistikleri"""
+        with self._lock:
+            paragraphs = self.conn.execute("SELECT COUNT(*) FROM paragraphs").fetchone()[0]
+            mentions, divisions = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT division) FROM mentions"
+            ).fetchone()
+        return {
+            "paragraphs": paragraphs,
+            "mentions": mentions,
+            "divisions": divisions
+        }
+
+
+# Test
+if __name__ == "__main__":
+    index = DivisionIndex()
+    print("Division Index Stats:", index.get_stats())
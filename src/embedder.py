@@ -3,29 +3,254 @@ PageGeneral v2 - Embedder
 Sentence Transformers ile metin embedding
 """
 
-from typing import List, Union
+import atexit
+import inspect
+import os
+import threading
+import time
+from functools import lru_cache
+from typing import Dict, List, Optional, Union
 from pathlib import Path
 
+import numpy as np
+from tqdm import tqdm
+
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, get_logger
+from config import (
+    EMBEDDING_MODEL, EMBEDDING_BATCH_SIZE, EMBEDDING_TOKEN_BUDGET, EMBEDDING_MAX_BATCH_SIZE,
+    EMBEDDING_WORKERS, EMBEDDING_POOL_MIN_TEXTS, EMBEDDING_CACHE_ENABLED, EMBEDDING_WARMUP,
+    EMBEDDING_BACKEND, EMBEDDING_BACKEND_MIN_AGREEMENT, EMBEDDING_BACKEND_CHECK_TEXTS, get_logger
+)
+from src.embedding_cache import EmbeddingCache, normalize_text
 
 logger = get_logger(__name__)
 
-# Lazy loading - model sadece ihtiyac olunca yuklenir
-_model = None
+# Process genelinde paylasilan modeller: model_key -> SentenceTransformer
+_models: Dict[str, object] = {}
+_model_stats: Dict[str, dict] = {}
+_models_lock = threading.Lock()
+
+
+def _rss_mb() -> Optional[float]:
+    """Process'in resident bellek kullanimi (MB), olculemezse None"""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def model_key(model_name: str, backend: str) -> str:
+    """Registry ve cache anahtari: torch disi backend'ler ayri tutulur"""
+    return model_name if backend == "torch" else f"{model_name}#{backend}"
+
+
+def resolve_backend(model_name: str, backend: str) -> str:
+    """Yuklu modelin gercekte kullandigi backend (reddedilen backend -> "torch")"""
+    stats = _model_stats.get(model_key(model_name, backend))
+    return stats["backend"] if stats else backend
+
+
+def _load_backend(model_name: str, backend: str):
+    """
+    Modeli istenen backend ile yukle.
+
+    - torch: standart SentenceTransformer
+    - onnx:  sentence-transformers ONNX backend'i (optimum[onnxruntime] gerekir)
+    - int8:  Linear katmanlari dinamik int8 quantize edilmis CPU modeli
+    """
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(model_name)
+    if backend == "onnx":
+        return SentenceTransformer(model_name, backend="onnx")
+    if backend == "int8":
+        import torch
+        model = SentenceTransformer(model_name, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    raise ValueError(f"Bilinmeyen embedding backend: {backend}")
+
+
+def backend_agreement(model, reference, texts: List[str]) -> Dict[str, float]:
+    """
+    Iki modelin ayni metinlerdeki embedding'leri arasindaki cosine benzerligi.
+
+    Returns:
+        {"mean": 0.998, "min": 0.991}
+    """
+    a = np.asarray(model.encode(texts, show_progress_bar=False, convert_to_numpy=True), dtype=np.float32)
+    b = np.asarray(reference.encode(texts, show_progress_bar=False, convert_to_numpy=True), dtype=np.float32)
+    cosine = (a * b).sum(axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    return {"mean": float(cosine.mean()), "min": float(cosine.min())}
+
+
+def get_model(model_name: str = None, warmup: bool = None, backend: str = None):
+    """
+    Embedding modelini getir (process genelinde tek kopya).
+
+    Ilk cagrida model yuklenir (thread-safe) ve istenirse kisa bir warmup
+    encode'u yapilir; sonraki cagrilar ayni nesneyi dondurur.
+
+    torch disi backend'ler aktif edilmeden once EMBEDDING_BACKEND_CHECK_TEXTS
+    uzerinde torch modeliyle karsilastirilir; ortalama cosine uyumu
+    EMBEDDING_BACKEND_MIN_AGREEMENT'in altindaysa (veya backend
+    yuklenemezse) torch modeli kullanilir; model torch anahtariyla da
+    kaydedilir ve resolve_backend() "torch" dondurur.
+
+    Args:
+        model_name: Model adi (default: config'den)
+        warmup: Yuklemeden sonra warmup encode'u (default: EMBEDDING_WARMUP)
+        backend: "torch" | "onnx" | "int8" (default: EMBEDDING_BACKEND)
+    """
+    model_name = model_name or EMBEDDING_MODEL
+    backend = backend or EMBEDDING_BACKEND
+    key = model_key(model_name, backend)
+
+    model = _models.get(key)
+    if model is not None:
+        return model
+
+    with _models_lock:
+        if key in _models:
+            return _models[key]
+
+        logger.info(f"Embedding model yukleniyor: {model_name} (backend: {backend})")
+        rss_before = _rss_mb()
+        start = time.perf_counter()
+
+        active_backend = backend
+        agreement = None
+        if backend == "torch":
+            model = _load_backend(model_name, "torch")
+        else:
+            reference = _models.get(model_name) or _load_backend(model_name, "torch")
+            try:
+                model = _load_backend(model_name, backend)
+                agreement = backend_agreement(model, reference, EMBEDDING_BACKEND_CHECK_TEXTS)
+            except Exception as e:
+                logger.error(f"{backend} backend yuklenemedi: {e}")
+                model = None
+
+            if model is None or agreement["mean"] < EMBEDDING_BACKEND_MIN_AGREEMENT:
+                if agreement:
+                    logger.error(
+                        f"{backend} backend reddedildi: torch ile uyum {agreement['mean']:.4f} "
+                        f"< {EMBEDDING_BACKEND_MIN_AGREEMENT}"
+                    )
+                logger.warning("torch backend kullaniliyor")
+                model = reference
+                active_backend = "torch"
+            del reference
+
+        load_seconds = time.perf_counter() - start
+
+        warmup_seconds = 0.0
+        if EMBEDDING_WARMUP if warmup is None else warmup:
+            start = time.perf_counter()
+            model.encode(["warmup"], show_progress_bar=False)
+            warmup_seconds = time.perf_counter() - start
+
+        rss_after = _rss_mb()
+        _model_stats[key] = {
+            "backend": active_backend,
+            "agreement": agreement,
+            "load_seconds": round(load_seconds, 2),
+            "warmup_seconds": round(warmup_seconds, 2),
+            "rss_mb": round(rss_after, 1) if rss_after is not None else None,
+            "rss_delta_mb": round(rss_after - rss_before, 1) if rss_after is not None and rss_before is not None else None
+        }
+        _models[key] = model
+        if active_backend != backend:
+            # Fallback torch anahtariyla da kayitli: torch isteyenler ikinci kopya yuklemez
+            _models.setdefault(model_name, model)
+            _model_stats.setdefault(model_name, _model_stats[key])
+        logger.info(f"Embedding model yuklendi: {key} {_model_stats[key]}")
+
+    return model
+
+
+def get_model_stats() -> Dict[str, dict]:
+    """Yuklu modellerin yukleme suresi ve bellek bilgisi"""
+    return {name: dict(stats) for name, stats in _model_stats.items()}
 
 
-def get_model():
-    """Embedding modelini yukle (lazy loading)"""
-    global _model
-    if _model is None:
-        logger.info(f"Embedding model yukleniyor: {EMBEDDING_MODEL}")
-        from sentence_transformers import SentenceTransformer
-        _model = SentenceTransformer(EMBEDDING_MODEL)
-        logger.info("Embedding model yuklendi")
-    return _model
+@lru_cache(maxsize=None)
+def _encode_accepts_pool(model_class) -> bool:
+    """encode() pool parametresini destekliyor mu (encode_multi_process yerine)"""
+    return "pool" in inspect.signature(model_class.encode).parameters
+
+
+def plan_token_batches(lengths: List[int], token_budget: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Index'leri uzunluga gore (azalan) siralayip token butcesine gore grupla.
+
+    Returns:
+        Batch listesi, her biri orijinal index listesi
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+    batches = []
+    current = []
+    current_max = 0
+    for i in order:
+        new_max = max(current_max, lengths[i])
+        if current and (
+            new_max * (len(current) + 1) > token_budget
+            or len(current) >= max_batch_size
+            # Uzunluk yariya dustuyse yeni bucket: padding eleman basina %50'yi asmaz
+            or lengths[i] * 2 < current_max
+        ):
+            batches.append(current)
+            current = []
+            new_max = lengths[i]
+        current.append(i)
+        current_max = new_max
+
+    if current:
+        batches.append(current)
+    return batches
+
+
+def padding_stats(
+    lengths: List[int],
+    batches: List[List[int]],
+    fixed_batch_size: int,
+    fixed_order: List[int] = None
+) -> dict:
+    """
+    Bucketed batch'lerin padding'ini sabit boyutlu batch'lerle karsilastir.
+
+    Args:
+        lengths: Token uzunluklari
+        batches: plan_token_batches() ciktisi
+        fixed_batch_size: Karsilastirilan sabit batch boyutu
+        fixed_order: Sabit batch'lerin sirasi (None = dokuman sirasi)
+    """
+    order = fixed_order if fixed_order is not None else list(range(len(lengths)))
+    total = sum(lengths)
+    bucketed = sum(max(lengths[i] for i in batch) * len(batch) for batch in batches)
+    fixed = 0
+    for start in range(0, len(order), fixed_batch_size):
+        chunk = order[start:start + fixed_batch_size]
+        fixed += max(lengths[i] for i in chunk) * len(chunk)
+
+    return {
+        "texts": len(lengths),
+        "batches": len(batches),
+        "tokens": total,
+        "padding_tokens": bucketed - total,
+        "fixed_padding_tokens": fixed - total,
+        "padding_saved_tokens": fixed - bucketed
+    }
 
 
 class Embedder:
@@ -34,59 +259,234 @@ class Embedder:
     Sentence Transformers kullanarak metinleri vektore donusturur.
     """
 
-    def __init__(self, model_name: str = None):
+    def __init__(
+        self,
+        model_name: str = None,
+        use_cache: bool = None,
+        workers: int = None,
+        backend: str = None
+    ):
+        """
+        Args:
+            model_name: Model adi (default: config'den)
+            backend: "torch" | "onnx" | "int8" (default: EMBEDDING_BACKEND)
+            use_cache: Embedding cache kullanilsin mi (default: config'den)
+            workers: >1 ise buyuk listeler multi-process pool ile encode edilir
+                (default: EMBEDDING_WORKERS)
+        """
         self.model_name = model_name or EMBEDDING_MODEL
-        self._model = None
+        self.backend = backend or EMBEDDING_BACKEND
+        self.last_batch_stats = None
+        self.workers = EMBEDDING_WORKERS if workers is None else workers
+        self._pool = None
+
+        use_cache = EMBEDDING_CACHE_ENABLED if use_cache is None else use_cache
+        self.cache = EmbeddingCache() if use_cache else None
+
+    @property
+    def model_key(self) -> str:
+        """
+        Cache anahtari (model + aktif backend).
+
+        torch disi backend'in kabul edilip edilmedigi yuklemede belli olur;
+        reddedildiyse torch anahtari dondurulur, cache'ler torch vektorlerini
+        reddedilen backend adiyla saklamaz.
+        """
+        if self.backend != "torch":
+            get_model(self.model_name, backend=self.backend)
+        return model_key(self.model_name, resolve_backend(self.model_name, self.backend))
 
     @property
     def model(self):
-        """Lazy model loading"""
-        if self._model is None:
-            logger.info(f"Embedding model yukleniyor: {self.model_name}")
-            from sentence_transformers import SentenceTransformer
-            self._model = SentenceTransformer(self.model_name)
-            logger.info("Embedding model yuklendi")
-        return self._model
+        """Paylasilan model (bkz. get_model)"""
+        return get_model(self.model_name, backend=self.backend)
 
-    def embed(self, texts: Union[str, List[str]], batch_size: int = None) -> List[List[float]]:
+    def embed(
+        self,
+        texts: Union[str, List[str]],
+        batch_size: int = None,
+        as_numpy: bool = False,
+        use_cache: bool = True
+    ) -> Union[List[List[float]], np.ndarray]:
         """
         Metin veya metin listesini embedding'e donustur.
 
+        Cache'te bulunan metinler toplu lookup ile alinir, sadece eksikler
+        modele gonderilir.
+
         Args:
             texts: Tek metin veya metin listesi
-            batch_size: Batch boyutu (default: config'den)
+            batch_size: Batch basina en fazla metin. Verilmezse token butcesi
+                batch'leri EMBEDDING_MAX_BATCH_SIZE'a kadar buyutur
+                (tokenizer yoksa EMBEDDING_BATCH_SIZE)
+            as_numpy: True ise (n, dim) float32 matris dondurulur; buyuk
+                listelerde milyonlarca Python float nesnesi olusturulmaz
+            use_cache: False ise kalici embedding cache'i okunmaz ve yazilmaz
+                (sorgular: tekrarlari VectorStore'un bellek ici cache'i karsilar)
 
         Returns:
-            Embedding listesi (her biri float listesi)
+            Embedding listesi (her biri float listesi) veya float32 matris
         """
-        batch_size = batch_size or EMBEDDING_BATCH_SIZE
-
         # Tek metin ise listeye cevir
         if isinstance(texts, str):
             texts = [texts]
 
         if not texts:
-            return []
+            return np.empty((0, 0), dtype=np.float32) if as_numpy else []
+
+        # Cache'te olanlar encode edilmez
+        cache = self.cache if use_cache else None
+        cached = cache.get_many(self.model_key, texts) if cache else {}
+        missing = [i for i in range(len(texts)) if i not in cached]
+
+        logger.info(
+            f"{len(texts)} metin embedding'e donusturuluyor "
+            f"({len(cached)} cache'ten, {len(missing)} encode)..."
+        )
+
+        encoded = None
+        if missing:
+            # Ayni (normalize) metin tek sefer encode edilir
+            unique = {}
+            for i in missing:
+                unique.setdefault(normalize_text(texts[i]), texts[i])
+            unique_texts = list(unique.values())
+            positions = {key: n for n, key in enumerate(unique)}
+
+            unique_encoded = self._encode(unique_texts, batch_size)
 
-        logger.info(f"{len(texts)} metin embedding'e donusturuluyor...")
+            if cache:
+                cache.put_many(self.model_key, unique_texts, unique_encoded)
+
+            encoded = unique_encoded[[positions[normalize_text(texts[i])] for i in missing]]
+
+        if not cached:
+            embeddings = encoded
+        else:
+            dim = len(next(iter(cached.values())))
+            embeddings = np.empty((len(texts), dim), dtype=np.float32)
+            for i, vector in cached.items():
+                embeddings[i] = vector
+            if missing:
+                embeddings[missing] = encoded
+
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        logger.info(f"Embedding tamamlandi: {len(embeddings)} vektor")
+
+        return embeddings if as_numpy else embeddings.tolist()
+
+    def start_pool(self):
+        """
+        CPU multi-process pool'u baslat (zaten aciksa mevcut pool'u dondur).
 
-        # Embedding olustur
-        embeddings = self.model.encode(
+        Pool, stop_pool() cagrilana veya process kapanana kadar acik kalir;
+        boylece ingest_folder'da kitaplar arasinda worker'lar yeniden
+        baslatilmaz.
+        """
+        if self._pool is None:
+            logger.info(f"Embedding pool baslatiliyor: {self.workers} worker")
+            self._pool = self.model.start_multi_process_pool(target_devices=["cpu"] * self.workers)
+            atexit.register(self.stop_pool)
+        return self._pool
+
+    def stop_pool(self):
+        """Multi-process pool'u kapat"""
+        if self._pool is not None:
+            from sentence_transformers import SentenceTransformer
+            SentenceTransformer.stop_multi_process_pool(self._pool)
+            self._pool = None
+            atexit.unregister(self.stop_pool)
+            logger.info("Embedding pool kapatildi")
+
+    def _token_lengths(self, texts: List[str]) -> List[int]:
+        """Tokenizer ile metin uzunluklari (special token'lar dahil, kesilmis)"""
+        tokenized = self.model.tokenizer(
             texts,
-            batch_size=batch_size,
-            show_progress_bar=len(texts) > 10,
-            convert_to_numpy=True
+            add_special_tokens=True,
+            truncation=True,
+            max_length=self.model.max_seq_length
         )
+        return [len(ids) for ids in tokenized["input_ids"]]
+
+    def _encode(self, texts: List[str], batch_size: int = None) -> np.ndarray:
+        """
+        Uzunluga gore siralanmis, token butcesine gore batch'lenmis encode.
 
-        # numpy array'i liste'ye cevir
-        result = embeddings.tolist()
-        logger.info(f"Embedding tamamlandi: {len(result)} vektor")
+        Metinler token uzunluguna gore siralanir; her batch'in
+        (en uzun uzunluk x eleman sayisi) degeri EMBEDDING_TOKEN_BUDGET'i
+        asmaz. Kisa paragraflar buyuk, uzunlar kucuk batch'lerde gider;
+        sonuc orijinal sirada dondurulur. batch_size verilmisse hicbir
+        batch ondan buyuk olmaz.
 
-        return result
+        workers > 1 ve liste EMBEDDING_POOL_MIN_TEXTS'ten buyukse metinler
+        multi-process pool'a dagitilir.
+        """
+        if self.workers > 1 and len(texts) >= EMBEDDING_POOL_MIN_TEXTS:
+            return self._encode_pool(texts, batch_size or EMBEDDING_BATCH_SIZE)
+
+        if getattr(self.model, "tokenizer", None) is None:
+            return self.model.encode(
+                texts,
+                batch_size=batch_size or EMBEDDING_BATCH_SIZE,
+                show_progress_bar=len(texts) > 10,
+                convert_to_numpy=True
+            ).astype(np.float32, copy=False)
+
+        lengths = self._token_lengths(texts)
+        max_batch_size = min(batch_size, EMBEDDING_MAX_BATCH_SIZE) if batch_size else EMBEDDING_MAX_BATCH_SIZE
+        batches = plan_token_batches(lengths, EMBEDDING_TOKEN_BUDGET, max_batch_size)
+
+        embeddings = None
+        for batch in tqdm(batches, desc="Embedding", disable=len(texts) <= 10):
+            vectors = self.model.encode(
+                [texts[i] for i in batch],
+                batch_size=len(batch),
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+            if embeddings is None:
+                embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+            embeddings[batch] = vectors
+
+        # Karsilastirma: encode()'un kendi davranisi (karakter uzunluguna gore
+        # siralama + sabit batch_size)
+        encode_order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        self.last_batch_stats = padding_stats(lengths, batches, batch_size or EMBEDDING_BATCH_SIZE, encode_order)
+        logger.info(
+            f"{len(batches)} batch, padding: {self.last_batch_stats['padding_tokens']} token "
+            f"(sabit batch ile {self.last_batch_stats['fixed_padding_tokens']}, "
+            f"kazanc {self.last_batch_stats['padding_saved_tokens']})"
+        )
+        return embeddings
 
-    def embed_single(self, text: str) -> List[float]:
+    def _encode_pool(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Metinleri pool worker'larina dagit.
+
+        Metinler uzunluga gore siralanarak gonderilir; her worker'a benzer
+        uzunlukta parcalar duser. Sonuc orijinal sirada dondurulur.
+        """
+        order = sorted(range(len(texts)), key=lambda i: -len(texts[i]))
+        ordered = [texts[i] for i in order]
+        if _encode_accepts_pool(type(self.model)):
+            vectors = self.model.encode(
+                ordered,
+                pool=self.start_pool(),
+                batch_size=batch_size,
+                show_progress_bar=False,
+                convert_to_numpy=True
+            )
+        else:
+            # Eski sentence-transformers: pool sadece encode_multi_process ile
+            vectors = self.model.encode_multi_process(ordered, self.start_pool(), batch_size=batch_size)
+
+        embeddings = np.empty((len(texts), vectors.shape[1]), dtype=np.float32)
+        embeddings[order] = vectors
+        return embeddings
+
+    def embed_single(self, text: str, use_cache: bool = True) -> List[float]:
         """Tek metin icin embedding"""
-        result = self.embed([text])
+        result = self.embed([text], use_cache=use_cache)
         return result[0] if result else []
 
     def get_embedding_dimension(self) -> int:
@@ -95,16 +495,25 @@ class Embedder:
 
 
 # Kolay kullanim icin global fonksiyonlar
+_default_embedder: Optional[Embedder] = None
+
+
+def _get_default_embedder() -> Embedder:
+    """Global fonksiyonlarin kullandigi tek Embedder"""
+    global _default_embedder
+    if _default_embedder is None:
+        _default_embedder = Embedder()
+    return _default_embedder
+
+
 def embed_texts(texts: Union[str, List[str]], batch_size: int = None) -> List[List[float]]:
     """Global embedder ile embedding olustur"""
-    embedder = Embedder()
-    return embedder.embed(texts, batch_size)
+    return _get_default_embedder().embed(texts, batch_size)
 
 
 def embed_single(text: str) -> List[float]:
     """Tek metin icin embedding"""
-    embedder = Embedder()
-    return embedder.embed_single(text)
+    return _get_default_embedder().embed_single(text)
 
 
 # Test
@@ -0,0 +1,154 @@
+"""
+PageGeneral v2 - Embedding Cache
+(model, normalize metin hash'i) -> float32 vektor, SQLite'ta kalici
+"""
+
+import hashlib
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import EMBEDDING_CACHE_FILE, EMBEDDING_CACHE_MAX_ENTRIES, get_logger
+from src.sqlite_store import SQLiteStore
+
+logger = get_logger(__name__)
+
+# SQLite parametre limiti icin sorgu basina anahtar sayisi
+_LOOKUP_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Bosluklari tekillestir (cache anahtari icin)"""
+    return " ".join(text.split())
+
+
+def text_key(text: str) -> str:
+    """Normalize metnin SHA1 hash'i"""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache(SQLiteStore):
+    """
+    Kalici embedding cache'i.
+
+    Ayni paragraf (farkli baskilarda, force re-ingest'te, tekrar yuklemede)
+    bir kez encode edilir. Kayit sayisi EMBEDDING_CACHE_MAX_ENTRIES'i asinca
+    en uzun suredir kullanilmayan vektorler silinir (LRU).
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS embeddings (
+            model TEXT NOT NULL,
+            key TEXT NOT NULL,
+            vector BLOB NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (model, key)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings(last_used)",
+    )
+
+    def __init__(self, db_path: Path = None, max_entries: int = None):
+        super().__init__(db_path or EMBEDDING_CACHE_FILE)
+        self.max_entries = max_entries or EMBEDDING_CACHE_MAX_ENTRIES
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, model: str, texts: List[str]) -> Dict[int, np.ndarray]:
+        """
+        Metin listesi icin toplu cache lookup.
+
+        Returns:
+            {metin_index: float32 vektor} - sadece cache'te bulunanlar
+        """
+        keys = [text_key(t) for t in texts]
+        unique_keys = list(dict.fromkeys(keys))
+        vectors = {}
+
+        with self._transaction() as conn:
+            for i in range(0, len(unique_keys), _LOOKUP_CHUNK):
+                chunk = unique_keys[i:i + _LOOKUP_CHUNK]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                    [model, *chunk]
+                ).fetchall()
+                for key, blob in rows:
+                    vectors[key] = np.frombuffer(blob, dtype=np.float32)
+
+            if vectors:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE embeddings SET last_used = ? WHERE model = ? AND key = ?",
+                    [(now, model, key) for key in vectors]
+                )
+
+            found = {i: vectors[key] for i, key in enumerate(keys) if key in vectors}
+            self.hits += len(found)
+            self.misses += len(texts) - len(found)
+
+        return found
+
+    def put_many(self, model: str, texts: List[str], vectors: np.ndarray):
+        """Encode edilen vektorleri kaydet, gerekirse eski kayitlari sil"""
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [
+            (model, text_key(text), np.asarray(vector, dtype=np.float32).tobytes(), now)
+            for text, vector in zip(texts, vectors)
+        ]
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector, last_used) VALUES (?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+
+    def _evict(self):
+        """Kayit limiti asildiysa en eski vektorleri sil (%90'a kadar; transaction icinde)"""
+        count = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        if count <= self.max_entries:
+            return
+
+        remove = count - int(self.max_entries * 0.9)
+        self.conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+            (remove,)
+        )
+        logger.info(f"Embedding cache: {remove} vektor silindi (limit: {self.max_entries})")
+
+    def clear(self):
+        """Cache'i bosalt"""
+        self._write("DELETE FROM embeddings")
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Hit/miss istatistikleri"""
+        with self._lock:
+            entries = self.conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "max_entries": self.max_entries
+        }
+
+
+# Test
+if __name__ == "__main__":
+    cache = EmbeddingCache()
+    print("Embedding Cache Stats:", cache.get_stats())
@@ -3,43 +3,204 @@ PageGeneral v2 - Ingest Pipeline
 PDF -> Parse -> Embed -> VectorDB
 """
 
+import queue
+import threading
+from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
 from pathlib import Path
-from typing import Optional, Callable
+from typing import Optional, Callable, Dict, Iterable, Iterator, List
 from tqdm import tqdm
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import INPUT_DIR, get_logger
+import config
+from config import (
+    INPUT_DIR, INGEST_BATCH_SIZE, INGEST_PARSE_WORKERS, INGEST_EMBED_THREADS, INGEST_QUEUE_SIZE, get_logger
+)
+from src.embedder import get_model_stats
 from src.pdf_parser import PDFParser
-from src.registry import BookRegistry, calculate_pdf_hash
-from src.vector_store import VectorStore
+from src.registry import calculate_pdf_hash, file_fingerprint, get_registry
+from src.vector_store import VectorStore, content_paragraph_id, page_hash
 
 logger = get_logger(__name__)
 
 
+def checkpoint_after(batch_no: int, chunk: List[Dict], previous: Dict = None) -> Dict:
+    """
+    Yazilan batch'ten sonraki checkpoint.
+
+    Batch sayfa ortasinda bitebilir (client batch siniri); bu yuzden son
+    sayfanin kac paragrafinin yazildigi da saklanir (page_paragraphs).
+
+    Args:
+        batch_no: Yazilan batch'in numarasi
+        chunk: Batch'in paragraflari ("page", "para_index")
+        previous: Bir onceki checkpoint (ayni sayfada devam eden batch icin)
+    """
+    last_page = chunk[-1].get("page", 0)
+    page_paragraphs = sum(1 for para in chunk if para.get("page", 0) == last_page)
+    if previous and previous["page"] == last_page and page_paragraphs == len(chunk):
+        # Batch'in tamami onceki batch'in bittigi sayfada
+        page_paragraphs += previous.get("page_paragraphs", 0)
+    return {
+        "batch": batch_no,
+        "page": last_page,
+        "page_paragraphs": page_paragraphs,
+        "paragraphs": chunk[-1]["para_index"] + 1
+    }
+
+
+def resume_page(checkpoint: Dict) -> int:
+    """Devam edilecek ilk sayfa (checkpoint sayfasi yarim kalmis olabilir)"""
+    if "page_paragraphs" in checkpoint:
+        return checkpoint["page"]
+    return checkpoint["page"] + 1  # eski format: sayfa tamamen yazilmis
+
+
+def skip_committed(paragraphs: Iterable[Dict], checkpoint: Dict) -> Iterator[Dict]:
+    """resume_page()'den itibaren parse edilen paragraflardan yazilmis olanlari atla"""
+    skip = checkpoint.get("page_paragraphs", 0)
+    for para in paragraphs:
+        if skip and para.get("page", 0) == checkpoint["page"]:
+            skip -= 1
+            continue
+        yield para
+
+
+# Paralel ingest worker'larinin chunk kuyrugu (_init_parse_worker ile miras alinir)
+_parse_queue = None
+
+# Spawn edilen worker'a aktarilan calisma zamani ayarlari (config modulu yeniden yuklenir)
+WORKER_CONFIG_KEYS = ("PROCESSED_DIR", "VERBOSE")
+
+
+def _init_parse_worker(parse_queue, settings: Dict):
+    """
+    Process pool initializer.
+
+    multiprocessing kuyrugu sadece process olusturulurken aktarilabilir;
+    ana process'te degistirilmis config degerleri (settings) de burada
+    geri yuklenir.
+    """
+    global _parse_queue
+    _parse_queue = parse_queue
+    for key, value in settings.items():
+        setattr(config, key, value)
+
+
+def _prepare_pdf(index: int, pdf_path: str, book_id: str, chunk_size: int, use_cache: bool = None) -> None:
+    """
+    Paralel ingest'in parse asamasi (process pool worker'i).
+
+    Paragraflar chunk_size'lik parcalar halinde sinirli kuyruga (_parse_queue)
+    konur; kuyruk doluysa worker bekler, bellekte kitabin tamami tutulmaz.
+
+    Kuyruga giden mesajlar (sirayla):
+        ("book", index, {"num_pages": 370})
+        ("chunk", index, [paragraf, ...])   # 0..n kez
+        ("end", index, {"paragraphs": 335, "chunks": 2})
+        | ("end", index, {"error": "..."})
+    """
+    pdf_path = Path(pdf_path)
+    out = _parse_queue
+    count = 0
+    chunks = 0
+    try:
+        parser = PDFParser(workers=1, use_cache=use_cache)
+        num_pages = parser.get_page_count(pdf_path, pdf_hash=book_id)
+        out.put(("book", index, {"num_pages": num_pages}))
+
+        chunk = []
+        for para in parser.iter_paragraphs(pdf_path, write_markdown=True, pdf_hash=book_id):
+            para["book_name"] = pdf_path.stem
+            para["para_index"] = count
+            count += 1
+            chunk.append(para)
+            if len(chunk) == chunk_size:
+                out.put(("chunk", index, chunk))
+                chunks += 1
+                chunk = []
+        if chunk:
+            out.put(("chunk", index, chunk))
+            chunks += 1
+    except Exception as e:
+        out.put(("end", index, {"error": f"Parse hatasi: {str(e)}"}))
+        return
+
+    out.put(("end", index, {"paragraphs": count, "chunks": chunks}))
+
+
+def _put(q: queue.Queue, item, stop: threading.Event) -> bool:
+    """Kuyruga koy; stop set edilirse (or. yazici hata verdi) vazgec"""
+    while not stop.is_set():
+        try:
+            q.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _get(q: queue.Queue, stop: threading.Event):
+    """Kuyruktan al; stop set edilirse None"""
+    while not stop.is_set():
+        try:
+            return q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _drain(q, closed: threading.Event):
+    """closed set edilene kadar kuyruktaki mesajlari at"""
+    while not closed.is_set():
+        try:
+            q.get(timeout=0.1)
+        except queue.Empty:
+            continue
+
+
 class IngestPipeline:
     """
     PDF dosyalarini VectorDB'ye yukleme pipeline'i.
 
     Akis:
     1. PDF hash check (zaten yuklenmis mi?)
-    2. PDF parse (paragraf cikartma)
-    3. Registry'ye kayit
-    4. Embedding & VectorDB'ye ekleme
+    2. Registry'ye kayit
+    3. PDF parse (sayfa sayfa paragraf cikartma)
+    4. Embedding & VectorDB'ye ekleme (INGEST_BATCH_SIZE'lik, sayfa sinirinda
+       biten numarali batch'ler)
+    5. Tumen referanslarini division index'e ekleme ve checkpoint (her batch icin)
+
+    Parse, embedding ve insert ayni akista ilerler (bkz. VectorStore.add_book);
+    kitap buyuklugunden bagimsiz olarak bellekte birkac chunk tutulur.
+    Yarida kalan ingest resume=True ile son checkpoint'ten devam eder.
     """
 
-    def __init__(self):
-        self.parser = PDFParser()
-        self.registry = BookRegistry()
+    def __init__(self, embed_workers: int = None, parse_workers: int = None):
+        """
+        Args:
+            embed_workers: >1 ise multi-process embedding (default: config'den)
+            parse_workers: >1 ise PDF sayfalari process pool'da cikarilir
+                (default: PDF_PARSE_WORKERS)
+        """
+        self.parser = PDFParser(workers=parse_workers)
+        self.registry = get_registry()
         self.vector_store = VectorStore()
+        self.division_index = self.vector_store.division_index
+
+        if embed_workers is not None:
+            self.vector_store.embedder.workers = embed_workers
 
     def ingest_pdf(
         self,
         pdf_path: Path,
         book_title: str = None,
         force: bool = False,
-        progress_callback: Callable[[str, int], None] = None
+        progress_callback: Callable[[str, int], None] = None,
+        resume: bool = False
     ) -> dict:
         """
         Tek PDF dosyasini isle ve VectorDB'ye ekle.
@@ -49,6 +210,9 @@ class IngestPipeline:
             book_title: Kitap adi (None ise dosya adindan alinir)
             force: True ise zaten yuklu olsa bile yeniden yukle
             progress_callback: Progress callback fonksiyonu (message, percent)
+            resume: True ise yarim kalan (processing/error) kitaba registry'deki
+                checkpoint'ten devam et; yazilmis sayfalar embed edilmez
+                (markdown ciktisi kitap tamamlaninca yeniden yazilir)
 
         Returns:
             {
@@ -74,8 +238,8 @@ class IngestPipeline:
                 "book_id": None
             }
 
-        # 2. Hash check - zaten yuklenmis mi?
-        book_id = calculate_pdf_hash(pdf_path)
+        # 2. Hash check - zaten yuklenmis mi? (degismemis dosyada hash okunmaz)
+        book_id = self.registry.resolve_id(pdf_path)
         update_progress(f"Kontrol ediliyor: {pdf_path.name}", 5)
 
         if not force and self.registry.exists_by_id(book_id):
@@ -89,37 +253,35 @@ class IngestPipeline:
                     "pages": existing.get("pages", 0)
                 }
 
+        # Baska bir kitabin yeni baskisi olarak (update_pdf) yuklenmis dosya
+        linked = None if force else self.registry.get_by_source_hash(book_id)
+        if linked and linked.get("status") == "ready":
+            return {
+                "status": "skipped",
+                "message": f"Kitap yeni baski olarak yuklu: {pdf_path.name} -> {linked['id']}",
+                "book_id": linked["id"],
+                "paragraphs": linked.get("paragraphs", 0),
+                "pages": linked.get("pages", 0)
+            }
+
+        # Resume: son yazilan batch'in sayfasindan sonrasi islenir
+        checkpoint = None
+        if resume and not force:
+            existing = self.registry.get(book_id)
+            if existing and existing.get("status") in ("processing", "error"):
+                checkpoint = existing.get("checkpoint")
+
         # Force modda eski kayitlari temizle
         if force and self.registry.exists_by_id(book_id):
             update_progress("Eski kayitlar temizleniyor...", 10)
             self.vector_store.delete_book(book_id)
             self.registry.delete(book_id)
 
-        # 3. PDF Parse
-        update_progress(f"PDF parse ediliyor: {pdf_path.name}", 15)
+        # 3. Registry'ye kayit (status: processing)
+        title = book_title or (existing.get("title") if checkpoint else None) or pdf_path.stem
 
         try:
-            parse_result = self.parser.parse(pdf_path)
-
-            if parse_result["status"] == "error":
-                return {
-                    "status": "error",
-                    "message": f"Parse hatasi: {parse_result.get('error', 'Bilinmeyen hata')}",
-                    "book_id": book_id
-                }
-
-            paragraphs = parse_result.get("paragraphs", [])
-            num_pages = parse_result.get("pages", 0)
-
-            if not paragraphs:
-                return {
-                    "status": "error",
-                    "message": "PDF'den paragraf cikarilamadi",
-                    "book_id": book_id
-                }
-
-            update_progress(f"{len(paragraphs)} paragraf cikarildi", 30)
-
+            num_pages = self.parser.get_page_count(pdf_path, pdf_hash=book_id)
         except Exception as e:
             logger.error(f"Parse hatasi: {e}")
             return {
@@ -128,38 +290,89 @@ class IngestPipeline:
                 "book_id": book_id
             }
 
-        # 4. Registry'ye kayit (status: processing)
-        title = book_title or pdf_path.stem
         self.registry.add(pdf_path, {
             "title": title,
             "pages": num_pages,
-            "paragraphs": len(paragraphs)
-        })
+            "paragraphs": 0
+        }, book_id=book_id)
         self.registry.update_status(book_id, "processing")
-        update_progress("Registry'ye kaydedildi", 35)
+        update_progress("Registry'ye kaydedildi", 15)
+
+        # 4. PDF Parse + Embedding + VectorDB (sayfa sayfa, batch'ler halinde)
+        paragraph_count = 0
+        batch_no = 0
+        page_range = None
+        if checkpoint:
+            # Checkpoint sayfasindan baslanir, yazilmis paragraflari atlanir;
+            # para_index (ve dolayisiyla paragraf ID'leri) kaldigi yerden devam eder
+            paragraph_count = checkpoint["paragraphs"]
+            batch_no = checkpoint["batch"] + 1
+            page_range = (resume_page(checkpoint), None)
+            update_progress(
+                f"Kaldigi yerden devam: batch {batch_no}, sayfa {page_range[0]}/{num_pages}", 20
+            )
+        else:
+            update_progress(f"PDF parse ediliyor: {pdf_path.name}", 20)
+
+        # Multi-process embedding'de her worker'a bir INGEST_BATCH_SIZE duser
+        chunk_size = INGEST_BATCH_SIZE * max(1, self.vector_store.embedder.workers)
+
+        def paragraphs():
+            nonlocal paragraph_count
+            parsed = self.parser.iter_paragraphs(
+                pdf_path, page_range=page_range, write_markdown=checkpoint is None, pdf_hash=book_id
+            )
+            for para in skip_committed(parsed, checkpoint) if checkpoint else parsed:
+                # Paragraf metadata ekle
+                para["book_name"] = title
+                para["para_index"] = paragraph_count
+                paragraph_count += 1
+                yield para
 
-        # 5. Paragraf metadata ekle
-        for i, para in enumerate(paragraphs):
-            para["book_name"] = title
-            para["para_index"] = i
+        last_checkpoint = checkpoint
 
-        # 6. VectorDB'ye ekle (embedding + insert)
-        update_progress(f"Embedding olusturuluyor ({len(paragraphs)} paragraf)...", 40)
+        def on_chunk(added: int, ids: list, chunk: list):
+            nonlocal batch_no, last_checkpoint
+            self.division_index.add_paragraphs(book_id, ids, chunk)
+            last_page = chunk[-1].get("page", 0)
+            # Batch tamamen yazildi: devam noktasi
+            last_checkpoint = checkpoint_after(batch_no, chunk, last_checkpoint)
+            self.registry.update_metadata(book_id, {"checkpoint": last_checkpoint})
+            batch_no += 1
+            percent = 20 + int(70 * last_page / max(num_pages, 1))
+            update_progress(f"VectorDB'ye eklendi: {added} paragraf (sayfa {last_page}/{num_pages})", percent)
 
         try:
-            added_count = self.vector_store.add_book(book_id, paragraphs)
-            update_progress(f"VectorDB'ye eklendi: {added_count} paragraf", 90)
+            # Parse + embed (producer thread) ve ChromaDB yazimi ust uste biner
+            self.vector_store.add_book(
+                book_id, paragraphs(), chunk_size=chunk_size, on_chunk=on_chunk, page_aligned=True
+            )
 
         except Exception as e:
-            logger.error(f"VectorDB hatasi: {e}")
+            logger.error(f"Ingest hatasi: {e}")
             self.registry.update_status(book_id, "error")
             return {
                 "status": "error",
-                "message": f"VectorDB hatasi: {str(e)}",
+                "message": f"Ingest hatasi: {str(e)}",
                 "book_id": book_id
             }
 
-        # 7. Registry guncelle (status: ready)
+        if paragraph_count == 0:
+            self.registry.delete(book_id)
+            return {
+                "status": "error",
+                "message": "PDF'den paragraf cikarilamadi",
+                "book_id": book_id
+            }
+
+        self.registry.update_metadata(book_id, {"paragraphs": paragraph_count, "checkpoint": None})
+
+        if checkpoint:
+            # Resume'da markdown sadece kalan sayfalarla yazilmadi; bastan olustur
+            # (sayfa metinleri page cache'ten gelir)
+            self.parser.save_markdown(pdf_path, pdf_hash=book_id)
+
+        # 5. Registry guncelle (status: ready)
         self.registry.update_status(book_id, "ready")
         update_progress(f"Tamamlandi: {pdf_path.name}", 100)
 
@@ -167,15 +380,210 @@ class IngestPipeline:
             "status": "success",
             "message": f"Basariyla yuklendi: {title}",
             "book_id": book_id,
-            "paragraphs": len(paragraphs),
+            "paragraphs": paragraph_count,
             "pages": num_pages
         }
 
+    def update_pdf(
+        self,
+        pdf_path: Path,
+        book_id: str,
+        book_title: str = None,
+        progress_callback: Callable[[str, int], None] = None
+    ) -> dict:
+        """
+        Kitabin yeni baskisini/duzeltilmis taramasini mevcut kayda bagla.
+
+        Sayfalar icerik hash'iyle (page_hash) eslestirilir:
+        - metni ayni kalan sayfalarin paragraflari yeniden embed edilmez,
+          sadece metadata'lari (sayfa, para_index, page_hash) guncellenir
+        - yeni/degisen sayfalarin paragraflari icerikten turetilen ID'lerle
+          (content_paragraph_id) embed edilip upsert edilir
+        - yeni baskida olmayan sayfalarin paragraflari silinir
+        Kitap ID'si degismez; yeni PDF'in hash'i registry'de source_hash
+        olarak saklanir.
+
+        Args:
+            pdf_path: Yeni PDF dosya yolu
+            book_id: Guncellenecek kitabin ID'si
+            book_title: Kitap adi (None ise mevcut ad korunur)
+            progress_callback: Progress callback fonksiyonu (message, percent)
+
+        Returns:
+            {
+                "status": "success" | "skipped" | "error",
+                "book_id": "abc123",
+                "message": "...",
+                "paragraphs": 340,
+                "pages": 372,
+                "added": 12,
+                "kept": 328,
+                "deleted": 7
+            }
+        """
+        pdf_path = Path(pdf_path)
+
+        def update_progress(msg: str, percent: int = 0):
+            logger.info(msg)
+            if progress_callback:
+                progress_callback(msg, percent)
+
+        if not pdf_path.exists():
+            return {
+                "status": "error",
+                "message": f"Dosya bulunamadi: {pdf_path}",
+                "book_id": book_id
+            }
+
+        existing = self.registry.get(book_id)
+        if not existing:
+            return {
+                "status": "error",
+                "message": f"Guncellenecek kitap bulunamadi: {book_id}",
+                "book_id": book_id
+            }
+
+        source_hash = self.registry.resolve_id(pdf_path)
+        update_progress(f"Kontrol ediliyor: {pdf_path.name}", 5)
+
+        if source_hash == existing.get("source_hash", book_id) and existing.get("status") == "ready":
+            return {
+                "status": "skipped",
+                "message": f"Kitap degismemis: {pdf_path.name}",
+                "book_id": book_id,
+                "paragraphs": existing.get("paragraphs", 0),
+                "pages": existing.get("pages", 0)
+            }
+        if source_hash != book_id and self.registry.exists_by_id(source_hash):
+            return {
+                "status": "error",
+                "message": f"PDF ayri bir kitap olarak yuklu: {source_hash}",
+                "book_id": book_id
+            }
+
+        try:
+            num_pages = self.parser.get_page_count(pdf_path, pdf_hash=source_hash)
+        except Exception as e:
+            logger.error(f"Parse hatasi: {e}")
+            return {
+                "status": "error",
+                "message": f"Parse hatasi: {str(e)}",
+                "book_id": book_id
+            }
+
+        title = book_title or existing.get("title") or pdf_path.stem
+        self.registry.update_status(book_id, "processing")
+
+        # Mevcut sayfalar: (page_hash, tekrar no) -> paragraf ID'leri
+        old_pages = self.vector_store.page_map(book_id)
+        # Yeni ID'ler korunan veya silinecek hicbir kayitla cakismamali
+        taken_ids = {para_id for ids in old_pages.values() for para_id in ids}
+        update_progress(f"Sayfalar karsilastiriliyor: {pdf_path.name} ({len(old_pages)} sayfa kayitli)", 15)
+
+        paragraph_count = 0
+        kept_ids = []
+        kept_metadatas = []
+        kept_paragraphs = []
+
+        def changed_paragraphs():
+            nonlocal paragraph_count
+            occurrences = {}
+            for page_no, _, page_paragraphs in self.parser.iter_pages(pdf_path, pdf_hash=source_hash):
+                if not page_paragraphs:
+                    continue
+                digest = page_hash([para["text"] for para in page_paragraphs])
+                occurrence = occurrences.get(digest, 0)
+                occurrences[digest] = occurrence + 1
+                old_ids = old_pages.pop((digest, occurrence), None)
+
+                for ordinal, para in enumerate(page_paragraphs):
+                    para["book_name"] = title
+                    para["para_index"] = paragraph_count
+                    para["page_hash"] = digest
+                    paragraph_count += 1
+                    if old_ids:
+                        kept_ids.append(old_ids[ordinal])
+                        kept_metadatas.append({
+                            "book_name": title,
+                            "page": page_no,
+                            "para_index": para["para_index"],
+                            "page_hash": digest
+                        })
+                        kept_paragraphs.append(para)
+                    else:
+                        para["id"] = content_paragraph_id(book_id, digest, occurrence, ordinal, taken_ids)
+                        yield para
+
+        def on_chunk(added: int, ids: list, chunk: list):
+            self.division_index.add_paragraphs(book_id, ids, chunk)
+            last_page = chunk[-1].get("page", 0)
+            percent = 20 + int(60 * last_page / max(num_pages, 1))
+            update_progress(f"Degisen paragraflar eklendi: {added} (sayfa {last_page}/{num_pages})", percent)
+
+        chunk_size = INGEST_BATCH_SIZE * max(1, self.vector_store.embedder.workers)
+
+        try:
+            # 1. Degisen/yeni sayfalar (embed + upsert); ayni gecisle korunanlar toplanir
+            added = self.vector_store.add_book(book_id, changed_paragraphs(), chunk_size=chunk_size, on_chunk=on_chunk)
+            if paragraph_count == 0:
+                # Bos parse mevcut kitabi silmesin
+                self.registry.update_status(book_id, existing.get("status", "ready"))
+                return {
+                    "status": "error",
+                    "message": "PDF'den paragraf cikarilamadi",
+                    "book_id": book_id
+                }
+
+            # 2. Yeni baskida olmayan sayfalar
+            removed_ids = [para_id for ids in old_pages.values() for para_id in ids]
+            self.vector_store.delete_paragraphs(removed_ids)
+            update_progress(f"Kaldirilan paragraflar silindi: {len(removed_ids)}", 85)
+
+            # 3. Korunan paragraflar: sadece metadata (sayfa no kaymis olabilir)
+            self.vector_store.update_paragraph_metadata(kept_ids, kept_metadatas)
+            self.division_index.add_paragraphs(book_id, kept_ids, kept_paragraphs)
+            update_progress(f"Korunan paragraflar guncellendi: {len(kept_ids)}", 95)
+
+        except Exception as e:
+            logger.error(f"Update hatasi: {e}")
+            self.registry.update_status(book_id, "error")
+            return {
+                "status": "error",
+                "message": f"Update hatasi: {str(e)}",
+                "book_id": book_id
+            }
+
+        self.registry.update_metadata(book_id, {
+            "filename": pdf_path.name,
+            "title": title,
+            "pages": num_pages,
+            "paragraphs": paragraph_count,
+            "source_hash": source_hash,
+            "updated_at": datetime.now().isoformat()
+        })
+        self.registry.update_status(book_id, "ready")
+        update_progress(f"Tamamlandi: {pdf_path.name}", 100)
+
+        return {
+            "status": "success",
+            "message": f"Basariyla guncellendi: {title}",
+            "book_id": book_id,
+            "paragraphs": paragraph_count,
+            "pages": num_pages,
+            "added": added,
+            "kept": len(kept_ids),
+            "deleted": len(removed_ids)
+        }
+
     def ingest_folder(
         self,
         folder_path: Path = None,
         force: bool = False,
-        progress_callback: Callable[[str, int, int, int], None] = None
+        progress_callback: Callable[[str, int, int, int], None] = None,
+        parallel: bool = False,
+        parse_workers: int = None,
+        embed_threads: int = None,
+        resume: bool = False
     ) -> dict:
         """
         Klasordeki tum PDF'leri isle.
@@ -184,6 +592,10 @@ class IngestPipeline:
             folder_path: Klasor yolu (None ise INPUT_DIR)
             force: Zaten yuklu olanlari da yeniden yukle
             progress_callback: Progress callback (message, current, total, percent)
+            parallel: True ise asamali paralel ingest (bkz. _ingest_parallel)
+            parse_workers: Hash + parse process sayisi (default: INGEST_PARSE_WORKERS)
+            embed_threads: Embedding thread sayisi (default: INGEST_EMBED_THREADS)
+            resume: Yarim kalan kitaplara checkpoint'ten devam et (sirali mod)
 
         Returns:
             {
@@ -219,26 +631,32 @@ class IngestPipeline:
             }
 
         results = []
-        processed = 0
-        skipped = 0
-        errors = 0
 
         logger.info(f"{len(pdf_files)} PDF bulundu, isleniyor...")
 
-        for i, pdf_file in enumerate(tqdm(pdf_files, desc="PDF'ler isleniyor")):
-            if progress_callback:
-                percent = int((i / len(pdf_files)) * 100)
-                progress_callback(f"Isleniyor: {pdf_file.name}", i + 1, len(pdf_files), percent)
-
-            result = self.ingest_pdf(pdf_file, force=force)
-            results.append(result)
+        if parallel and resume:
+            # Paralel yazici chunk'lari sirasiz yazar; checkpoint sadece sirali modda tutulur
+            logger.warning("resume paralel modda desteklenmiyor, sirali ingest kullaniliyor")
+            parallel = False
 
-            if result["status"] == "success":
-                processed += 1
-            elif result["status"] == "skipped":
-                skipped += 1
+        # Embedding pool (aciksa) tum kitaplar boyunca acik kalir
+        try:
+            if parallel:
+                results = self._ingest_parallel(pdf_files, force, progress_callback, parse_workers, embed_threads)
             else:
-                errors += 1
+                for i, pdf_file in enumerate(tqdm(pdf_files, desc="PDF'ler isleniyor")):
+                    if progress_callback:
+                        percent = int((i / len(pdf_files)) * 100)
+                        progress_callback(f"Isleniyor: {pdf_file.name}", i + 1, len(pdf_files), percent)
+
+                    results.append(self.ingest_pdf(pdf_file, force=force, resume=resume))
+
+        finally:
+            self.vector_store.embedder.stop_pool()
+
+        processed = sum(1 for r in results if r["status"] == "success")
+        skipped = sum(1 for r in results if r["status"] == "skipped")
+        errors = len(results) - processed - skipped
 
         logger.info(f"Tamamlandi: {processed} islendi, {skipped} atlandi, {errors} hata")
 
@@ -251,15 +669,312 @@ class IngestPipeline:
             "results": results
         }
 
+    def _ingest_parallel(
+        self,
+        pdf_files: List[Path],
+        force: bool,
+        progress_callback: Callable[[str, int, int, int], None] = None,
+        parse_workers: int = None,
+        embed_threads: int = None
+    ) -> List[dict]:
+        """
+        Asamali paralel ingest.
+
+        1. Besleyici thread: hash'leri process pool'da hesaplar; zaten yuklu
+           veya ayni calismada tekrar eden kitaplari parse etmeden ayirir,
+           kalanlari parse icin pool'a verir ve worker'larin gonderdigi
+           chunk'lari embed kuyruguna koyar
+        2. Embed thread'leri: chunk'lari embed edip yazma kuyruguna koyar
+        3. Yazici (cagiran thread): ChromaDB, indexler ve registry'ye tek
+           basina yazar
+
+        Kuyruklar (parse worker'larininki dahil) INGEST_QUEUE_SIZE chunk ile
+        sinirli; yavas asama oncekileri bekletir, bellek kitap boyutu ve
+        sayisindan bagimsiz kalir. Pool "spawn" ile acilir: embedding
+        thread'leri calisan process fork edilmez.
+
+        Returns:
+            Dosya sirasiyla ingest_pdf() formatinda sonuclar
+        """
+        parse_workers = max(1, parse_workers or INGEST_PARSE_WORKERS)
+        embed_threads = max(1, embed_threads or INGEST_EMBED_THREADS)
+        chunk_size = INGEST_BATCH_SIZE * max(1, self.vector_store.embedder.workers)
+        if self.vector_store.max_batch_size:
+            chunk_size = min(chunk_size, self.vector_store.max_batch_size)
+
+        skip_ids = frozenset()
+        if not force:
+            ready = self.registry.list_ready()
+            skip_ids = frozenset(b["id"] for b in ready) | frozenset(b["source_hash"] for b in ready if b.get("source_hash"))
+        embed_queue = queue.Queue(maxsize=INGEST_QUEUE_SIZE)
+        write_queue = queue.Queue(maxsize=INGEST_QUEUE_SIZE)
+        stop = threading.Event()
+
+        context = get_context("spawn")
+        parse_queue = context.Queue(maxsize=INGEST_QUEUE_SIZE)
+        executor = ProcessPoolExecutor(
+            max_workers=parse_workers, mp_context=context,
+            initializer=_init_parse_worker,
+            initargs=(parse_queue, {key: getattr(config, key) for key in WORKER_CONFIG_KEYS})
+        )
+
+        def feed():
+            books = {}
+            futures = {}
+            try:
+                # Hash: parmak izi degismemis dosya okunmaz
+                hashing = []
+                for pdf_file in pdf_files:
+                    fingerprint = file_fingerprint(pdf_file)
+                    cached_id = self.registry.cached_id(fingerprint)
+                    future = None if cached_id else executor.submit(calculate_pdf_hash, str(pdf_file))
+                    hashing.append((fingerprint, cached_id, future))
+
+                # Yuklu veya bu calismada tekrar eden kitap parse edilmez
+                first_index = {}
+                for index, (pdf_file, (fingerprint, cached_id, future)) in enumerate(zip(pdf_files, hashing)):
+                    book = {"pdf_path": pdf_file, "fingerprint": fingerprint, "hashed": cached_id is None}
+                    try:
+                        book["book_id"] = cached_id or future.result()
+                    except Exception as e:
+                        book.update(book_id=None, error=f"Parse hatasi: {str(e)}")
+                    else:
+                        if book["book_id"] in skip_ids:
+                            book["skipped"] = True
+                        elif book["book_id"] in first_index:
+                            book["duplicate_of"] = first_index[book["book_id"]]
+                        else:
+                            first_index[book["book_id"]] = index
+                            books[index] = book
+                            futures[index] = executor.submit(
+                                _prepare_pdf, index, str(pdf_file), book["book_id"], chunk_size,
+                                self.parser.page_cache is not None
+                            )
+                    if not _put(write_queue, ("hashed", index, book), stop):
+                        return
+
+                while futures:
+                    # Kuyruk bos okunduysa coken worker'in tum mesajlari islenmistir
+                    crashed = [i for i, f in futures.items() if f.done() and f.exception() is not None]
+                    try:
+                        kind, index, payload = parse_queue.get(timeout=0.1)
+                    except queue.Empty:
+                        if stop.is_set():
+                            return
+                        for index in crashed:
+                            error = futures.pop(index).exception()
+                            message = ("end", index, {**books[index], "error": f"Parse hatasi: {str(error)}"})
+                            if not _put(write_queue, message, stop):
+                                return
+                        continue
+
+                    if kind == "chunk":
+                        task = (index, books[index]["book_id"], payload, payload[0]["para_index"])
+                        if not _put(embed_queue, task, stop):
+                            return
+                    else:
+                        # "book" chunk'lardan once yaziciya ulasir
+                        if not _put(write_queue, (kind, index, {**books[index], **payload}), stop):
+                            return
+                        if kind == "end":
+                            del futures[index]
+            except BaseException as e:
+                _put(write_queue, e, stop)
+            finally:
+                for _ in range(embed_threads):
+                    _put(embed_queue, None, stop)
+
+        def embed():
+            try:
+                while True:
+                    task = _get(embed_queue, stop)
+                    if task is None:
+                        return
+                    index, book_id, batch, offset = task
+                    try:
+                        message = ("chunk", index, self.vector_store.embed_chunk(book_id, batch, offset))
+                    except Exception as e:
+                        message = ("failed", index, e)
+                    if not _put(write_queue, message, stop):
+                        return
+            finally:
+                _put(write_queue, ("done", None, None), stop)
+
+        threads = [threading.Thread(target=feed, name="ingest-feed", daemon=True)]
+        threads += [
+            threading.Thread(target=embed, name=f"ingest-embed-{i}", daemon=True)
+            for i in range(embed_threads)
+        ]
+        for thread in threads:
+            thread.start()
+
+        results = [None] * len(pdf_files)
+        active = {}
+        duplicates = {}
+        done = 0
+        progress = tqdm(total=len(pdf_files), desc="PDF'ler isleniyor")
+
+        def finish(index: int, result: dict):
+            results[index] = result
+            progress.update(1)
+            if progress_callback:
+                finished = sum(1 for r in results if r is not None)
+                percent = int(finished / len(pdf_files) * 100)
+                progress_callback(f"Tamamlandi: {pdf_files[index].name}", finished, len(pdf_files), percent)
+            # Ayni kitabin bu calismadaki kopyalari ilk dosyanin sonucunu alir
+            for duplicate in duplicates.pop(index, []):
+                finish_duplicate(duplicate, result)
+
+        def finish_duplicate(index: int, original: dict):
+            if original["status"] != "success":
+                finish(index, dict(original))
+                return
+            finish(index, {
+                "status": "skipped",
+                "message": f"Kitap zaten yuklu: {pdf_files[index].name}",
+                "book_id": original["book_id"],
+                "paragraphs": original["paragraphs"],
+                "pages": original["pages"]
+            })
+
+        def fail(index: int, message: str):
+            book = active.pop(index)
+            logger.error(message)
+            self.registry.update_status(book["book_id"], "error")
+            finish(index, {"status": "error", "message": message, "book_id": book["book_id"]})
+
+        def complete(index: int):
+            book = active[index]
+            if book["chunks"] is None or book["written"] < book["chunks"]:
+                return
+            del active[index]
+            self.registry.update_metadata(book["book_id"], {"paragraphs": book["paragraphs"]})
+            self.registry.update_status(book["book_id"], "ready")
+            logger.info(f"Tamamlandi: {book['pdf_path'].name}")
+            finish(index, {
+                "status": "success",
+                "message": f"Basariyla yuklendi: {book['pdf_path'].stem}",
+                "book_id": book["book_id"],
+                "paragraphs": book["paragraphs"],
+                "pages": book["num_pages"]
+            })
+
+        try:
+            while done < embed_threads:
+                message = write_queue.get()
+                if isinstance(message, BaseException):
+                    raise message
+                kind, index, payload = message
+
+                if kind == "done":
+                    done += 1
+
+                elif kind == "hashed":
+                    book_id = payload["book_id"]
+                    pdf_file = payload["pdf_path"]
+                    if payload["hashed"] and book_id:
+                        self.registry.remember_id(payload["fingerprint"], book_id)
+
+                    if "error" in payload:
+                        logger.error(f"{pdf_file.name}: {payload['error']}")
+                        finish(index, {"status": "error", "message": payload["error"], "book_id": book_id})
+                    elif payload.get("skipped"):
+                        existing = self.registry.get(book_id) or self.registry.get_by_source_hash(book_id) or {}
+                        finish(index, {
+                            "status": "skipped",
+                            "message": f"Kitap zaten yuklu: {pdf_file.name}",
+                            "book_id": existing.get("id", book_id),
+                            "paragraphs": existing.get("paragraphs", 0),
+                            "pages": existing.get("pages", 0)
+                        })
+                    elif "duplicate_of" in payload:
+                        original = payload["duplicate_of"]
+                        if results[original] is not None:
+                            finish_duplicate(index, results[original])
+                        else:
+                            duplicates.setdefault(original, []).append(index)
+
+                elif kind == "book":
+                    book_id = payload["book_id"]
+                    if force and self.registry.exists_by_id(book_id):
+                        self.vector_store.delete_book(book_id)
+                        self.registry.delete(book_id)
+                    self.registry.add(payload["pdf_path"], {
+                        "title": payload["pdf_path"].stem,
+                        "pages": payload["num_pages"],
+                        "paragraphs": 0
+                    }, book_id=book_id)
+                    self.registry.update_status(book_id, "processing")
+                    active[index] = {**payload, "written": 0, "chunks": None}
+
+                elif kind == "end":
+                    if index not in active:
+                        # Sayfa sayisi okunamadi (kayit yok) veya kitap zaten hata verdi
+                        if results[index] is None:
+                            logger.error(f"{payload['pdf_path'].name}: {payload['error']}")
+                            finish(index, {"status": "error", "message": payload["error"], "book_id": payload["book_id"]})
+                    elif "error" in payload:
+                        fail(index, payload["error"])
+                    elif not payload["paragraphs"]:
+                        del active[index]
+                        self.registry.delete(payload["book_id"])
+                        finish(index, {
+                            "status": "error",
+                            "message": "PDF'den paragraf cikarilamadi",
+                            "book_id": payload["book_id"]
+                        })
+                    else:
+                        active[index].update(paragraphs=payload["paragraphs"], chunks=payload["chunks"])
+                        complete(index)
+
+                elif index in active:
+                    # Hata veren kitabin kalan chunk'lari atlanir
+                    if kind == "failed":
+                        fail(index, f"Ingest hatasi: {str(payload)}")
+                        continue
+
+                    book = active[index]
+                    try:
+                        self.vector_store.write_chunk(book["book_id"], payload)
+                        self.division_index.add_paragraphs(book["book_id"], payload["ids"], payload["paragraphs"])
+                    except Exception as e:
+                        fail(index, f"Ingest hatasi: {str(e)}")
+                        continue
+
+                    book["written"] += 1
+                    complete(index)
+        finally:
+            stop.set()
+            for thread in threads:
+                thread.join()
+            # Pool kapanana kadar kuyruk bosaltilir: dolu kuyrukta bekleyen worker kalmaz
+            closed = threading.Event()
+            drain = threading.Thread(target=_drain, args=(parse_queue, closed), daemon=True)
+            drain.start()
+            executor.shutdown(wait=True, cancel_futures=True)
+            closed.set()
+            drain.join()
+            progress.close()
+
+        return results
+
     def get_stats(self) -> dict:
         """Pipeline istatistikleri"""
         registry_stats = self.registry.get_stats()
         vector_stats = self.vector_store.get_total_stats()
 
-        return {
+        stats = {
             "registry": registry_stats,
-            "vectordb": vector_stats
+            "vectordb": vector_stats,
+            "division_index": self.division_index.get_stats(),
+            "lexical_index": self.vector_store.lexical_index.get_stats()
         }
+        if self.parser.page_cache:
+            stats["page_cache"] = self.parser.page_cache.get_stats()
+        if self.vector_store.embedder.cache:
+            stats["embedding_cache"] = self.vector_store.embedder.cache.get_stats()
+        stats["models"] = get_model_stats()
+        return stats
 
 
 # Kolay kullanim icin fonksiyonlar
@@ -282,6 +997,9 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="PDF Ingest Pipeline")
     parser.add_argument("path", nargs="?", help="PDF dosyasi veya klasor yolu")
     parser.add_argument("--force", "-f", action="store_true", help="Zaten yuklu olanlari yeniden yukle")
+    parser.add_argument("--parallel", "-p", action="store_true", help="Klasor: asamali paralel ingest")
+    parser.add_argument("--resume", "-r", action="store_true", help="Yarim kalan kitaplara checkpoint'ten devam et")
+    parser.add_argument("--update", "-u", metavar="BOOK_ID", help="PDF: kitabin yeni baskisi (sadece degisen sayfalar)")
 
     args = parser.parse_args()
 
@@ -289,13 +1007,15 @@ if __name__ == "__main__":
 
     if args.path:
         path = Path(args.path)
-        if path.is_file():
-            result = pipeline.ingest_pdf(path, force=args.force)
+        if path.is_file() and args.update:
+            result = pipeline.update_pdf(path, args.update)
+        elif path.is_file():
+            result = pipeline.ingest_pdf(path, force=args.force, resume=args.resume)
         else:
-            result = pipeline.ingest_folder(path, force=args.force)
+            result = pipeline.ingest_folder(path, force=args.force, parallel=args.parallel, resume=args.resume)
     else:
         # Default: INPUT_DIR
-        result = pipeline.ingest_folder(force=args.force)
+        result = pipeline.ingest_folder(force=args.force, parallel=args.parallel, resume=args.resume)
 
     print("\n" + "=" * 50)
     print("SONUC:")
@@ -0,0 +1,209 @@
+"""
+PageGeneral v2 - Lexical Index
+Paragraf metinleri uzerinde BM25 ters indeksi (SQLite FTS5)
+"""
+
+import re
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import LEXICAL_INDEX_FILE, get_logger
+from src.sqlite_store import SQLiteStore
+
+logger = get_logger(__name__)
+
+# unicode61 tokenizer'i aksanlari kaldirir (ş->s, ç->c, ...) ama noktasiz
+# ı ve noktali İ'nin ayristirmasi yok; "Sarıkamış" ile "Sarikamis" eslessin diye
+_TURKISH_FOLD = str.maketrans({"ı": "i", "İ": "I"})
+_TOKEN_RE = re.compile(r"\w+")
+
+# Tek IN (...) sorgusundaki en fazla parametre (eski SQLite surumleri 999)
+_MAX_SQL_VARIABLES = 900
+
+
+def fold_text(text: str) -> str:
+    """Indeks ve sorgu icin ortak normalizasyon"""
+    return text.translate(_TURKISH_FOLD)
+
+
+def match_query(query: str) -> str:
+    """
+    Serbest metin sorgusunu FTS5 MATCH ifadesine cevir.
+
+    Kelimeler tirnaklanip OR ile baglanir (operator/sozdizimi hatasi olmaz);
+    siralamayi BM25 yapar.
+    """
+    tokens = _TOKEN_RE.findall(fold_text(query))
+    return " OR ".join(f'"{token}"' for token in dict.fromkeys(tokens))
+
+
+class LexicalIndex(SQLiteStore):
+    """
+    Paragraf metinlerinin kalici BM25 indeksi.
+
+    VectorStore.add_book / delete_book ile birlikte guncellenir; tam birim
+    adlari ve yer isimleri ("36 nci Firka", "Sarikamis") dense aramada
+    geride kaldiginda hybrid_search'un lexical ayagini saglar.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS documents (
+            rowid INTEGER PRIMARY KEY,
+            para_id TEXT NOT NULL UNIQUE,
+            book_id TEXT NOT NULL
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_documents_book ON documents(book_id)",
+        """
+        CREATE VIRTUAL TABLE IF NOT EXISTS paragraphs USING fts5(
+            text,
+            tokenize = 'unicode61 remove_diacritics 2'
+        )
+        """,
+    )
+
+    def __init__(self, db_path: Path = None):
+        super().__init__(db_path or LEXICAL_INDEX_FILE)
+
+    def _rowids(self, ids: List[str]) -> List[int]:
+        """Paragraf ID'lerinin rowid'leri, IN (...) gruplariyla (transaction icinde cagrilir)"""
+        rowids = []
+        for start in range(0, len(ids), _MAX_SQL_VARIABLES):
+            chunk = ids[start:start + _MAX_SQL_VARIABLES]
+            rowids.extend(row[0] for row in self.conn.execute(
+                f"SELECT rowid FROM documents WHERE para_id IN ({','.join('?' * len(chunk))})",
+                chunk
+            ))
+        return rowids
+
+    def _delete_rowids(self, rowids: List[int]):
+        """Verilen kayitlari iki tablodan da sil (transaction icinde cagrilir)"""
+        self.conn.executemany("DELETE FROM paragraphs WHERE rowid = ?", [(r,) for r in rowids])
+        self.conn.executemany("DELETE FROM documents WHERE rowid = ?", [(r,) for r in rowids])
+
+    def add(self, book_id: str, ids: List[str], texts: List[str]):
+        """Paragraflari indekse ekle (ayni ID varsa degistirilir)"""
+        if not ids:
+            return
+
+        with self._transaction() as conn:
+            existing = self._rowids(ids)
+            if existing:
+                self._delete_rowids(existing)
+
+            conn.executemany(
+                "INSERT INTO documents (para_id, book_id) VALUES (?, ?)",
+                [(para_id, book_id) for para_id in ids]
+            )
+            # FTS rowid'i documents'tan (UNIQUE para_id index'i ile) alinir
+            conn.executemany(
+                "INSERT INTO paragraphs (rowid, text) SELECT rowid, ? FROM documents WHERE para_id = ?",
+                [(fold_text(text), para_id) for para_id, text in zip(ids, texts)]
+            )
+
+    def delete(self, ids: List[str]):
+        """Verilen paragraflari sil"""
+        with self._transaction():
+            self._delete_rowids(self._rowids(ids))
+
+    def delete_book(self, book_id: str):
+        """Kitabin tum paragraflarini sil"""
+        with self._transaction() as conn:
+            rowids = [row[0] for row in conn.execute(
+                "SELECT rowid FROM documents WHERE book_id = ?", (book_id,)
+            )]
+            self._delete_rowids(rowids)
+
+    def search(
+        self,
+        query: str,
+        top_k: int,
+        book_ids: List[str] = None,
+        offset: int = 0
+    ) -> List[Tuple[str, float]]:
+        """
+        BM25 aramasi.
+
+        offset ile siralamanin devami okunur (hybrid_search'te tumen
+        filtresi icin aday sayfalari).
+
+        Returns:
+            [(paragraf_id, bm25_skoru), ...] - en iyiden kotuye
+            (FTS5 bm25() negatiftir; kucuk olan daha iyidir)
+        """
+        expression = match_query(query)
+        if not expression:
+            return []
+
+        sql = (
+            "SELECT d.para_id, bm25(paragraphs) AS score "
+            "FROM paragraphs JOIN documents d ON d.rowid = paragraphs.rowid "
+            "WHERE paragraphs MATCH ?"
+        )
+        params = [expression]
+        if book_ids:
+            sql += f" AND d.book_id IN ({','.join('?' * len(book_ids))})"
+            params.extend(book_ids)
+        sql += " ORDER BY score LIMIT ? OFFSET ?"
+        params.extend([top_k, offset])
+
+        with self._lock:
+            return [(para_id, score) for para_id, score in self.conn.execute(sql, params)]
+
+    def rebuild(self, vector_store, book_id: str = None) -> Dict:
+        """
+        Indeksi VectorDB'deki metinlerden yeniden olustur (mevcut koleksiyonlar icin).
+
+        Returns:
+            {"paragraphs": 335, "seconds": 0.4}
+        """
+        start = time.perf_counter()
+        with self._transaction() as conn:
+            if book_id:
+                rowids = [row[0] for row in conn.execute(
+                    "SELECT rowid FROM documents WHERE book_id = ?", (book_id,)
+                )]
+                self._delete_rowids(rowids)
+            else:
+                conn.execute("DELETE FROM paragraphs")
+                conn.execute("DELETE FROM documents")
+
+        paragraphs = 0
+        for page in vector_store.iter_paragraphs(book_id):
+            by_book = {}
+            for para_id, document, meta in zip(page["ids"], page["documents"], page["metadatas"]):
+                ids, texts = by_book.setdefault(meta.get("book_id", ""), ([], []))
+                ids.append(para_id)
+                texts.append(document)
+            for book, (ids, texts) in by_book.items():
+                self.add(book, ids, texts)
+                paragraphs += len(ids)
+
+        elapsed = time.perf_counter() - start
+        logger.info(f"Lexical index olusturuldu: {paragraphs} paragraf ({elapsed:.1f}s)")
+        return {
+            "paragraphs": paragraphs,
+            "seconds": round(elapsed, 2)
+        }
+
+    def get_stats(self) -> dict:
+        """Index istatistikleri"""
+        with self._lock:
+            paragraphs, books = self.conn.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT book_id) FROM documents"
+            ).fetchone()
+        return {
+            "paragraphs": paragraphs,
+            "books": books
+        }
+
+
+# Test
+if __name__ == "__main__":
+    index = LexicalIndex()
+    print("Lexical Index Stats:", index.get_stats())
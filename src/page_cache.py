@@ -0,0 +1,183 @@
+"""
+PageGeneral v2 - Page Text Cache
+pypdf sayfa metinleri icin kalici disk cache'i (SQLite + zlib)
+"""
+
+import time
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, Optional
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import PAGE_CACHE_FILE, PAGE_CACHE_MAX_MB, get_logger
+from src.sqlite_store import SQLiteStore
+
+logger = get_logger(__name__)
+
+
+class PageTextCache(SQLiteStore):
+    """
+    Sayfa metni cache'i.
+
+    Anahtar: (PDF hash, sayfa index'i, parser versiyonu).
+    Boyut PAGE_CACHE_MAX_MB'i asinca en uzun suredir kullanilmayan
+    sayfalar silinir.
+    """
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS pages (
+            pdf_hash TEXT NOT NULL,
+            page INTEGER NOT NULL,
+            version TEXT NOT NULL,
+            text BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL,
+            PRIMARY KEY (pdf_hash, page, version)
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages(last_used)",
+        """
+        CREATE TABLE IF NOT EXISTS documents (
+            pdf_hash TEXT NOT NULL,
+            version TEXT NOT NULL,
+            num_pages INTEGER NOT NULL,
+            PRIMARY KEY (pdf_hash, version)
+        )
+        """,
+    )
+
+    def __init__(self, db_path: Path = None, max_bytes: int = None):
+        super().__init__(db_path or PAGE_CACHE_FILE)
+        self.max_bytes = max_bytes or PAGE_CACHE_MAX_MB * 1024 * 1024
+        self.hits = 0
+        self.misses = 0
+
+    def get_page_count(self, pdf_hash: str, version: str) -> Optional[int]:
+        """Cache'teki sayfa sayisi (yoksa None)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT num_pages FROM documents WHERE pdf_hash = ? AND version = ?",
+                (pdf_hash, version)
+            ).fetchone()
+        return row[0] if row else None
+
+    def set_page_count(self, pdf_hash: str, version: str, num_pages: int):
+        """Sayfa sayisini kaydet"""
+        self._write(
+            "INSERT OR REPLACE INTO documents (pdf_hash, version, num_pages) VALUES (?, ?, ?)",
+            (pdf_hash, version, num_pages)
+        )
+
+    def get_many(self, pdf_hash: str, pages: Iterable[int], version: str) -> Dict[int, str]:
+        """
+        Birden fazla sayfayi tek sorguda getir.
+
+        Args:
+            pdf_hash: PDF hash'i
+            pages: Sayfa index'leri (0'dan baslar)
+            version: Parser versiyonu
+
+        Returns:
+            {sayfa_index: metin} - sadece cache'te bulunanlar
+        """
+        pages = list(pages)
+        if not pages:
+            return {}
+
+        placeholders = ",".join("?" * len(pages))
+        with self._transaction() as conn:
+            rows = conn.execute(
+                f"SELECT page, text FROM pages WHERE pdf_hash = ? AND version = ? AND page IN ({placeholders})",
+                [pdf_hash, version, *pages]
+            ).fetchall()
+
+            found = {page: zlib.decompress(blob).decode("utf-8") for page, blob in rows}
+            if found:
+                now = time.time()
+                conn.executemany(
+                    "UPDATE pages SET last_used = ? WHERE pdf_hash = ? AND page = ? AND version = ?",
+                    [(now, pdf_hash, page, version) for page in found]
+                )
+
+            self.hits += len(found)
+            self.misses += len(pages) - len(found)
+
+        return found
+
+    def put_many(self, pdf_hash: str, pages: Dict[int, str], version: str):
+        """Sayfa metinlerini kaydet, gerekirse eski kayitlari sil"""
+        if not pages:
+            return
+
+        now = time.time()
+        rows = []
+        for page, text in pages.items():
+            blob = zlib.compress(text.encode("utf-8"))
+            rows.append((pdf_hash, page, version, blob, len(blob), now))
+
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages (pdf_hash, page, version, text, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                rows
+            )
+            self._evict()
+
+    def _evict(self):
+        """Boyut limiti asildiysa en eski sayfalari sil (%90'a kadar; transaction icinde)"""
+        total = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * 0.9)
+        removed = 0
+        cursor = self.conn.execute(
+            "SELECT pdf_hash, page, version, size FROM pages ORDER BY last_used"
+        )
+        victims = []
+        for pdf_hash, page, version, size in cursor:
+            if total <= target:
+                break
+            victims.append((pdf_hash, page, version))
+            total -= size
+            removed += 1
+
+        self.conn.executemany(
+            "DELETE FROM pages WHERE pdf_hash = ? AND page = ? AND version = ?",
+            victims
+        )
+        logger.info(f"Page cache: {removed} sayfa silindi (limit: {self.max_bytes // (1024 * 1024)} MB)")
+
+    def clear(self):
+        """Cache'i bosalt"""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM pages")
+            conn.execute("DELETE FROM documents")
+        self.hits = 0
+        self.misses = 0
+
+    def get_stats(self) -> dict:
+        """Hit/miss ve boyut istatistikleri"""
+        with self._lock:
+            entries, size = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_mb": round(size / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2)
+        }
+
+
+# Test
+if __name__ == "__main__":
+    cache = PageTextCache()
+    print("Page Cache Stats:", cache.get_stats())
@@ -4,10 +4,18 @@ pypdf ile basit metin çıkarma + Division detection
 """
 
 import re
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Optional
+import pypdf
 from pypdf import PdfReader
 import config
+from src.page_cache import PageTextCache
+from src.registry import calculate_pdf_hash
+
+# Cache anahtarının parçası: çıkarma mantığı veya pypdf değişince cache geçersiz olur
+PARSER_VERSION = f"1-pypdf{pypdf.__version__}"
 
 
 def get_compiled_patterns():
@@ -15,6 +23,97 @@ def get_compiled_patterns():
     return [re.compile(p, re.IGNORECASE) for p in config.DIVISION_PATTERNS]
 
 
+def _score_divisions(divisions: List[str]) -> Tuple[List[str], float]:
+    """Confidence: bulunan division sayısına göre"""
+    if not divisions:
+        return [], 0.0
+    elif len(divisions) == 1:
+        return divisions, 0.95
+    elif len(divisions) <= 3:
+        return divisions, 0.85
+    else:
+        return divisions, 0.75
+
+
+class DivisionDetector:
+    """
+    DIVISION_PATTERNS'i bir kez compile eder ve tekrar kullanır.
+
+    - Anahtar kelimelerden hiçbirini içermeyen metin regex'e hiç girmez
+    - Her pattern metni ayrı tarar (eski findall davranışı): farklı
+      pattern'lerin örtüşen eşleşmeleri de bulunur
+    - detect_many() bir sayfanın paragraflarını tek çağrıda işler
+    """
+
+    def __init__(self, patterns: List[str], keywords: List[str]):
+        self.patterns = tuple(patterns)
+        self.keywords = tuple(k.lower() for k in keywords)
+        self.compiled = [re.compile(p, re.IGNORECASE) for p in self.patterns]
+
+    def prefilter(self, text: str) -> bool:
+        """Metin anahtar kelimelerden en az birini içeriyor mu (ucuz ön kontrol)"""
+        lowered = text.lower()
+        return any(keyword in lowered for keyword in self.keywords)
+
+    def find(self, text: str) -> List[Tuple[str, int, int]]:
+        """
+        Metindeki tüm tümen referansları.
+
+        Returns:
+            [(tümen_no, başlangıç, bitiş), ...] - eşleşmenin metindeki yeri,
+            başlangıca göre sıralı
+        """
+        if not self.prefilter(text):
+            return []
+
+        spans = []
+        for pattern in self.compiled:
+            # findall ile aynı kural: tek grup -> grup, grupsuz -> tüm eşleşme,
+            # çok grup -> tuple döner ve sayı olmadığı için atlanır
+            if pattern.groups > 1:
+                continue
+            for match in pattern.finditer(text):
+                div_num = match.group(pattern.groups).strip()
+                if div_num.isdigit():
+                    spans.append((div_num, match.start(), match.end()))
+        spans.sort(key=lambda span: (span[1], span[2]))
+        return spans
+
+    def detect(self, text: str) -> Tuple[List[str], float]:
+        """Tek metin için (divisions_list, confidence_score)"""
+        divisions = list(dict.fromkeys(div for div, _, _ in self.find(text)))
+        return _score_divisions(divisions)
+
+    def detect_many(self, texts: List[str]) -> List[Tuple[List[str], float]]:
+        """
+        Metin listesi için toplu detection.
+
+        Returns:
+            Her metin için (divisions_list, confidence_score), aynı sırayla
+        """
+        return [self.detect(text) for text in texts]
+
+
+_detector: Optional[DivisionDetector] = None
+
+
+def get_detector() -> DivisionDetector:
+    """
+    Modül seviyesinde tek detector.
+
+    Sadece config.DIVISION_PATTERNS veya DIVISION_KEYWORDS değişince yeniden
+    compile edilir.
+    """
+    global _detector
+    if (
+        _detector is None
+        or _detector.patterns != tuple(config.DIVISION_PATTERNS)
+        or _detector.keywords != tuple(k.lower() for k in config.DIVISION_KEYWORDS)
+    ):
+        _detector = DivisionDetector(config.DIVISION_PATTERNS, config.DIVISION_KEYWORDS)
+    return _detector
+
+
 def detect_divisions(text: str) -> Tuple[List[str], float]:
     """
     Metinde tümen/division referanslarını tespit et.
@@ -22,35 +121,286 @@ def detect_divisions(text: str) -> Tuple[List[str], float]:
     Returns:
         (divisions_list, confidence_score)
     """
-    divisions = set()
-    patterns = get_compiled_patterns()
-
-    for pattern in patterns:
-        matches = pattern.findall(text)
-        for match in matches:
-            # Sadece sayıyı al ve normalize et
-            div_num = str(match).strip()
-            if div_num.isdigit():
-                divisions.add(div_num)
-
-    # Confidence: bulunan division sayısına göre
-    if not divisions:
-        return [], 0.0
-    elif len(divisions) == 1:
-        return list(divisions), 0.95
-    elif len(divisions) <= 3:
-        return list(divisions), 0.85
-    else:
-        return list(divisions), 0.75
+    return get_detector().detect(text)
+
+
+def detect_many(texts: List[str]) -> List[Tuple[List[str], float]]:
+    """Birden fazla metin için toplu division detection"""
+    return get_detector().detect_many(texts)
+
+
+def _split_paragraphs(page_no: int, text: str) -> List[Dict]:
+    """Sayfa metnini paragraflara ayır + division detection"""
+    if not text:
+        return []
+
+    texts = [para.strip() for para in text.split('\n\n')]
+    texts = [para for para in texts if para]
+
+    return [
+        {
+            "text": para,
+            "page": page_no,
+            "division": divisions,
+            "confidence": confidence
+        }
+        for para, (divisions, confidence) in zip(texts, detect_many(texts))
+    ]
+
+
+def _extract_pages(pdf_path: str, page_indices: List[int]) -> List[Tuple[int, str, List[Dict]]]:
+    """
+    Verilen sayfaları tek geçişte işle (process pool worker'ı).
+
+    Her sayfa için extract_text() sadece bir kez çağrılır.
+
+    Args:
+        pdf_path: PDF dosyasının yolu
+        page_indices: Sayfa index'leri (0'dan başlar)
+
+    Returns:
+        [(sayfa_no, sayfa_metni, paragraflar), ...] - verilen sırayla
+    """
+    reader = PdfReader(pdf_path)
+    pages = []
+    for index in page_indices:
+        text = (reader.pages[index].extract_text() or "").strip()
+        pages.append((index + 1, text, _split_paragraphs(index + 1, text)))
+    return pages
+
+
+def _markdown_header(pdf_path: Path, num_pages: int) -> str:
+    """Markdown dosya başlığı"""
+    return (
+        f"# {pdf_path.stem}\n\n"
+        f"**Kaynak:** {pdf_path.name}\n"
+        f"**Sayfalar:** {num_pages}\n\n"
+        "---\n\n"
+    )
+
+
+def _markdown_page(page_no: int, text: str) -> str:
+    """Tek sayfanın markdown bölümü"""
+    return f"## Sayfa {page_no}\n\n{text}\n\n---\n\n"
 
 
 class PDFParser:
     """PDF → Markdown dönüştürücü (Hafif)"""
 
+    def __init__(self, workers: int = None, pages_per_task: int = None, use_cache: bool = None):
+        """
+        Args:
+            workers: Paralel process sayısı (default: config'den, 1 = sıralı)
+            pages_per_task: Her worker görevine düşen sayfa sayısı
+            use_cache: Sayfa metni cache'i kullanılsın mı (default: config'den)
+        """
+        self.workers = max(1, workers or config.PDF_PARSE_WORKERS)
+        self.pages_per_task = max(1, pages_per_task or config.PDF_PARSE_PAGES_PER_TASK)
+
+        use_cache = config.PAGE_CACHE_ENABLED if use_cache is None else use_cache
+        self.page_cache = PageTextCache() if use_cache else None
+
+    def _resolve_hash(self, pdf_path: Path, pdf_hash: str = None) -> Optional[str]:
+        """Cache anahtarı için PDF hash'i (cache kapalıysa None)"""
+        if self.page_cache is None:
+            return None
+        return pdf_hash or calculate_pdf_hash(pdf_path)
+
+    def get_page_count(self, pdf_path: str | Path, pdf_hash: str = None) -> int:
+        """PDF sayfa sayısı (metin çıkarmadan)"""
+        pdf_hash = self._resolve_hash(Path(pdf_path), pdf_hash)
+        if pdf_hash:
+            cached = self.page_cache.get_page_count(pdf_hash, PARSER_VERSION)
+            if cached is not None:
+                return cached
+
+        num_pages = len(PdfReader(str(pdf_path)).pages)
+        if pdf_hash:
+            self.page_cache.set_page_count(pdf_hash, PARSER_VERSION, num_pages)
+        return num_pages
+
+    def _lookup_cache(self, pdf_hash: Optional[str], page_indices: List[int]) -> Dict[int, str]:
+        """Cache'teki sayfa metinleri {index: metin}"""
+        if not pdf_hash:
+            return {}
+        return self.page_cache.get_many(pdf_hash, page_indices, PARSER_VERSION)
+
+    def _merge_chunk(
+        self,
+        pdf_hash: Optional[str],
+        page_indices: List[int],
+        cached: Dict[int, str],
+        extracted: List[Tuple[int, str, List[Dict]]]
+    ) -> List[Tuple[int, str, List[Dict]]]:
+        """Cache'ten gelen ve yeni çıkarılan sayfaları sırayla birleştir"""
+        if pdf_hash and extracted:
+            self.page_cache.put_many(
+                pdf_hash,
+                {page_no - 1: text for page_no, text, _ in extracted},
+                PARSER_VERSION
+            )
+
+        by_index = {page[0] - 1: page for page in extracted}
+        chunk = []
+        for index in page_indices:
+            if index in cached:
+                text = cached[index]
+                chunk.append((index + 1, text, _split_paragraphs(index + 1, text)))
+            else:
+                chunk.append(by_index[index])
+        return chunk
+
+    def _iter_page_chunks(
+        self,
+        pdf_path: Path,
+        start: int,
+        end: int,
+        pdf_hash: str = None
+    ) -> Iterator[List[Tuple[int, str, List[Dict]]]]:
+        """
+        [start, end) aralığını parça parça, sayfa sırasıyla üret.
+
+        Cache'te olan sayfalar için pypdf çağrılmaz. Paralel modda aynı anda
+        en fazla 2 * workers parça bellekte tutulur.
+        """
+        chunks = [
+            list(range(chunk_start, min(chunk_start + self.pages_per_task, end)))
+            for chunk_start in range(start, end, self.pages_per_task)
+        ]
+
+        if self.workers == 1 or len(chunks) < 2:
+            for page_indices in chunks:
+                cached = self._lookup_cache(pdf_hash, page_indices)
+                missing = [i for i in page_indices if i not in cached]
+                extracted = _extract_pages(str(pdf_path), missing) if missing else []
+                yield self._merge_chunk(pdf_hash, page_indices, cached, extracted)
+            return
+
+        workers = min(self.workers, len(chunks))
+        if config.VERBOSE:
+            print(f"[PARSE] {len(chunks)} parça, {workers} worker")
+
+        executor = ProcessPoolExecutor(max_workers=workers)
+        pending = deque()
+
+        def collect():
+            page_indices, cached, future = pending.popleft()
+            extracted = future.result() if future else []
+            return self._merge_chunk(pdf_hash, page_indices, cached, extracted)
+
+        try:
+            for page_indices in chunks:
+                cached = self._lookup_cache(pdf_hash, page_indices)
+                missing = [i for i in page_indices if i not in cached]
+                future = executor.submit(_extract_pages, str(pdf_path), missing) if missing else None
+                pending.append((page_indices, cached, future))
+                # Backpressure: pencere dolunca en eski parçayı teslim et
+                if len(pending) >= workers * 2:
+                    yield collect()
+            while pending:
+                yield collect()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def iter_pages(
+        self,
+        pdf_path: str | Path,
+        page_range: Tuple[int, Optional[int]] = None,
+        pdf_hash: str = None
+    ) -> Iterator[Tuple[int, str, List[Dict]]]:
+        """
+        Sayfaları tek tek üret: (sayfa_no, sayfa_metni, paragraflar).
+
+        Args:
+            pdf_path: PDF dosyasının yolu
+            page_range: (ilk, son) sayfa, 1'den başlar ve dahildir; son None ise sona kadar
+            pdf_hash: Biliniyorsa PDF hash'i (cache anahtarı, tekrar hesaplanmaz)
+        """
+        pdf_path = Path(pdf_path)
+        pdf_hash = self._resolve_hash(pdf_path, pdf_hash)
+        num_pages = self.get_page_count(pdf_path, pdf_hash)
+
+        start, end = 0, num_pages
+        if page_range:
+            first, last = page_range
+            start = max(0, (first or 1) - 1)
+            end = min(num_pages, last or num_pages)
+
+        hits_before = self.page_cache.hits if self.page_cache else 0
+        for chunk in self._iter_page_chunks(pdf_path, start, end, pdf_hash):
+            yield from chunk
+
+        if self.page_cache and config.VERBOSE:
+            hits = self.page_cache.hits - hits_before
+            print(f"[CACHE] {pdf_path.name}: {hits}/{max(end - start, 0)} sayfa cache'ten")
+
+    def iter_paragraphs(
+        self,
+        pdf_path: str | Path,
+        page_range: Tuple[int, Optional[int]] = None,
+        write_markdown: bool = False,
+        pdf_hash: str = None
+    ) -> Iterator[Dict]:
+        """
+        Paragrafları sayfa sayfa üret (sabit bellek).
+
+        Args:
+            pdf_path: PDF dosyasının yolu
+            page_range: (ilk, son) sayfa aralığı, bkz. iter_pages
+            write_markdown: True ise sayfalar işlendikçe markdown dosyasına yazılır
+            pdf_hash: Biliniyorsa PDF hash'i (cache anahtarı)
+
+        Yields:
+            {"text": ..., "page": 241, "division": [...], "confidence": 0.95}
+        """
+        pdf_path = Path(pdf_path)
+        pdf_hash = self._resolve_hash(pdf_path, pdf_hash)
+
+        if not write_markdown:
+            for _, _, page_paragraphs in self.iter_pages(pdf_path, page_range, pdf_hash):
+                yield from page_paragraphs
+            return
+
+        output_file = config.PROCESSED_DIR / f"{pdf_path.stem}.md"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(_markdown_header(pdf_path, self.get_page_count(pdf_path, pdf_hash)))
+            for page_no, text, page_paragraphs in self.iter_pages(pdf_path, page_range, pdf_hash):
+                if text:
+                    f.write(_markdown_page(page_no, text))
+                yield from page_paragraphs
+
+        if config.VERBOSE:
+            print(f"[OK] Kaydedildi: {output_file}")
+
+    def save_markdown(self, pdf_path: str | Path, pdf_hash: str = None) -> Path:
+        """
+        Tüm kitabın markdown dosyasını (yeniden) yaz.
+
+        Paragraf üretmeden sadece sayfa metinleri okunur (cache'te olanlar
+        için pypdf çağrılmaz).
+
+        Returns:
+            Markdown dosyasının yolu
+        """
+        pdf_path = Path(pdf_path)
+        pdf_hash = self._resolve_hash(pdf_path, pdf_hash)
+        output_file = config.PROCESSED_DIR / f"{pdf_path.stem}.md"
+        with open(output_file, 'w', encoding='utf-8') as f:
+            f.write(_markdown_header(pdf_path, self.get_page_count(pdf_path, pdf_hash)))
+            for page_no, text, _ in self.iter_pages(pdf_path, pdf_hash=pdf_hash):
+                if text:
+                    f.write(_markdown_page(page_no, text))
+
+        if config.VERBOSE:
+            print(f"[OK] Kaydedildi: {output_file}")
+        return output_file
+
     def parse(self, pdf_path: str | Path) -> dict:
         """
         PDF'i parse et (basit text extraction)
 
+        Büyük kitaplarda bellek için iter_paragraphs() tercih edilmeli.
+
         Args:
             pdf_path: PDF dosyasının yolu
 
@@ -72,24 +422,22 @@ class PDFParser:
             if config.VERBOSE:
                 print(f"[PARSE] {pdf_path.name}")
 
-            # pypdf ile oku
-            reader = PdfReader(str(pdf_path))
-            num_pages = len(reader.pages)
+            pdf_hash = self._resolve_hash(pdf_path)
+            num_pages = self.get_page_count(pdf_path, pdf_hash)
 
-            markdown_content = f"# {pdf_path.stem}\n\n"
-            markdown_content += f"**Kaynak:** {pdf_path.name}\n"
-            markdown_content += f"**Sayfalar:** {num_pages}\n\n"
-            markdown_content += "---\n\n"
-
-            # Her sayfadan metin çıkar
-            for i, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-
-                # Boşlukları temizle
-                text = text.strip()
+            markdown_parts = [_markdown_header(pdf_path, num_pages)]
+            paragraphs_with_pages = []
+            all_divisions = set()  # Tüm doküman için
 
+            # Her sayfadan metin + paragraflar (tek geçiş)
+            for page_no, text, page_paragraphs in self.iter_pages(pdf_path, pdf_hash=pdf_hash):
                 if text:
-                    markdown_content += f"## Sayfa {i}\n\n{text}\n\n---\n\n"
+                    markdown_parts.append(_markdown_page(page_no, text))
+                for para in page_paragraphs:
+                    all_divisions.update(para["division"])
+                    paragraphs_with_pages.append(para)
+
+            markdown_content = "".join(markdown_parts)
 
             # Markdown'ı kaydet
             output_file = config.PROCESSED_DIR / f"{pdf_path.stem}.md"
@@ -99,29 +447,6 @@ class PDFParser:
             if config.VERBOSE:
                 print(f"[OK] Kaydedildi: {output_file}")
 
-            # Sayfa bazlı paragrafları çıkar + division detection
-            paragraphs_with_pages = []
-            all_divisions = set()  # Tüm doküman için
-
-            for i, page in enumerate(reader.pages, 1):
-                text = page.extract_text()
-                if text and text.strip():
-                    # Her sayfadaki paragrafları ayır
-                    page_paragraphs = text.strip().split('\n\n')
-                    for para in page_paragraphs:
-                        para = para.strip()
-                        if para:
-                            # Division detection
-                            divisions, confidence = detect_divisions(para)
-                            all_divisions.update(divisions)
-
-                            paragraphs_with_pages.append({
-                                "text": para,
-                                "page": i,
-                                "division": divisions,
-                                "confidence": confidence
-                            })
-
             return {
                 "status": "success",
                 "content": markdown_content,
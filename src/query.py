@@ -5,7 +5,9 @@ VectorDB'den istenen formatta tümen listesi çıktısı
 
 import json
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Iterator, List, Dict, Optional, Tuple, Union
+
+import numpy as np
 
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
@@ -18,7 +20,7 @@ except ImportError:
 
 from config import OUTPUT_DIR, get_logger
 from src.vector_store import VectorStore
-from src.registry import BookRegistry
+from src.registry import get_registry
 
 logger = get_logger(__name__)
 
@@ -42,71 +44,128 @@ class DivisionQuery:
 
     def __init__(self):
         self.vector_store = VectorStore()
-        self.registry = BookRegistry()
+        self.registry = get_registry()
+        self.division_index = self.vector_store.division_index
+
+    def iter_paragraphs(
+        self,
+        book_id: str = None,
+        only_with_divisions: bool = False,
+        include_embeddings: bool = True,
+        page_size: int = None
+    ) -> Iterator[Tuple[List[Dict], Optional[np.ndarray]]]:
+        """
+        Paragrafları sayfa sayfa istenen formatta üret.
+
+        Bellekte en fazla bir sayfa (VECTORDB_PAGE_SIZE paragraf) tutulur.
+        Kayıtlarda "embedding" alanı yoktur; embedding'ler sayfanın float32
+        matrisindedir (include_embeddings=False ise None).
+
+        Yields:
+            (kayıt listesi, (n, dim) float32 matris veya None)
+        """
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+
+        # Tümen filtresi ChromaDB tarafında; migrate edilmemiş kayıtlarda
+        # has_division yok, filtre "division" string'i ile burada uygulanır
+        where = None
+        local_filter = False
+        if only_with_divisions:
+            if self.vector_store.missing_division_metadata(book_id):
+                logger.warning("has_division metadata'sı eksik, tümen filtresi yerel uygulanıyor (python run.py migrate)")
+                local_filter = True
+            else:
+                where = {"has_division": True}
+
+        index = 0
+        for page in self.vector_store.iter_paragraphs(
+            book_id,
+            page_size=page_size,
+            include=include,
+            where=where
+        ):
+            records = []
+            keep = []
+            for row, (document, meta) in enumerate(zip(page["documents"], page["metadatas"])):
+                # Division string'i listeye çevir
+                division_str = meta.get("division", "")
+                if local_filter and not division_str:
+                    continue
+                keep.append(row)
+                records.append({
+                    "id": f"parag_{index}",
+                    "document": document,
+                    "metadata": {
+                        "division": division_str.split(",") if division_str else [],
+                        "confidence": meta.get("confidence", 0.0),
+                        "source_page": meta.get("page", 0)
+                    }
+                })
+                index += 1
+
+            embeddings = page["embeddings"]
+            if local_filter:
+                if not records:
+                    continue
+                if embeddings is not None:
+                    embeddings = embeddings[keep]
+            yield records, embeddings
 
     def get_all_paragraphs(
         self,
         book_id: str = None,
         only_with_divisions: bool = False,
-        include_embeddings: bool = True
-    ) -> List[Dict]:
+        include_embeddings: bool = True,
+        as_matrix: bool = False
+    ) -> Union[List[Dict], Tuple[List[Dict], np.ndarray]]:
         """
         VectorDB'den tüm paragrafları al.
 
+        Büyük koleksiyonlarda iter_paragraphs() tercih edilmeli; bu metod
+        sonucun tamamını listede toplar.
+
         Args:
             book_id: Belirli bir kitap (None = hepsi)
             only_with_divisions: Sadece tümen içerenleri getir
             include_embeddings: Embedding'leri dahil et
+            as_matrix: True ise embedding'ler kayıtlara liste olarak
+                eklenmez; (kayıtlar, (n, dim) float32 matris) döndürülür.
+                Matrisin i. satırı i. kaydın embedding'idir.
 
         Returns:
             İstenen formatta paragraf listesi
+            (as_matrix=True ise (paragraf listesi, embedding matrisi))
         """
-        # ChromaDB'den veri çek
-        where_filter = {"book_id": book_id} if book_id else None
-
-        results = self.vector_store.collection.get(
-            where=where_filter,
-            include=["documents", "metadatas", "embeddings"] if include_embeddings else ["documents", "metadatas"]
-        )
-
-        if not results or not results["ids"]:
-            return []
-
         paragraphs = []
-        for i, doc_id in enumerate(results["ids"]):
-            meta = results["metadatas"][i]
-
-            # Division string'i listeye çevir
-            division_str = meta.get("division", "")
-            divisions = division_str.split(",") if division_str else []
+        matrices = []
 
-            # Sadece division olanları filtrele
-            if only_with_divisions and not divisions:
+        for records, embeddings in self.iter_paragraphs(book_id, only_with_divisions, include_embeddings):
+            if as_matrix:
+                if embeddings is not None:
+                    matrices.append(embeddings)
+                paragraphs.extend(records)
                 continue
 
-            # Embedding al
-            embedding = []
-            if include_embeddings and results.get("embeddings") is not None:
-                emb = results["embeddings"][i]
-                embedding = emb.tolist() if hasattr(emb, 'tolist') else list(emb)
-
-            para = {
-                "id": f"parag_{i}",
-                "embedding": embedding,
-                "document": results["documents"][i],
-                "metadata": {
-                    "division": divisions,
-                    "confidence": meta.get("confidence", 0.0),
-                    "source_page": meta.get("page", 0)
-                }
-            }
-            paragraphs.append(para)
+            for i, record in enumerate(records):
+                paragraphs.append({
+                    "id": record["id"],
+                    "embedding": embeddings[i].tolist() if embeddings is not None else [],
+                    "document": record["document"],
+                    "metadata": record["metadata"]
+                })
+
+        if as_matrix:
+            if matrices:
+                return paragraphs, np.concatenate(matrices)
+            return paragraphs, np.empty((len(paragraphs), 0), dtype=np.float32)
 
         return paragraphs
 
     def get_divisions_summary(self, book_id: str = None) -> Dict:
         """
-        Tüm tümenlerin özet listesi.
+        Tüm tümenlerin özet listesi (sadece metadata okunur).
 
         Returns:
             {
@@ -116,22 +175,23 @@ class DivisionQuery:
                 "division_counts": {"5": 12, "9": 8, ...}
             }
         """
-        paragraphs = self.get_all_paragraphs(book_id, include_embeddings=False)
-
         all_divisions = set()
         division_counts = {}
         with_divisions = 0
-
-        for para in paragraphs:
-            divs = para["metadata"]["division"]
-            if divs:
-                with_divisions += 1
-                for d in divs:
-                    all_divisions.add(d)
-                    division_counts[d] = division_counts.get(d, 0) + 1
+        total = 0
+
+        for page in self.vector_store.iter_paragraphs(book_id, include=["metadatas"]):
+            total += len(page["ids"])
+            for meta in page["metadatas"]:
+                division_str = meta.get("division", "")
+                if division_str:
+                    with_divisions += 1
+                    for d in division_str.split(","):
+                        all_divisions.add(d)
+                        division_counts[d] = division_counts.get(d, 0) + 1
 
         return {
-            "total_paragraphs": len(paragraphs),
+            "total_paragraphs": total,
             "paragraphs_with_divisions": with_divisions,
             "divisions": sorted(list(all_divisions), key=lambda x: int(x) if x.isdigit() else 0),
             "division_counts": dict(sorted(division_counts.items(), key=lambda x: int(x[0]) if x[0].isdigit() else 0))
@@ -156,14 +216,8 @@ class DivisionQuery:
         Returns:
             {"status": "success", "output_file": "...", "count": 45}
         """
-        paragraphs = self.get_all_paragraphs(book_id, only_with_divisions, include_embeddings)
         summary = self.get_divisions_summary(book_id)
 
-        output_data = {
-            "summary": summary,
-            "paragraphs": paragraphs
-        }
-
         if output_path is None:
             suffix = f"_{book_id}" if book_id else ""
             output_path = OUTPUT_DIR / f"divisions_export{suffix}.json"
@@ -171,18 +225,62 @@ class DivisionQuery:
         output_path = Path(output_path)
         output_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Paragraflar sayfa sayfa okunup tek tek yazılır: bellekte en fazla
+        # bir sayfa tutulur, embedding'ler sadece yazılan satır için listeye
+        # çevrilir
+        count = 0
         with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(output_data, f, ensure_ascii=False, indent=2)
+            f.write('{\n  "summary": ')
+            f.write(json.dumps(summary, ensure_ascii=False))
+            f.write(',\n  "paragraphs": [')
+            for records, embeddings in self.iter_paragraphs(book_id, only_with_divisions, include_embeddings):
+                for i, record in enumerate(records):
+                    record = {
+                        "id": record["id"],
+                        "embedding": embeddings[i].tolist() if embeddings is not None else [],
+                        "document": record["document"],
+                        "metadata": record["metadata"]
+                    }
+                    f.write(",\n    " if count else "\n    ")
+                    f.write(json.dumps(record, ensure_ascii=False))
+                    count += 1
+            f.write("\n  ]\n}\n")
 
         logger.info(f"Export tamamlandi: {output_path}")
 
         return {
             "status": "success",
             "output_file": str(output_path),
-            "total_paragraphs": len(paragraphs),
+            "total_paragraphs": count,
             "divisions_found": summary["divisions"]
         }
 
+    def find_division(self, division: str, book_id: str = None, limit: int = None) -> List[Dict]:
+        """
+        Tümeni anan paragraflar (division index üzerinden, koleksiyon taranmaz).
+
+        Returns:
+            [{"id": ..., "book_id": ..., "book_name": ..., "page": 241,
+              "text": "...", "spans": [[12, 25]]}]
+        """
+        return self.division_index.lookup(division, book_id, limit)
+
+    def concordance(
+        self,
+        division: str,
+        width: int = 60,
+        book_id: str = None,
+        limit: int = None
+    ) -> List[Dict]:
+        """
+        Tümen referanslarının bağlamı (keyword-in-context).
+
+        Returns:
+            [{"id": ..., "book_name": ..., "page": 241,
+              "left": "...", "match": "24 ncü Tümen", "right": "..."}]
+        """
+        return self.division_index.concordance(division, width, book_id, limit)
+
     def list_books(self) -> List[Dict]:
         """Yüklü kitapları listele"""
         return self.registry.list_ready()
@@ -199,6 +297,7 @@ if __name__ == "__main__":
     parser.add_argument("--no-embed", action="store_true", help="Embedding olmadan")
     parser.add_argument("--summary", "-s", action="store_true", help="Sadece özet")
     parser.add_argument("--list-books", "-l", action="store_true", help="Kitapları listele")
+    parser.add_argument("--division", "-t", help="Tümen no: referansları bağlamıyla göster")
 
     args = parser.parse_args()
 
@@ -214,6 +313,13 @@ if __name__ == "__main__":
             print(f"  Paragraf: {book['paragraphs']}")
             print()
 
+    elif args.division:
+        lines = query.concordance(args.division, book_id=args.book)
+        print(f"\n{args.division}. Tümen: {len(lines)} referans")
+        print("=" * 50)
+        for line in lines:
+            print(f"  [{line['book_name']} s.{line['page']}] ...{line['left']} [{line['match']}] {line['right']}...")
+
     elif args.summary:
         summary = query.get_divisions_summary(args.book)
         print("\nTümen Özeti:")
@@ -0,0 +1,191 @@
+"""
+PageGeneral v2 - Query Batcher
+Eszamanli sorgu embedding isteklerini tek encode cagrisinda toplar
+"""
+
+import asyncio
+import bisect
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, List
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+from config import QUERY_BATCH_MAX_SIZE, QUERY_BATCH_MAX_WAIT_MS, QUERY_BATCH_TIMEOUT_SECONDS, get_logger
+from src.embedder import Embedder
+
+logger = get_logger(__name__)
+
+# Histogram bucket ust sinirlari
+BATCH_SIZE_BUCKETS = [1, 2, 4, 8, 16, 32, 64, 128]
+LATENCY_MS_BUCKETS = [1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 5000]
+
+
+class _Histogram:
+    """Sabit bucket'li basit histogram"""
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def to_dict(self) -> Dict:
+        buckets = {f"<={b}": c for b, c in zip(self.bounds, self.counts)}
+        buckets[f">{self.bounds[-1]}"] = self.counts[-1]
+        return {
+            "count": self.count,
+            "avg": round(self.total / self.count, 2) if self.count else 0.0,
+            "buckets": buckets
+        }
+
+
+class QueryBatcher:
+    """
+    Sorgu embedding micro-batcher'i.
+
+    Farkli thread'lerden (Streamlit/Gradio oturumlari) gelen tekil sorgular
+    en fazla max_wait_ms boyunca veya max_batch_size'a ulasana kadar
+    toplanir, tek embed() cagrisiyla encode edilir ve her cagirana kendi
+    sonucu Future ile dondurulur.
+    """
+
+    def __init__(self, embedder: Embedder, max_batch_size: int = None, max_wait_ms: float = None):
+        self.embedder = embedder
+        self.max_batch_size = max_batch_size or QUERY_BATCH_MAX_SIZE
+        self.max_wait = (QUERY_BATCH_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms) / 1000
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._lock = threading.Lock()
+        self._closed = False
+
+        self.batch_sizes = _Histogram(BATCH_SIZE_BUCKETS)
+        self.latencies_ms = _Histogram(LATENCY_MS_BUCKETS)
+
+    def _ensure_started(self):
+        """Toplayici thread'i lazy baslat"""
+        if self._thread is None:
+            with self._lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(target=self._run, name="query-batcher", daemon=True)
+                    self._thread.start()
+
+    def submit(self, text: str) -> Future:
+        """Sorguyu kuyruga ekle, embedding'i Future olarak dondur"""
+        if self._closed:
+            raise RuntimeError("QueryBatcher kapatildi")
+        self._ensure_started()
+        future = Future()
+        self._queue.put((text, future, time.perf_counter()))
+        return future
+
+    def embed(self, text: str, timeout: float = None) -> List[float]:
+        """Senkron arayuz: sonuc gelene kadar bekle (en fazla timeout saniye)"""
+        return self.submit(text).result(timeout=timeout or QUERY_BATCH_TIMEOUT_SECONDS)
+
+    async def aembed(self, text: str) -> List[float]:
+        """asyncio arayuzu: event loop'u bloklamadan bekle"""
+        return await asyncio.wrap_future(self.submit(text))
+
+    def _collect(self) -> list:
+        """Ilk istegi bekle, sonra pencere dolana kadar topla"""
+        batch = [self._queue.get()]
+        if batch[0] is None:
+            return batch
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                item = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(item)
+            if item is None:
+                break
+        return batch
+
+    def _run(self):
+        """Toplayici dongu (daemon thread)"""
+        while True:
+            batch = self._collect()
+            stop = batch[-1] is None
+            requests = [item for item in batch if item is not None]
+
+            if requests:
+                try:
+                    self._process(requests)
+                except Exception as e:
+                    # Dongu olmezse sonraki sorgular sonsuza kadar beklemez
+                    logger.error(f"Sorgu batch'i islenemedi: {e}")
+            if stop:
+                return
+
+    def _process(self, requests: list):
+        """Toplanan istekleri tek embed() ile isle"""
+        # Iptal edilmis istekler (or. aembed cancel) encode edilmez
+        requests = [r for r in requests if r[1].set_running_or_notify_cancel()]
+        if not requests:
+            return
+        texts = [text for text, _, _ in requests]
+        try:
+            embeddings = self.embedder.embed(texts, use_cache=False)
+        except Exception as e:
+            logger.error(f"Sorgu batch'i encode edilemedi: {e}")
+            for _, future, _ in requests:
+                future.set_exception(e)
+            return
+
+        done = time.perf_counter()
+        self.batch_sizes.observe(len(requests))
+        for (_, future, enqueued_at), embedding in zip(requests, embeddings):
+            self.latencies_ms.observe((done - enqueued_at) * 1000)
+            future.set_result(embedding)
+
+    def close(self):
+        """Bekleyen istekleri bitir ve thread'i durdur"""
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
+
+    def get_stats(self) -> Dict:
+        """Batch boyutu ve gecikme histogramlari"""
+        return {
+            "batch_size": self.batch_sizes.to_dict(),
+            "latency_ms": self.latencies_ms.to_dict()
+        }
+
+
+# Process genelinde model basina tek batcher
+_batchers: Dict[str, QueryBatcher] = {}
+_batchers_lock = threading.Lock()
+
+
+def get_query_batcher(embedder: Embedder) -> QueryBatcher:
+    """Embedder'in modeli icin paylasilan batcher"""
+    with _batchers_lock:
+        batcher = _batchers.get(embedder.model_key)
+        if batcher is None:
+            batcher = QueryBatcher(embedder)
+            _batchers[embedder.model_key] = batcher
+        return batcher
+
+
+def get_batcher_stats() -> Dict[str, Dict]:
+    """Tum batcher'larin metrikleri"""
+    with _batchers_lock:
+        return {name: batcher.get_stats() for name, batcher in _batchers.items()}
@@ -5,6 +5,7 @@ Kitap kayit sistemi ve duplicate detection
 
 import json
 import hashlib
+import os
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List, Dict
@@ -12,14 +13,55 @@ from typing import Optional, List, Dict
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import REGISTRY_FILE, get_logger
+from config import REGISTRY_FILE, REGISTRY_DB_FILE, REGISTRY_BACKEND, PDF_HASH_CHUNK_SIZE, get_logger
+from src.sqlite_store import SQLiteStore
 
 logger = get_logger(__name__)
 
 
-def calculate_pdf_hash(pdf_path: Path) -> str:
-    """PDF dosyasinin MD5 hash'ini hesapla (ilk 12 karakter)"""
-    return hashlib.md5(pdf_path.read_bytes()).hexdigest()[:12]
+def calculate_pdf_hash(pdf_path: Path, chunk_size: int = None) -> str:
+    """
+    PDF dosyasinin MD5 hash'ini hesapla (ilk 12 karakter).
+
+    Dosya chunk_size'lik parcalarla okunur; buyuk taramalarda bellek
+    kullanimi dosya boyutundan bagimsizdir.
+    """
+    digest = hashlib.md5()
+    with open(pdf_path, 'rb') as f:
+        while True:
+            block = f.read(chunk_size or PDF_HASH_CHUNK_SIZE)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def file_fingerprint(pdf_path: Path) -> dict:
+    """
+    Hash cache anahtari: (mutlak yol, boyut, mtime_ns, inode).
+
+    Bunlardan biri degismisse dosya degismis sayilir ve hash yeniden hesaplanir.
+    """
+    stat = os.stat(pdf_path)
+    return {
+        "path": str(Path(pdf_path).resolve()),
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "inode": stat.st_ino
+    }
+
+
+def _new_entry(book_id: str, pdf_path: Path, metadata: dict = None) -> dict:
+    """Yeni kitap kaydi"""
+    return {
+        "id": book_id,
+        "filename": pdf_path.name,
+        "title": metadata.get("title", pdf_path.stem) if metadata else pdf_path.stem,
+        "pages": metadata.get("pages", 0) if metadata else 0,
+        "paragraphs": metadata.get("paragraphs", 0) if metadata else 0,
+        "ingested_at": datetime.now().isoformat(),
+        "status": "pending"  # pending | processing | ready | error
+    }
 
 
 class BookRegistry:
@@ -48,29 +90,60 @@ class BookRegistry:
         with open(self.registry_path, 'w', encoding='utf-8') as f:
             json.dump(data, f, ensure_ascii=False, indent=2)
 
+    def cached_id(self, fingerprint: dict) -> Optional[str]:
+        """Parmak izi degismemis dosyanin kayitli book_id'si (yoksa None)"""
+        cached = self._load().get("fingerprints", {}).get(fingerprint["path"])
+        if cached and all(cached.get(k) == fingerprint[k] for k in ("size", "mtime_ns", "inode")):
+            return cached["id"]
+        return None
+
+    def remember_id(self, fingerprint: dict, book_id: str):
+        """Parmak izi -> book_id eslesmesini kaydet"""
+        data = self._load()
+        data.setdefault("fingerprints", {})[fingerprint["path"]] = {
+            "size": fingerprint["size"],
+            "mtime_ns": fingerprint["mtime_ns"],
+            "inode": fingerprint["inode"],
+            "id": book_id
+        }
+        self._save(data)
+
+    def resolve_id(self, pdf_path: Path) -> str:
+        """
+        PDF'in book_id'si (MD5 hash).
+
+        Dosyanin parmak izi registry'deki kayitla ayniysa dosya okunmadan
+        cache'ten doner; degilse hash hesaplanip kaydedilir.
+        """
+        fingerprint = file_fingerprint(pdf_path)
+        book_id = self.cached_id(fingerprint)
+        if book_id is None:
+            book_id = calculate_pdf_hash(pdf_path)
+            self.remember_id(fingerprint, book_id)
+        return book_id
+
     def exists(self, pdf_path: Path) -> bool:
         """PDF zaten islenmis mi kontrol et (hash bazli)"""
-        book_hash = calculate_pdf_hash(pdf_path)
-        data = self._load()
-        return any(book["id"] == book_hash for book in data["books"])
+        return self.exists_by_id(self.resolve_id(pdf_path))
 
     def exists_by_id(self, book_id: str) -> bool:
         """Book ID ile var mi kontrol et"""
         data = self._load()
         return any(book["id"] == book_id for book in data["books"])
 
-    def add(self, pdf_path: Path, metadata: dict = None) -> str:
+    def add(self, pdf_path: Path, metadata: dict = None, book_id: str = None) -> str:
         """
         Yeni kitap ekle.
 
         Args:
             pdf_path: PDF dosya yolu
             metadata: Ek metadata (title, pages, paragraphs vb.)
+            book_id: Onceden hesaplanmis ID (None ise resolve_id)
 
         Returns:
             book_id (MD5 hash)
         """
-        book_id = calculate_pdf_hash(pdf_path)
+        book_id = book_id or self.resolve_id(pdf_path)
 
         # Zaten var mi kontrol et
         if self.exists_by_id(book_id):
@@ -78,15 +151,7 @@ class BookRegistry:
             return book_id
 
         # Yeni kitap kaydi
-        book_entry = {
-            "id": book_id,
-            "filename": pdf_path.name,
-            "title": metadata.get("title", pdf_path.stem) if metadata else pdf_path.stem,
-            "pages": metadata.get("pages", 0) if metadata else 0,
-            "paragraphs": metadata.get("paragraphs", 0) if metadata else 0,
-            "ingested_at": datetime.now().isoformat(),
-            "status": "pending"  # pending | processing | ready | error
-        }
+        book_entry = _new_entry(book_id, pdf_path, metadata)
 
         data = self._load()
         data["books"].append(book_entry)
@@ -111,6 +176,14 @@ class BookRegistry:
                 return book
         return None
 
+    def get_by_source_hash(self, source_hash: str) -> Optional[dict]:
+        """Yeni baskisi bu hash'li PDF olan (update ingest) kitap"""
+        data = self._load()
+        for book in data["books"]:
+            if book.get("source_hash") == source_hash:
+                return book
+        return None
+
     def list_all(self) -> List[dict]:
         """Tum kitaplari listele"""
         data = self._load()
@@ -177,8 +250,297 @@ class BookRegistry:
         }
 
 
+class SQLiteBookRegistry(SQLiteStore):
+    """
+    SQLite tabanli kitap kayit sistemi (BookRegistry ile ayni API).
+
+    Her islem tek indexli sorgudur; dosyanin tamami okunup yazilmaz.
+    WAL modu sayesinde okuyucular yazicilari beklemez. Sabit alanlar
+    kolon, diger metadata anahtarlari "extra" JSON kolonunda tutulur.
+    """
+
+    COLUMNS = ("id", "filename", "title", "pages", "paragraphs", "ingested_at", "status")
+
+    SCHEMA = (
+        """
+        CREATE TABLE IF NOT EXISTS books (
+            id TEXT PRIMARY KEY,
+            filename TEXT NOT NULL,
+            title TEXT NOT NULL,
+            pages INTEGER NOT NULL DEFAULT 0,
+            paragraphs INTEGER NOT NULL DEFAULT 0,
+            ingested_at TEXT NOT NULL,
+            status TEXT NOT NULL,
+            extra TEXT NOT NULL DEFAULT '{}'
+        )
+        """,
+        "CREATE INDEX IF NOT EXISTS idx_books_filename ON books(filename)",
+        "CREATE INDEX IF NOT EXISTS idx_books_status ON books(status)",
+        "CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)",
+        """
+        CREATE TABLE IF NOT EXISTS fingerprints (
+            path TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            mtime_ns INTEGER NOT NULL,
+            inode INTEGER NOT NULL,
+            book_id TEXT NOT NULL
+        )
+        """,
+    )
+
+    def __init__(self, db_path: Path = None, json_path: Path = None):
+        """
+        Args:
+            db_path: SQLite dosyasi (default: REGISTRY_DB_FILE)
+            json_path: Bir kez tasinacak eski registry.json (default: REGISTRY_FILE)
+        """
+        # RLock: ilk baglantida (lock altinda) JSON migration calisir
+        super().__init__(db_path or REGISTRY_DB_FILE, reentrant=True)
+        self.json_path = Path(json_path or REGISTRY_FILE)
+
+    def _on_open(self):
+        """Ilk acilista registry.json'u bir kez tasi"""
+        migrated = self._conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+        if not migrated:
+            self.migrate_from_json(self.json_path)
+
+    def _row_to_book(self, row) -> dict:
+        """Satiri BookRegistry formatindaki sozluge cevir"""
+        book = dict(zip(self.COLUMNS, row[:-1]))
+        if row[-1] != "{}":
+            book.update(json.loads(row[-1]))
+        return book
+
+    def _query(self, sql: str, params: tuple = ()) -> List[dict]:
+        with self._lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return [self._row_to_book(row) for row in rows]
+
+    def _insert_rows(self, books: List[dict]) -> int:
+        """Kitaplari ekle (ayni ID varsa atla), eklenen sayisi (transaction icinde cagrilir)"""
+        rows = []
+        for book in books:
+            extra = {k: v for k, v in book.items() if k not in self.COLUMNS}
+            rows.append((
+                book["id"],
+                book.get("filename", ""),
+                book.get("title", ""),
+                book.get("pages", 0),
+                book.get("paragraphs", 0),
+                book.get("ingested_at", datetime.now().isoformat()),
+                book.get("status", "pending"),
+                json.dumps(extra, ensure_ascii=False)
+            ))
+        before = self.conn.total_changes
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO books (id, filename, title, pages, paragraphs, ingested_at, status, extra) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            rows
+        )
+        return self.conn.total_changes - before
+
+    def migrate_from_json(self, json_path: Path = None) -> int:
+        """
+        registry.json'daki kitaplari tasi (bir kez; dosyaya dokunulmaz).
+
+        Returns:
+            Tasinan kitap sayisi
+        """
+        json_path = Path(json_path or self.json_path)
+        count = 0
+        with self._transaction() as conn:
+            if json_path.exists():
+                with open(json_path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                count = self._insert_rows(data.get("books", []))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO fingerprints (path, size, mtime_ns, inode, book_id) VALUES (?, ?, ?, ?, ?)",
+                    [
+                        (path, fp["size"], fp["mtime_ns"], fp["inode"], fp["id"])
+                        for path, fp in data.get("fingerprints", {}).items()
+                    ]
+                )
+                logger.info(f"Registry migrate edildi: {json_path} -> {self.db_path} ({count} kitap)")
+            conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().isoformat(),)
+            )
+        return count
+
+    def cached_id(self, fingerprint: dict) -> Optional[str]:
+        """Parmak izi degismemis dosyanin kayitli book_id'si (yoksa None)"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT book_id FROM fingerprints WHERE path = ? AND size = ? AND mtime_ns = ? AND inode = ?",
+                (fingerprint["path"], fingerprint["size"], fingerprint["mtime_ns"], fingerprint["inode"])
+            ).fetchone()
+        return row[0] if row else None
+
+    def remember_id(self, fingerprint: dict, book_id: str):
+        """Parmak izi -> book_id eslesmesini kaydet"""
+        self._write(
+            "INSERT OR REPLACE INTO fingerprints (path, size, mtime_ns, inode, book_id) VALUES (?, ?, ?, ?, ?)",
+            (fingerprint["path"], fingerprint["size"], fingerprint["mtime_ns"], fingerprint["inode"], book_id)
+        )
+
+    def resolve_id(self, pdf_path: Path) -> str:
+        """
+        PDF'in book_id'si (MD5 hash).
+
+        Dosyanin parmak izi registry'deki kayitla ayniysa dosya okunmadan
+        cache'ten doner; degilse hash hesaplanip kaydedilir.
+        """
+        fingerprint = file_fingerprint(pdf_path)
+        book_id = self.cached_id(fingerprint)
+        if book_id is None:
+            book_id = calculate_pdf_hash(pdf_path)
+            self.remember_id(fingerprint, book_id)
+        return book_id
+
+    def exists(self, pdf_path: Path) -> bool:
+        """PDF zaten islenmis mi kontrol et (hash bazli)"""
+        return self.exists_by_id(self.resolve_id(pdf_path))
+
+    def exists_by_id(self, book_id: str) -> bool:
+        """Book ID ile var mi kontrol et"""
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM books WHERE id = ?", (book_id,)).fetchone()
+        return row is not None
+
+    def add(self, pdf_path: Path, metadata: dict = None, book_id: str = None) -> str:
+        """
+        Yeni kitap ekle.
+
+        Args:
+            pdf_path: PDF dosya yolu
+            metadata: Ek metadata (title, pages, paragraphs vb.)
+            book_id: Onceden hesaplanmis ID (None ise resolve_id)
+
+        Returns:
+            book_id (MD5 hash)
+        """
+        book_id = book_id or self.resolve_id(pdf_path)
+
+        with self._transaction():
+            added = self._insert_rows([_new_entry(book_id, pdf_path, metadata)])
+
+        if not added:
+            logger.warning(f"Kitap zaten mevcut: {pdf_path.name} (ID: {book_id})")
+            return book_id
+
+        logger.info(f"Kitap eklendi: {pdf_path.name} (ID: {book_id})")
+        return book_id
+
+    def get(self, book_id: str) -> Optional[dict]:
+        """Book ID ile kitap bilgisi getir"""
+        books = self._query(f"SELECT {', '.join(self.COLUMNS)}, extra FROM books WHERE id = ?", (book_id,))
+        return books[0] if books else None
+
+    def get_by_filename(self, filename: str) -> Optional[dict]:
+        """Dosya adi ile kitap bilgisi getir"""
+        books = self._query(
+            f"SELECT {', '.join(self.COLUMNS)}, extra FROM books WHERE filename = ? ORDER BY rowid LIMIT 1",
+            (filename,)
+        )
+        return books[0] if books else None
+
+    def get_by_source_hash(self, source_hash: str) -> Optional[dict]:
+        """Yeni baskisi bu hash'li PDF olan (update ingest) kitap"""
+        books = self._query(
+            f"SELECT {', '.join(self.COLUMNS)}, extra FROM books "
+            "WHERE json_extract(extra, '$.source_hash') = ? ORDER BY rowid LIMIT 1",
+            (source_hash,)
+        )
+        return books[0] if books else None
+
+    def list_all(self) -> List[dict]:
+        """Tum kitaplari listele"""
+        return self._query(f"SELECT {', '.join(self.COLUMNS)}, extra FROM books ORDER BY rowid")
+
+    def list_ready(self) -> List[dict]:
+        """Sadece 'ready' durumundaki kitaplari listele"""
+        return self._query(
+            f"SELECT {', '.join(self.COLUMNS)}, extra FROM books WHERE status = 'ready' ORDER BY rowid"
+        )
+
+    def update_status(self, book_id: str, status: str) -> bool:
+        """
+        Kitap durumunu guncelle.
+
+        Args:
+            book_id: Kitap ID
+            status: Yeni durum (pending | processing | ready | error)
+
+        Returns:
+            Basarili mi
+        """
+        if self._write("UPDATE books SET status = ? WHERE id = ?", (status, book_id)):
+            logger.info(f"Kitap durumu guncellendi: {book_id} -> {status}")
+            return True
+        return False
+
+    def update_metadata(self, book_id: str, metadata: dict) -> bool:
+        """Kitap metadata'sini guncelle"""
+        with self._transaction() as conn:
+            row = conn.execute("SELECT extra FROM books WHERE id = ?", (book_id,)).fetchone()
+            if row is None:
+                return False
+
+            columns = {k: v for k, v in metadata.items() if k in self.COLUMNS and k != "id"}
+            extra = json.loads(row[0])
+            extra.update({k: v for k, v in metadata.items() if k not in self.COLUMNS})
+
+            assignments = ", ".join(f"{column} = ?" for column in columns)
+            conn.execute(
+                f"UPDATE books SET {assignments + ', ' if assignments else ''}extra = ? WHERE id = ?",
+                (*columns.values(), json.dumps(extra, ensure_ascii=False), book_id)
+            )
+
+        logger.info(f"Kitap metadata guncellendi: {book_id}")
+        return True
+
+    def delete(self, book_id: str) -> bool:
+        """Kitabi registry'den sil"""
+        if self._write("DELETE FROM books WHERE id = ?", (book_id,)):
+            logger.info(f"Kitap silindi: {book_id}")
+            return True
+        return False
+
+    def get_stats(self) -> dict:
+        """Registry istatistikleri"""
+        with self._lock:
+            counts = dict(self.conn.execute("SELECT status, COUNT(*) FROM books GROUP BY status").fetchall())
+            total, pages, paragraphs = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(pages), 0), COALESCE(SUM(paragraphs), 0) FROM books"
+            ).fetchone()
+        return {
+            "total_books": total,
+            "ready": counts.get("ready", 0),
+            "pending": counts.get("pending", 0),
+            "processing": counts.get("processing", 0),
+            "error": counts.get("error", 0),
+            "total_pages": pages,
+            "total_paragraphs": paragraphs
+        }
+
+
+def get_registry(backend: str = None):
+    """
+    Config'deki backend'e gore registry.
+
+    Args:
+        backend: "sqlite" | "json" (default: REGISTRY_BACKEND)
+    """
+    backend = backend or REGISTRY_BACKEND
+    if backend == "sqlite":
+        return SQLiteBookRegistry()
+    if backend == "json":
+        return BookRegistry()
+    raise ValueError(f"Bilinmeyen registry backend: {backend}")
+
+
 # Test
 if __name__ == "__main__":
-    registry = BookRegistry()
+    registry = get_registry()
     print("Registry Stats:", registry.get_stats())
     print("All Books:", registry.list_all())
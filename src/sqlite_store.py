@@ -0,0 +1,70 @@
+"""
+PageGeneral v2 - SQLite Store
+Tek dosyalik SQLite yan depolari (cache'ler, index'ler, registry) icin ortak iskelet
+"""
+
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Tuple
+
+import sys
+sys.path.append(str(Path(__file__).parent.parent))
+
+
+class SQLiteStore:
+    """
+    Lazy acilan, thread'ler arasi paylasilan SQLite baglantisi.
+
+    Alt siniflar tablolarini SCHEMA'da (CREATE ... IF NOT EXISTS ifadeleri)
+    tanimlar; baglanti ilk kullanimda WAL modunda acilir ve sema olusturulur.
+    Tum erisim self._lock altindadir: okumalar "with self._lock", yazmalar
+    _write() veya _transaction() ile yapilir.
+    """
+
+    SCHEMA: Tuple[str, ...] = ()
+
+    def __init__(self, db_path: Path, reentrant: bool = False):
+        """
+        Args:
+            db_path: SQLite dosyasi
+            reentrant: True ise RLock (lock altinda tekrar lock alan islemler icin)
+        """
+        self.db_path = Path(db_path)
+        self._lock = threading.RLock() if reentrant else threading.Lock()
+        self._conn = None
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        """Lazy SQLite baglantisi"""
+        if self._conn is None:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(str(self.db_path), timeout=30, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            for statement in self.SCHEMA:
+                conn.execute(statement)
+            conn.commit()
+            self._conn = conn
+            self._on_open()
+        return self._conn
+
+    def _on_open(self):
+        """Baglanti ilk acildiktan sonra (or. tek seferlik migration)"""
+
+    def _write(self, sql: str, params: tuple = ()) -> int:
+        """Tek yazma islemi, etkilenen satir sayisi"""
+        with self._transaction() as conn:
+            return conn.execute(sql, params).rowcount
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        """Lock altinda yazma blogu: hatasiz biterse commit, hata olursa rollback"""
+        with self._lock:
+            conn = self.conn
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
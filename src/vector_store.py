@@ -3,17 +3,341 @@ PageGeneral v2 - Vector Store
 ChromaDB ile vector storage ve semantic search
 """
 
-from typing import List, Dict, Optional
+import hashlib
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Iterator, List, Dict, Optional, Tuple
 from pathlib import Path
 
+import numpy as np
+
 import sys
 sys.path.append(str(Path(__file__).parent.parent))
 
-from config import VECTORDB_DIR, CHROMA_COLLECTION_NAME, DEFAULT_TOP_K, get_logger
+from config import (
+    VECTORDB_DIR, CHROMA_COLLECTION_NAME, DEFAULT_TOP_K, REDETECT_BATCH_SIZE,
+    INGEST_BATCH_SIZE, VECTORDB_PIPELINE_DEPTH, VECTORDB_PAGE_SIZE,
+    HYBRID_CANDIDATES, HYBRID_RRF_K, SEARCH_MANY_CHUNK_SIZE,
+    QUERY_CACHE_SIZE, QUERY_BATCHING_ENABLED, SEARCH_CACHE_ENABLED, SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_MAX_MB, SEARCH_CACHE_TTL_SECONDS, LEXICAL_INDEX_FILE, DIVISION_INDEX_FILE, get_logger
+)
 from src.embedder import Embedder
+from src.embedding_cache import normalize_text
+from src.lexical_index import LexicalIndex
+from src.division_index import DivisionIndex
+from src.query_batcher import get_query_batcher, get_batcher_stats
+from src.pdf_parser import detect_many
 
 logger = get_logger(__name__)
 
+# ChromaDB metadata'da liste yok: "division" string'i gosterim icin tutulur,
+# server-side filtre icin has_division ve tumen basina div_<no> anahtarlari
+DIVISION_KEY_PREFIX = "div_"
+
+
+def division_metadata(divisions: List[str]) -> Dict:
+    """
+    Tumen listesinin metadata karsiligi.
+
+    ["5", "36"] -> {"division": "5,36", "has_division": True,
+                    "div_5": True, "div_36": True}
+    """
+    metadata = {
+        "division": ",".join(divisions),
+        "has_division": bool(divisions)
+    }
+    for division in divisions:
+        metadata[f"{DIVISION_KEY_PREFIX}{division}"] = True
+    return metadata
+
+
+def division_update(meta: Dict, divisions: List[str], confidence: float = None) -> Optional[Dict]:
+    """
+    Mevcut metadata'yi verilen tumenlere getiren update() argumani.
+
+    Artik gecerli olmayan div_<no> anahtarlari None ile silinir.
+    Degisiklik yoksa None dondurur.
+    """
+    target = division_metadata(divisions)
+    if confidence is not None:
+        target["confidence"] = confidence
+
+    update = {key: value for key, value in target.items() if meta.get(key) != value}
+    if "division" in update and "division" in meta:
+        # "36,5" ile "5,36" ayni tumenler: sira farki icin yazma yapilmaz
+        stored = meta["division"]
+        if set(stored.split(",") if stored else []) == set(divisions):
+            del update["division"]
+    for key in meta:
+        if key.startswith(DIVISION_KEY_PREFIX) and key not in target:
+            update[key] = None
+    return update or None
+
+
+def division_where(divisions: List[str]) -> Optional[Dict]:
+    """Verilen tumenlerden en az birini iceren paragraflar icin where filtresi"""
+    conditions = [{f"{DIVISION_KEY_PREFIX}{division}": True} for division in divisions]
+    if not conditions:
+        return None
+    return conditions[0] if len(conditions) == 1 else {"$or": conditions}
+
+
+def combine_where(*filters: Optional[Dict]) -> Optional[Dict]:
+    """Bos olmayan where filtrelerini $and ile birlestir"""
+    filters = [f for f in filters if f]
+    if not filters:
+        return None
+    return filters[0] if len(filters) == 1 else {"$and": filters}
+
+
+def _format_result(doc_id: str, document: str, meta: Dict, distance: Optional[float]) -> Dict:
+    """ChromaDB kaydini arama sonucu formatina cevir"""
+    # Division string'i listeye çevir
+    division_str = meta.get("division", "")
+    return {
+        "id": doc_id,
+        "text": document,
+        "book_id": meta.get("book_id", ""),
+        "book_name": meta.get("book_name", ""),
+        "page": meta.get("page", 0),
+        "para_index": meta.get("para_index", 0),
+        "division": division_str.split(",") if division_str else [],
+        "confidence": meta.get("confidence", 0.0),
+        "distance": distance
+    }
+
+
+def page_hash(texts: List[str]) -> str:
+    """Sayfa icerik hash'i: sayfanin paragraf metinleri "\n\n" ile birlestirilir"""
+    return hashlib.md5("\n\n".join(texts).encode("utf-8")).hexdigest()
+
+
+def content_paragraph_id(
+    book_id: str,
+    page_digest: str,
+    occurrence: int,
+    ordinal: int,
+    taken: set = None
+) -> str:
+    """
+    Icerikten turetilen kararli paragraf ID'si (update ingest).
+
+    occurrence her update'te sayfa sirasindan yeniden hesaplandigi icin ayni
+    ID kitapta (korunan bir sayfada) zaten kullaniliyor olabilir; taken
+    verilirse cakisma "-1", "-2", ... ekiyle cozulur ve yeni ID taken'a eklenir.
+
+    Args:
+        book_id: Kitap ID
+        page_digest: Sayfanin page_hash'i
+        occurrence: Ayni hash'li sayfanin kitaptaki kacinci tekrari (0'dan)
+        ordinal: Paragrafin sayfa icindeki sirasi
+        taken: Kitapta mevcut (ve bu update'te verilmis) ID'ler
+    """
+    key = f"{page_digest}:{occurrence}:{ordinal}"
+    para_id = f"{book_id}_{hashlib.md5(key.encode('utf-8')).hexdigest()[:16]}"
+    if taken is None:
+        return para_id
+
+    candidate = para_id
+    suffix = 0
+    while candidate in taken:
+        suffix += 1
+        candidate = f"{para_id}-{suffix}"
+    taken.add(candidate)
+    return candidate
+
+
+def iter_chunks(
+    paragraphs: Iterable[Dict],
+    chunk_size: int,
+    page_aligned: bool = False,
+    max_size: int = None
+) -> Iterator[List[Dict]]:
+    """
+    Paragraflari chunk_size'lik chunk'lara bol.
+
+    page_aligned ise chunk chunk_size'a ulastiktan sonra ilk sayfa sinirinda
+    kesilir (bir sayfanin paragraflari ayni chunk'ta kalir). max_size
+    (client'in batch siniri) her durumda asilmaz.
+    """
+    batch = []
+    for para in paragraphs:
+        full = len(batch) >= chunk_size and (not page_aligned or para.get("page") != batch[-1].get("page"))
+        if full or (max_size and len(batch) >= max_size):
+            yield batch
+            batch = []
+        batch.append(para)
+    if batch:
+        yield batch
+
+
+class QueryEmbeddingCache:
+    """
+    Sorgu embedding'leri icin sinirli LRU cache.
+
+    Anahtar: (model adi, normalize sorgu). Modul seviyesinde tek instance
+    vardir; ayni process'teki tum VectorStore'lar paylasir.
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, model_name: str, query: str) -> Optional[List[float]]:
+        """Cache'teki embedding (yoksa None)"""
+        key = (model_name, normalize_text(query))
+        with self._lock:
+            embedding = self._items.get(key)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            # Kopya: cagiranin degisikligi paylasilan kaydi bozmaz
+            return list(embedding)
+
+    def put(self, model_name: str, query: str, embedding: List[float]):
+        """Embedding'i ekle, limit asilirsa en eskiyi sil"""
+        key = (model_name, normalize_text(query))
+        embedding = tuple(embedding)
+        with self._lock:
+            self._items[key] = embedding
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "size": len(self._items),
+            "max_size": self.max_size
+        }
+
+
+_query_embedding_cache = QueryEmbeddingCache(QUERY_CACHE_SIZE)
+
+
+def _copy_results(results: List[Dict]) -> List[Dict]:
+    """Cache'teki sonuclar cagiranin degisikliklerinden etkilenmesin"""
+    return [{**result, "division": list(result["division"])} for result in results]
+
+
+def _results_size(results: List[Dict]) -> int:
+    """Sonuc listesinin yaklasik bellek boyutu (byte)"""
+    return sum(
+        len(result["text"]) * 2 + len(result["book_name"]) * 2 + len(result["id"]) + 512
+        for result in results
+    )
+
+
+class SearchResultCache:
+    """
+    Arama sonuclari icin sinirli LRU cache.
+
+    Anahtar cagiran tarafindan uretilir ve koleksiyon versiyonunu icerir;
+    veri degisince eski kayitlar bir daha eslesmez ve LRU ile dusurulur.
+    Kayit sayisi, toplam boyut ve TTL ile sinirlidir.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> Optional[List[Dict]]:
+        """Cache'teki sonuclar (yoksa veya suresi dolduysa None)"""
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires_at, size, results = item
+            if time.monotonic() > expires_at:
+                del self._items[key]
+                self.bytes -= size
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+        return _copy_results(results)
+
+    def put(self, key: tuple, results: List[Dict]):
+        """Sonuclari ekle, limitler asilirsa en eskileri sil"""
+        results = _copy_results(results)
+        size = _results_size(results)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old[1]
+            self._items[key] = (time.monotonic() + self.ttl_seconds, size, results)
+            self.bytes += size
+            while len(self._items) > self.max_entries or self.bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self._items.popitem(last=False)
+                self.bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.bytes = 0
+            self.hits = 0
+            self.misses = 0
+            self.expired = 0
+            self.evictions = 0
+
+    def get_stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "size": len(self._items),
+            "max_size": self.max_entries,
+            "size_mb": round(self.bytes / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+            "ttl_seconds": self.ttl_seconds
+        }
+
+
+_search_result_cache = SearchResultCache(
+    SEARCH_CACHE_MAX_ENTRIES,
+    SEARCH_CACHE_MAX_MB * 1024 * 1024,
+    SEARCH_CACHE_TTL_SECONDS
+)
+
+# Koleksiyon versiyonlari: (persist_dir, koleksiyon) -> sayac. Veriyi degistiren
+# her islem artirir; arama cache anahtarlari bu degeri icerir.
+_collection_versions: Dict[tuple, int] = {}
+_collection_versions_lock = threading.Lock()
+
 
 class VectorStore:
     """
@@ -27,6 +351,12 @@ class VectorStore:
         self._client = None
         self._collection = None
         self._embedder = None
+        self._max_batch_size = None
+        self._lexical_index = None
+        self._division_index = None
+        self._migrated_version = None
+        self.last_add_timings = []
+        self.last_search_timings = {}
 
     @property
     def embedder(self) -> Embedder:
@@ -35,6 +365,57 @@ class VectorStore:
             self._embedder = Embedder()
         return self._embedder
 
+    @property
+    def version(self) -> int:
+        """Koleksiyon versiyonu (process ici; veri degisince artar)"""
+        return _collection_versions.get((str(self.persist_dir), self.collection_name), 0)
+
+    def _bump_version(self):
+        """Veri degisti: bu koleksiyon icin cache'lenmis aramalar gecersiz"""
+        key = (str(self.persist_dir), self.collection_name)
+        with _collection_versions_lock:
+            _collection_versions[key] = _collection_versions.get(key, 0) + 1
+
+    def _search_cache_key(self, kind: str, query: str, book_ids, top_k: int, divisions, *extra) -> tuple:
+        """Arama cache anahtari"""
+        return (
+            kind,
+            str(self.persist_dir),
+            self.collection_name,
+            self.version,
+            self.embedder.model_key,
+            normalize_text(query),
+            tuple(sorted(book_ids or [])),
+            top_k,
+            tuple(sorted(divisions or [])),
+            *extra
+        )
+
+    def _sidecar_path(self, default: Path) -> Path:
+        """
+        VectorDB'ye bagli SQLite index dosyasi.
+
+        Varsayilan VectorDB config'teki yolu kullanir; baska persist_dir'ler
+        kendi dizinlerinde ayri dosya tutar (birbirinin index'ini ezmez).
+        """
+        if Path(self.persist_dir).resolve() == Path(VECTORDB_DIR).resolve():
+            return default
+        return Path(self.persist_dir) / default.name
+
+    @property
+    def lexical_index(self) -> LexicalIndex:
+        """Lazy BM25 index loading"""
+        if self._lexical_index is None:
+            self._lexical_index = LexicalIndex(self._sidecar_path(LEXICAL_INDEX_FILE))
+        return self._lexical_index
+
+    @property
+    def division_index(self) -> DivisionIndex:
+        """Lazy division index loading (silme ve redetect ile senkron tutulur)"""
+        if self._division_index is None:
+            self._division_index = DivisionIndex(self._sidecar_path(DIVISION_INDEX_FILE))
+        return self._division_index
+
     @property
     def client(self):
         """Lazy ChromaDB client loading"""
@@ -60,71 +441,191 @@ class VectorStore:
             logger.info(f"Collection yuklendi: {self.collection_name}")
         return self._collection
 
-    def add_book(self, book_id: str, paragraphs: List[Dict]) -> int:
+    @property
+    def max_batch_size(self) -> Optional[int]:
+        """ChromaDB client'in tek add() cagrisinda kabul ettigi en fazla kayit"""
+        if self._max_batch_size is None:
+            get_max = getattr(self.client, "get_max_batch_size", None)
+            self._max_batch_size = get_max() if get_max else 0
+        return self._max_batch_size or None
+
+    def _prepare_chunk(self, book_id: str, paragraphs: List[Dict], offset: int) -> Dict:
+        """Paragraf chunk'ini ChromaDB add() argumanlarina cevir"""
+        # ID'ler, metinler ve metadata'lar
+        ids = []
+        documents = []
+        metadatas = []
+
+        for i, para in enumerate(paragraphs, start=offset):
+            # para_index ile ID: kitap birden fazla chunk'ta eklenebilir
+            # (update ingest icerikten turetilmis ID'yi "id" ile verir)
+            para_index = para.get("para_index", i)
+            para_id = para.get("id") or f"{book_id}_para_{para_index}"
+            ids.append(para_id)
+            documents.append(para["text"])
+
+            meta = {
+                "book_id": book_id,
+                "book_name": para.get("book_name", ""),
+                "page": para.get("page", 0),
+                "para_index": para_index,
+                "confidence": para.get("confidence", 0.0),
+                **division_metadata(para.get("division", []))
+            }
+            if para.get("page_hash"):
+                meta["page_hash"] = para["page_hash"]
+            metadatas.append(meta)
+
+        return {"ids": ids, "documents": documents, "metadatas": metadatas}
+
+    def embed_chunk(self, book_id: str, paragraphs: List[Dict], offset: int = 0) -> Dict:
+        """
+        Paragraf chunk'ini hazirla ve embed et (ChromaDB'ye yazmaz).
+
+        Returns:
+            {"ids", "documents", "metadatas", "embeddings" (float32 matris),
+             "paragraphs", "embed_seconds"}
+        """
+        start = time.perf_counter()
+        chunk = self._prepare_chunk(book_id, paragraphs, offset)
+        chunk["embeddings"] = self.embedder.embed(chunk["documents"], as_numpy=True)
+        chunk["embed_seconds"] = time.perf_counter() - start
+        chunk["paragraphs"] = paragraphs
+        return chunk
+
+    def write_chunk(self, book_id: str, chunk: Dict) -> float:
+        """
+        embed_chunk() ciktisini ChromaDB'ye (upsert) ve lexical index'e yaz.
+
+        Returns:
+            Yazma suresi (saniye)
+        """
+        # float32 matris dogrudan ChromaDB'ye gider (liste donusumu yok)
+        start = time.perf_counter()
+        self.collection.upsert(
+            ids=chunk["ids"],
+            documents=chunk["documents"],
+            embeddings=chunk["embeddings"],
+            metadatas=chunk["metadatas"]
+        )
+        self.lexical_index.add(book_id, chunk["ids"], chunk["documents"])
+        self._bump_version()
+        return time.perf_counter() - start
+
+    def add_book(
+        self,
+        book_id: str,
+        paragraphs: Iterable[Dict],
+        chunk_size: int = None,
+        on_chunk: Callable[[int, List[str], List[Dict]], None] = None,
+        page_aligned: bool = False
+    ) -> int:
         """
         Kitap paragraflarini VectorDB'ye ekle.
 
+        Paragraflar chunk'lar halinde islenir: bir producer thread chunk N+1'i
+        embed ederken chunk N ChromaDB'ye yazilir. Kuyruk sinirli oldugu icin
+        bellekte en fazla VECTORDB_PIPELINE_DEPTH + 2 chunk bulunur;
+        paragraflar generator olarak da verilebilir. Chunk basina sureler
+        self.last_add_timings'e yazilir. Yazma upsert'tur: ayni ID'li
+        paragraflar (or. yarim kalan ingest'e devam) tekrar eklenmez.
+
         Args:
             book_id: Kitap ID (hash)
-            paragraphs: Paragraf listesi, her biri:
+            paragraphs: Paragraf listesi veya generator'u, her biri:
                 {
                     "text": "Paragraf metni...",
                     "page": 241,
                     "para_index": 5,
                     "book_name": "Kitap Adi"  # opsiyonel
                 }
+            chunk_size: Chunk boyutu (default: INGEST_BATCH_SIZE,
+                client'in max batch boyutuyla sinirli)
+            on_chunk: Her chunk yazildiktan sonra (toplam eklenen, chunk'in
+                ID'leri, chunk'in paragraflari) ile cagrilir
+            page_aligned: True ise chunk'lar sayfa sinirinda biter (bkz. iter_chunks);
+                chunk bazli checkpoint'ten sayfa sayfa devam edilebilir
 
         Returns:
             Eklenen paragraf sayisi
         """
-        if not paragraphs:
-            logger.warning(f"Eklenecek paragraf yok: {book_id}")
-            return 0
+        chunk_size = chunk_size or INGEST_BATCH_SIZE
+        if self.max_batch_size:
+            chunk_size = min(chunk_size, self.max_batch_size)
+        batches = iter_chunks(paragraphs, chunk_size, page_aligned, self.max_batch_size)
 
-        # ID'ler, metinler ve metadata'lar
-        ids = []
-        documents = []
-        metadatas = []
+        chunks = queue.Queue(maxsize=VECTORDB_PIPELINE_DEPTH)
+        stop = threading.Event()
+        self.last_add_timings = []
 
-        for i, para in enumerate(paragraphs):
-            para_id = f"{book_id}_para_{i}"
-            ids.append(para_id)
-            documents.append(para["text"])
+        def put(item) -> bool:
+            # Yazici hata verdiyse producer kuyrukta sonsuza kadar beklemez
+            while not stop.is_set():
+                try:
+                    chunks.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
 
-            # Division bilgisini string'e çevir (ChromaDB list desteklemiyor)
-            divisions = para.get("division", [])
-            division_str = ",".join(divisions) if divisions else ""
+        def produce():
+            try:
+                offset = 0
+                for batch in batches:
+                    if stop.is_set():
+                        return
+                    chunk = self.embed_chunk(book_id, batch, offset)
+                    offset += len(batch)
+                    if not put(chunk):
+                        return
+                put(None)
+            except BaseException as e:
+                put(e)
 
-            metadatas.append({
-                "book_id": book_id,
-                "book_name": para.get("book_name", ""),
-                "page": para.get("page", 0),
-                "para_index": para.get("para_index", i),
-                "division": division_str,
-                "confidence": para.get("confidence", 0.0)
-            })
-
-        # Embedding'leri olustur
-        logger.info(f"{len(documents)} paragraf icin embedding olusturuluyor...")
-        embeddings = self.embedder.embed(documents)
-
-        # ChromaDB'ye ekle
-        logger.info(f"ChromaDB'ye ekleniyor: {len(ids)} paragraf")
-        self.collection.add(
-            ids=ids,
-            documents=documents,
-            embeddings=embeddings,
-            metadatas=metadatas
-        )
+        producer = threading.Thread(target=produce, name="vectordb-embed", daemon=True)
+        producer.start()
 
-        logger.info(f"Kitap eklendi: {book_id} ({len(ids)} paragraf)")
-        return len(ids)
+        added = 0
+        try:
+            while True:
+                chunk = chunks.get()
+                if chunk is None:
+                    break
+                if isinstance(chunk, BaseException):
+                    raise chunk
+
+                write_seconds = self.write_chunk(book_id, chunk)
+
+                added += len(chunk["ids"])
+                self.last_add_timings.append({
+                    "chunk": len(self.last_add_timings),
+                    "size": len(chunk["ids"]),
+                    "embed_seconds": round(chunk["embed_seconds"], 3),
+                    "write_seconds": round(write_seconds, 3)
+                })
+                logger.info(
+                    f"ChromaDB'ye eklendi: {len(chunk['ids'])} paragraf "
+                    f"(embed {chunk['embed_seconds']:.2f}s, yazma {write_seconds:.2f}s)"
+                )
+                if on_chunk:
+                    on_chunk(added, chunk["ids"], chunk["paragraphs"])
+        finally:
+            stop.set()
+            producer.join()
+
+        if not added:
+            logger.warning(f"Eklenecek paragraf yok: {book_id}")
+            return 0
+
+        logger.info(f"Kitap eklendi: {book_id} ({added} paragraf, {len(self.last_add_timings)} chunk)")
+        return added
 
     def search(
         self,
         query: str,
         book_ids: List[str] = None,
-        top_k: int = None
+        top_k: int = None,
+        divisions: List[str] = None
     ) -> List[Dict]:
         """
         Semantic search yap.
@@ -133,6 +634,8 @@ class VectorStore:
             query: Arama sorgusu
             book_ids: Sadece bu kitaplarda ara (None = hepsi)
             top_k: Dondurulecek sonuc sayisi
+            divisions: Sadece bu tumenlerden en az birini iceren
+                paragraflarda ara (ChromaDB tarafinda filtrelenir)
 
         Returns:
             Sonuc listesi:
@@ -150,53 +653,350 @@ class VectorStore:
         """
         top_k = top_k or DEFAULT_TOP_K
 
-        # Query embedding
-        query_embedding = self.embedder.embed_single(query)
+        # Ayni arama (koleksiyon degismediyse) encoder'a ve index'e gitmez
+        cache_key = None
+        if SEARCH_CACHE_ENABLED:
+            cache_key = self._search_cache_key("search", query, book_ids, top_k, divisions)
+            cached = _search_result_cache.get(cache_key)
+            if cached is not None:
+                return cached
 
-        # Where filter (kitap bazli)
-        where_filter = None
-        if book_ids:
-            if len(book_ids) == 1:
-                where_filter = {"book_id": book_ids[0]}
-            else:
-                where_filter = {"book_id": {"$in": book_ids}}
+        # Query embedding (process genelinde LRU cache)
+        query_embedding = self._embed_query(query)
+
+        # Where filter (kitap ve tumen bazli)
+        where_filter = self._search_where(book_ids, divisions)
+        local_ids = self._local_division_ids(book_ids, divisions)
+        if local_ids is not None:
+            where_filter = self._search_where(book_ids)
 
         # Search
         logger.info(f"Arama yapiliyor: '{query[:50]}...' (top_k={top_k})")
-        results = self.collection.query(
-            query_embeddings=[query_embedding],
-            n_results=top_k,
-            where=where_filter,
-            include=["documents", "metadatas", "distances"]
-        )
+        results = None
+        if local_ids is None or local_ids:
+            results = self.collection.query(
+                query_embeddings=[query_embedding],
+                ids=sorted(local_ids) if local_ids else None,
+                n_results=top_k,
+                where=where_filter,
+                include=["documents", "metadatas", "distances"]
+            )
 
         # Sonuclari formatla
         formatted_results = []
         if results and results["ids"] and results["ids"][0]:
             for i, doc_id in enumerate(results["ids"][0]):
-                meta = results["metadatas"][0][i]
-                # Division string'i listeye çevir
-                division_str = meta.get("division", "")
-                divisions = division_str.split(",") if division_str else []
-
-                formatted_results.append({
-                    "id": doc_id,
-                    "text": results["documents"][0][i],
-                    "book_id": meta.get("book_id", ""),
-                    "book_name": meta.get("book_name", ""),
-                    "page": meta.get("page", 0),
-                    "para_index": meta.get("para_index", 0),
-                    "division": divisions,
-                    "confidence": meta.get("confidence", 0.0),
-                    "distance": results["distances"][0][i] if results["distances"] else 0
-                })
+                formatted_results.append(_format_result(
+                    doc_id,
+                    results["documents"][0][i],
+                    results["metadatas"][0][i],
+                    results["distances"][0][i] if results["distances"] else 0
+                ))
+
+        if cache_key is not None:
+            _search_result_cache.put(cache_key, formatted_results)
 
         logger.info(f"Arama tamamlandi: {len(formatted_results)} sonuc")
         return formatted_results
 
+    def _search_where(self, book_ids: List[str] = None, divisions: List[str] = None) -> Optional[Dict]:
+        """Kitap ve tumen filtrelerinden where ifadesi"""
+        book_filter = None
+        if book_ids:
+            if len(book_ids) == 1:
+                book_filter = {"book_id": book_ids[0]}
+            else:
+                book_filter = {"book_id": {"$in": book_ids}}
+        return combine_where(book_filter, division_where(divisions or []))
+
+    def _local_division_ids(self, book_ids: List[str] = None, divisions: List[str] = None) -> Optional[set]:
+        """
+        Migrate edilmemis koleksiyonda tumen filtresinin yerel karsiligi.
+
+        has_division / div_<no> anahtari olmayan kayitlar ChromaDB filtresine
+        hic takilmaz (sonuc sessizce bos doner). Bu durumda "division"
+        metadata'sindan eslesen ID'ler toplanir (tam tarama) ve migrate
+        uyarisi verilir. Filtre yoksa veya koleksiyon migrate edilmisse None.
+        """
+        if not divisions or self._migrated_version == self.version:
+            return None
+        book_id = book_ids[0] if book_ids and len(book_ids) == 1 else None
+        if not self.missing_division_metadata(book_id):
+            self._migrated_version = self.version
+            return None
+
+        logger.warning("has_division metadata'si eksik, tumen filtresi yerel uygulaniyor (python run.py migrate)")
+        wanted = set(divisions)
+        ids = set()
+        for page in self.iter_paragraphs(include=["metadatas"], where=self._search_where(book_ids)):
+            for doc_id, meta in zip(page["ids"], page["metadatas"]):
+                if wanted.intersection((meta.get("division") or "").split(",")):
+                    ids.add(doc_id)
+        return ids
+
+    def iter_search_many(
+        self,
+        queries: List[str],
+        book_ids: List[str] = None,
+        top_k: int = None,
+        divisions: List[str] = None,
+        chunk_size: int = None
+    ) -> Iterator[Tuple[str, List[Dict]]]:
+        """
+        Cok sayida sorguyu toplu ara, sonuclari sorgu sirasiyla uret.
+
+        Cache'te olmayan sorgular tek embed() cagrisinda encode edilir;
+        ChromaDB'ye chunk_size'lik query_embeddings gruplari halinde gidilir.
+        Ilk chunk'in sonuclari tum sorgular bitmeden dondurulur.
+
+        Args:
+            queries: Sorgu listesi
+            book_ids: Sadece bu kitaplarda ara (None = hepsi)
+            top_k: Sorgu basina sonuc sayisi
+            divisions: Sadece bu tumenleri iceren paragraflar
+            chunk_size: Tek query() cagrisindaki sorgu sayisi
+                (default: SEARCH_MANY_CHUNK_SIZE)
+
+        Yields:
+            (sorgu, search() formatinda sonuclar)
+        """
+        top_k = top_k or DEFAULT_TOP_K
+        chunk_size = chunk_size or SEARCH_MANY_CHUNK_SIZE
+        where_filter = self._search_where(book_ids, divisions)
+        local_ids = self._local_division_ids(book_ids, divisions)
+        if local_ids is not None:
+            where_filter = self._search_where(book_ids)
+        model_key = self.embedder.model_key
+
+        # Sonuc cache'inde olanlar encoder'a ve ChromaDB'ye gitmez
+        keys = [None] * len(queries)
+        found = [None] * len(queries)
+        if SEARCH_CACHE_ENABLED:
+            keys = [self._search_cache_key("search", query, book_ids, top_k, divisions) for query in queries]
+            found = [_search_result_cache.get(key) for key in keys]
+        pending = [i for i, results in enumerate(found) if results is None]
+
+        # Query embedding'leri: cache + eksikler tek batch
+        embeddings = {i: _query_embedding_cache.get(model_key, queries[i]) for i in pending}
+        missing = [i for i in pending if embeddings[i] is None]
+        if missing:
+            encoded = self.embedder.embed([queries[i] for i in missing], as_numpy=True, use_cache=False)
+            for i, vector in zip(missing, encoded):
+                embeddings[i] = vector.tolist()
+                _query_embedding_cache.put(model_key, queries[i], embeddings[i])
+
+        logger.info(
+            f"Toplu arama: {len(queries)} sorgu ({len(queries) - len(pending)} cache'ten, "
+            f"{len(missing)} encode, top_k={top_k})"
+        )
+        for start in range(0, len(queries), chunk_size):
+            chunk = [i for i in pending if start <= i < start + chunk_size]
+            if chunk and local_ids is not None and not local_ids:
+                for i in chunk:
+                    found[i] = []
+            elif chunk:
+                results = self.collection.query(
+                    query_embeddings=[embeddings[i] for i in chunk],
+                    ids=sorted(local_ids) if local_ids else None,
+                    n_results=top_k,
+                    where=where_filter,
+                    include=["documents", "metadatas", "distances"]
+                )
+                for n, i in enumerate(chunk):
+                    found[i] = [
+                        _format_result(
+                            doc_id,
+                            results["documents"][n][j],
+                            results["metadatas"][n][j],
+                            results["distances"][n][j] if results["distances"] else 0
+                        )
+                        for j, doc_id in enumerate(results["ids"][n])
+                    ]
+                    if keys[i] is not None:
+                        _search_result_cache.put(keys[i], found[i])
+
+            for i in range(start, min(start + chunk_size, len(queries))):
+                yield queries[i], found[i]
+                found[i] = None
+
+    def search_many(
+        self,
+        queries: List[str],
+        book_ids: List[str] = None,
+        top_k: int = None,
+        divisions: List[str] = None
+    ) -> List[List[Dict]]:
+        """
+        Toplu semantic search (bkz. iter_search_many).
+
+        Returns:
+            Her sorgu icin search() formatinda sonuc listesi, ayni sirayla
+        """
+        return [results for _, results in self.iter_search_many(queries, book_ids, top_k, divisions)]
+
+    def hybrid_search(
+        self,
+        query: str,
+        book_ids: List[str] = None,
+        top_k: int = None,
+        divisions: List[str] = None,
+        candidates: int = None
+    ) -> List[Dict]:
+        """
+        BM25 + semantic search, reciprocal rank fusion ile birlestirilmis.
+
+        Iki ayak paralel calisir; tam birim adlari ve yer isimleri lexical
+        ayaktan, anlamca yakin paragraflar dense ayaktan gelir. Ayak basina
+        sureler self.last_search_timings'e yazilir.
+
+        Args:
+            query: Arama sorgusu
+            book_ids: Sadece bu kitaplarda ara (None = hepsi)
+            top_k: Dondurulecek sonuc sayisi
+            divisions: Sadece bu tumenleri iceren paragraflar
+            candidates: Ayak basina aday sayisi (default: HYBRID_CANDIDATES)
+
+        Returns:
+            search() formatinda sonuclar, ek olarak:
+            {"score": 0.032, "dense_rank": 1, "lexical_rank": 4}
+            (distance ve rank'ler o ayakta bulunmayanlar icin None)
+        """
+        top_k = top_k or DEFAULT_TOP_K
+        depth = max(top_k, candidates or HYBRID_CANDIDATES)
+
+        cache_key = None
+        if SEARCH_CACHE_ENABLED:
+            cache_key = self._search_cache_key("hybrid", query, book_ids, top_k, divisions, depth)
+            cached = _search_result_cache.get(cache_key)
+            if cached is not None:
+                self.last_search_timings = {"cached": True}
+                return cached
+
+        def timed(func, *args):
+            start = time.perf_counter()
+            result = func(*args)
+            return result, (time.perf_counter() - start) * 1000
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            dense_future = executor.submit(timed, self.search, query, book_ids, depth, divisions)
+            lexical_future = executor.submit(timed, self._lexical_ranking, query, depth, book_ids, divisions)
+            dense, dense_ms = dense_future.result()
+            lexical, lexical_ms = lexical_future.result()
+
+        start = time.perf_counter()
+        records = {result["id"]: result for result in dense}
+
+        # Sadece lexical ayakta bulunanlarin metin/metadata'si
+        missing = [para_id for para_id in lexical if para_id not in records]
+        if missing:
+            fetched = self.collection.get(ids=missing, include=["documents", "metadatas"])
+            for doc_id, document, meta in zip(fetched["ids"], fetched["documents"], fetched["metadatas"]):
+                records[doc_id] = _format_result(doc_id, document, meta, None)
+
+        rankings = {
+            "dense_rank": [result["id"] for result in dense],
+            "lexical_rank": [para_id for para_id in lexical if para_id in records]
+        }
+        scores = {}
+        for field, ranking in rankings.items():
+            for rank, doc_id in enumerate(ranking, start=1):
+                scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (HYBRID_RRF_K + rank)
+                records[doc_id][field] = rank
+
+        fused = []
+        for doc_id in sorted(scores, key=scores.get, reverse=True)[:top_k]:
+            record = records[doc_id]
+            record["score"] = round(scores[doc_id], 6)
+            record.setdefault("dense_rank", None)
+            record.setdefault("lexical_rank", None)
+            fused.append(record)
+        fusion_ms = (time.perf_counter() - start) * 1000
+
+        if cache_key is not None:
+            _search_result_cache.put(cache_key, fused)
+
+        self.last_search_timings = {
+            "dense_ms": round(dense_ms, 2),
+            "lexical_ms": round(lexical_ms, 2),
+            "fusion_ms": round(fusion_ms, 2)
+        }
+        logger.info(
+            f"Hybrid arama: {len(fused)} sonuc (dense {len(dense)}, lexical {len(lexical)}; "
+            f"{dense_ms:.1f} / {lexical_ms:.1f} / {fusion_ms:.1f} ms)"
+        )
+        return fused
+
+    def _lexical_ranking(
+        self,
+        query: str,
+        depth: int,
+        book_ids: List[str] = None,
+        divisions: List[str] = None
+    ) -> List[str]:
+        """
+        hybrid_search'un BM25 ayagi: en iyi depth paragraf ID'si.
+
+        Tumen bilgisi lexical index'te yok; tumen filtresi varsa BM25
+        siralamasi buyuyen sayfalarla okunur ve her sayfa VectorDB'de
+        (sadece ID'ler) filtrelenir. Filtreyi gecen depth aday bulununca
+        (veya eslesmeler bitince) durulur; filtre ilk depth adaydan sonra
+        uygulanip lexical ayak bosalmaz.
+        """
+        if not divisions:
+            return [para_id for para_id, _ in self.lexical_index.search(query, depth, book_ids)]
+
+        where_filter = division_where(divisions)
+        local_ids = self._local_division_ids(book_ids, divisions)
+        ranking = []
+        offset = 0
+        page_size = depth
+        while len(ranking) < depth:
+            hits = self.lexical_index.search(query, page_size, book_ids, offset=offset)
+            if not hits:
+                break
+            ids = [para_id for para_id, _ in hits]
+            if local_ids is not None:
+                allowed = local_ids
+            else:
+                allowed = set(self.collection.get(ids=ids, where=where_filter, include=[])["ids"])
+            ranking.extend(para_id for para_id in ids if para_id in allowed)
+            if len(hits) < page_size:
+                break
+            offset += len(hits)
+            page_size = min(page_size * 2, self.max_batch_size or INGEST_BATCH_SIZE)
+        return ranking[:depth]
+
+    def _embed_query(self, query: str) -> List[float]:
+        """
+        Sorgu embedding'i.
+
+        Tekrar eden sorgular encoder'a gitmez; cache'te olmayanlar
+        (QUERY_BATCHING_ENABLED ise) eszamanli sorgularla birlikte tek
+        batch'te encode edilir.
+        """
+        embedding = _query_embedding_cache.get(self.embedder.model_key, query)
+        if embedding is None:
+            if QUERY_BATCHING_ENABLED:
+                embedding = get_query_batcher(self.embedder).embed(query)
+            else:
+                embedding = self.embedder.embed_single(query, use_cache=False)
+            _query_embedding_cache.put(self.embedder.model_key, query, embedding)
+        return embedding
+
+    def get_cache_stats(self) -> Dict:
+        """Arama cache istatistikleri"""
+        return {
+            "query_embeddings": _query_embedding_cache.get_stats(),
+            "search_results": _search_result_cache.get_stats(),
+            "query_batcher": get_batcher_stats()
+        }
+
     def delete_book(self, book_id: str) -> bool:
-        """Kitabi VectorDB'den sil"""
+        """Kitabi VectorDB'den (ve BM25 / division index'lerinden) sil"""
         try:
+            self.lexical_index.delete_book(book_id)
+            self.division_index.delete_book(book_id)
+
             # Bu kitaba ait tum ID'leri bul
             results = self.collection.get(
                 where={"book_id": book_id},
@@ -205,6 +1005,7 @@ class VectorStore:
 
             if results and results["ids"]:
                 self.collection.delete(ids=results["ids"])
+                self._bump_version()
                 logger.info(f"Kitap silindi: {book_id} ({len(results['ids'])} paragraf)")
                 return True
             else:
@@ -214,6 +1015,246 @@ class VectorStore:
             logger.error(f"Kitap silme hatasi: {e}")
             return False
 
+    def page_map(self, book_id: str) -> Dict[Tuple[str, int], List[str]]:
+        """
+        Kitabin sayfa icerik haritasi (update ingest'te degismeyen sayfalar icin).
+
+        page_hash metadata'si olmayan (eski) kayitlarda hash, sayfanin
+        metinlerinden para_index sirasiyla hesaplanir.
+
+        Returns:
+            {(page_hash, tekrar no): [paragraf ID'leri, sayfa ici sirayla]}
+        """
+        groups = {}
+        for batch in self.iter_paragraphs(book_id):
+            for para_id, document, meta in zip(batch["ids"], batch["documents"], batch["metadatas"]):
+                key = (meta.get("page", 0), meta.get("page_hash"))
+                groups.setdefault(key, []).append((meta.get("para_index", 0), para_id, document))
+
+        pages = {}
+        occurrences = {}
+        for (_, stored_hash), paragraphs in sorted(groups.items(), key=lambda item: (item[0][0], item[0][1] or "")):
+            paragraphs.sort()
+            digest = stored_hash or page_hash([document for _, _, document in paragraphs])
+            occurrence = occurrences.get(digest, 0)
+            occurrences[digest] = occurrence + 1
+            pages[(digest, occurrence)] = [para_id for _, para_id, _ in paragraphs]
+        return pages
+
+    def delete_paragraphs(self, ids: List[str]) -> int:
+        """Verilen paragraflari VectorDB'den ve BM25 / division index'lerinden sil"""
+        if not ids:
+            return 0
+        batch_size = self.max_batch_size or INGEST_BATCH_SIZE
+        for start in range(0, len(ids), batch_size):
+            self.collection.delete(ids=ids[start:start + batch_size])
+        self.lexical_index.delete(ids)
+        self.division_index.delete_paragraphs(ids)
+        self._bump_version()
+        return len(ids)
+
+    def update_paragraph_metadata(self, ids: List[str], metadatas: List[Dict]) -> int:
+        """Paragraflarin metadata'sini guncelle (update() birlestirir, embedding'e dokunulmaz)"""
+        if not ids:
+            return 0
+        batch_size = self.max_batch_size or INGEST_BATCH_SIZE
+        for start in range(0, len(ids), batch_size):
+            self.collection.update(
+                ids=ids[start:start + batch_size],
+                metadatas=metadatas[start:start + batch_size]
+            )
+        self._bump_version()
+        return len(ids)
+
+    def iter_paragraphs(
+        self,
+        book_id: str = None,
+        page_size: int = None,
+        include: List[str] = None,
+        where: Dict = None
+    ) -> Iterator[Dict]:
+        """
+        Kayitli paragraflari sayfa sayfa (limit/offset) oku.
+
+        Tek seferde en fazla page_size paragraf bellekte tutulur; tum
+        koleksiyonu tek get() ile cekmek yerine export/ozet gibi islemler
+        bu iterator'u kullanir.
+
+        Args:
+            book_id: Sadece bu kitap (None = hepsi)
+            page_size: Sayfa boyutu (default: VECTORDB_PAGE_SIZE)
+            include: ChromaDB include listesi (default: documents + metadatas)
+            where: Ek where filtresi (book_id ile $and'lenir)
+
+        Yields:
+            {"ids": [...], "documents": [...], "metadatas": [...],
+             "embeddings": (n, dim) float32 matris veya None}
+        """
+        page_size = page_size or VECTORDB_PAGE_SIZE
+        include = include if include is not None else ["documents", "metadatas"]
+        where_filter = combine_where({"book_id": book_id} if book_id else None, where)
+        offset = 0
+
+        while True:
+            page = self.collection.get(
+                where=where_filter,
+                limit=page_size,
+                offset=offset,
+                include=include
+            )
+            if not page or not page["ids"]:
+                return
+
+            embeddings = page.get("embeddings") if "embeddings" in include else None
+            yield {
+                "ids": page["ids"],
+                "documents": page.get("documents"),
+                "metadatas": page.get("metadatas"),
+                "embeddings": np.asarray(embeddings, dtype=np.float32) if embeddings is not None else None
+            }
+
+            offset += len(page["ids"])
+            if len(page["ids"]) < page_size:
+                return
+
+    def _update_metadata_batches(
+        self,
+        where_filter: Optional[Dict],
+        batch_size: int,
+        compute: Callable[[Dict], List[Optional[Dict]]],
+        include: List[str],
+        on_update: Callable[[Dict, List[str], List[Dict]], None] = None
+    ) -> Dict:
+        """
+        Koleksiyonu sayfa sayfa oku, compute(batch) ile hesaplanan metadata
+        degisikliklerini update() ile yaz.
+
+        compute her kayit icin update sozlugu veya None (degisiklik yok) dondurur.
+        on_update(batch, ids, updates) her yazilan batch'ten sonra cagrilir.
+        """
+        start = time.perf_counter()
+        scanned = 0
+        updated = 0
+
+        for batch in self.iter_paragraphs(page_size=batch_size, include=include, where=where_filter):
+            update_ids = []
+            update_metadatas = []
+            for doc_id, update in zip(batch["ids"], compute(batch)):
+                if update:
+                    update_ids.append(doc_id)
+                    update_metadatas.append(update)
+
+            if update_ids:
+                # update() metadata'yi birlestirir, diger alanlar korunur
+                self.collection.update(ids=update_ids, metadatas=update_metadatas)
+                self._bump_version()
+                if on_update:
+                    on_update(batch, update_ids, update_metadatas)
+
+            scanned += len(batch["ids"])
+            updated += len(update_ids)
+
+        return {
+            "scanned": scanned,
+            "updated": updated,
+            "seconds": round(time.perf_counter() - start, 2)
+        }
+
+    def redetect_divisions(self, book_id: str = None, batch_size: int = None) -> Dict:
+        """
+        Kayitli paragraflarda division detection'i yeniden calistir.
+
+        DIVISION_PATTERNS degistiginde yeniden ingest/embedding gerekmez:
+        dokumanlar batch'ler halinde okunur, sadece degisen paragraflarin
+        division metadata'si (division, has_division, div_<no>, confidence)
+        guncellenir. Degisen paragraflarin division index kayitlari da
+        ayni batch'te yenilenir.
+
+        Args:
+            book_id: Sadece bu kitap (None = hepsi)
+            batch_size: Okuma/yazma batch boyutu (default: config'den)
+
+        Returns:
+            {"scanned": 335, "updated": 12, "seconds": 0.8}
+        """
+        def compute(batch: Dict) -> List[Optional[Dict]]:
+            detections = detect_many(batch["documents"])
+            return [
+                division_update(meta, divisions, confidence)
+                for meta, (divisions, confidence) in zip(batch["metadatas"], detections)
+            ]
+
+        def sync_division_index(batch: Dict, ids: List[str], updates: List[Dict]):
+            records = dict(zip(batch["ids"], zip(batch["documents"], batch["metadatas"])))
+            documents = []
+            metadatas = []
+            for para_id, update in zip(ids, updates):
+                document, meta = records[para_id]
+                merged = {**meta, **update}
+                documents.append(document)
+                metadatas.append({key: value for key, value in merged.items() if value is not None})
+            self.division_index.delete_paragraphs(ids)
+            self.division_index.add_records(ids, documents, metadatas)
+
+        result = self._update_metadata_batches(
+            {"book_id": book_id} if book_id else None,
+            batch_size or REDETECT_BATCH_SIZE,
+            compute,
+            include=["documents", "metadatas"],
+            on_update=sync_division_index
+        )
+        logger.info(
+            f"Division detection yenilendi: {result['scanned']} paragraf tarandi, "
+            f"{result['updated']} guncellendi ({result['seconds']}s)"
+        )
+        return result
+
+    def migrate_division_metadata(self, batch_size: int = None) -> Dict:
+        """
+        Eski koleksiyonlara has_division / div_<no> anahtarlarini ekle.
+
+        Sadece mevcut "division" string'i kullanilir; metin ve embedding
+        okunmaz. Tekrar calistirmak guvenlidir (guncel kayitlar atlanir).
+
+        Returns:
+            {"scanned": 335, "updated": 335, "seconds": 0.4}
+        """
+        def compute(batch: Dict) -> List[Optional[Dict]]:
+            updates = []
+            for meta in batch["metadatas"]:
+                division_str = meta.get("division", "")
+                updates.append(division_update(meta, division_str.split(",") if division_str else []))
+            return updates
+
+        result = self._update_metadata_batches(
+            None,
+            batch_size or REDETECT_BATCH_SIZE,
+            compute,
+            include=["metadatas"]
+        )
+        logger.info(
+            f"Division metadata migrate edildi: {result['scanned']} paragraf tarandi, "
+            f"{result['updated']} guncellendi ({result['seconds']}s)"
+        )
+        return result
+
+    def missing_division_metadata(self, book_id: str = None) -> bool:
+        """
+        has_division anahtari olmayan (migrate edilmemis) kayit var mi.
+
+        Bu kayitlar has_division / div_<no> filtrelerine hic takilmaz;
+        tek kayitlik bir get() ile kontrol edilir.
+        """
+        missing = self.collection.get(
+            where=combine_where(
+                {"book_id": book_id} if book_id else None,
+                {"has_division": {"$nin": [True, False]}}
+            ),
+            limit=1,
+            include=[]
+        )
+        return bool(missing and missing["ids"])
+
     def get_book_stats(self, book_id: str) -> Dict:
         """Kitap istatistikleri"""
         results = self.collection.get(
@@ -0,0 +1,112 @@
+"""
+Ortak test fixture'lari: model yuklemeyen embedder, gecici VectorStore ve pipeline
+"""
+
+import sys
+import hashlib
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+from src.ingest import IngestPipeline
+from src.pdf_parser import PDFParser
+from src.registry import SQLiteBookRegistry
+from src.vector_store import VectorStore
+
+
+class StubEmbedder:
+    """Model yuklemeden metinden turetilen sabit vektorler"""
+    workers = 1
+    model_key = "stub"
+
+    def embed(self, texts, batch_size=None, as_numpy=False, use_cache=True):
+        vectors = np.zeros((len(texts), 8), dtype=np.float32)
+        for i, text in enumerate(texts):
+            vectors[i] = np.frombuffer(hashlib.md5(text.encode()).digest()[:8], dtype=np.uint8)
+        return vectors if as_numpy else vectors.tolist()
+
+    def embed_single(self, text, use_cache=True):
+        return self.embed([text])[0]
+
+    def stop_pool(self):
+        pass
+
+
+def write_pdf(path: Path, pages):
+    """Her sayfada paragraf basina bir satir olan minimal PDF (Helvetica, ASCII metin)"""
+    count = len(pages)
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [" + b" ".join(b"%d 0 R" % (4 + 2 * i) for i in range(count)) + b"] /Count %d >>" % count,
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for i, text in enumerate(pages):
+        lines = [
+            f"BT /F1 12 Tf 72 {720 - 60 * n} Td ({para}) Tj ET"
+            for n, para in enumerate(text.split("\n\n"))
+        ]
+        stream = "\n".join(lines).encode("latin-1")
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % (5 + 2 * i)
+        )
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+
+    data = b"%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    data += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(data)
+    return path
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """make_pdf("kitap.pdf", ["sayfa 1 metni", ...]) -> gecici PDF yolu"""
+    return lambda name, pages: write_pdf(tmp_path / name, pages)
+
+
+@pytest.fixture
+def make_store(tmp_path):
+    """Gecici dizinde VectorStore (index'ler persist_dir altinda); ayni isimle ayni store"""
+    stores = {}
+
+    def make(name: str = "vectordb") -> VectorStore:
+        if name not in stores:
+            stores[name] = VectorStore(persist_dir=tmp_path / name)
+            stores[name]._embedder = StubEmbedder()
+        return stores[name]
+
+    return make
+
+
+@pytest.fixture
+def store(make_store) -> VectorStore:
+    return make_store()
+
+
+@pytest.fixture
+def make_pipeline(tmp_path, make_store):
+    """store_name basina ayri registry ve VectorStore ile IngestPipeline"""
+
+    def make(name: str = "vectordb", parse_workers: int = 1) -> IngestPipeline:
+        pipeline = IngestPipeline.__new__(IngestPipeline)
+        pipeline.parser = PDFParser(workers=parse_workers, use_cache=False)
+        pipeline.registry = SQLiteBookRegistry(tmp_path / f"{name}_registry.sqlite", tmp_path / f"{name}_registry.json")
+        pipeline.vector_store = make_store(name)
+        pipeline.division_index = pipeline.vector_store.division_index
+        return pipeline
+
+    return make
+
+
+@pytest.fixture
+def pipeline(make_pipeline) -> IngestPipeline:
+    return make_pipeline()
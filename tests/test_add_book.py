@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Test: VectorStore.add_book pipeline'i (producer hatalari, yazici hatasi)
+Calistirma: python -m pytest tests/test_add_book.py
+"""
+
+import sys
+import threading
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+
+def paragraphs(count, fail_at=None):
+    for i in range(count):
+        if i == fail_at:
+            raise ValueError("bozuk sayfa")
+        yield {"text": f"paragraf {i}", "page": i // 3 + 1, "para_index": i}
+
+
+def producer_threads():
+    return [t for t in threading.enumerate() if t.name == "vectordb-embed"]
+
+
+def test_parse_error_reaches_caller(store):
+    with pytest.raises(ValueError, match="bozuk sayfa"):
+        store.add_book("kitap", paragraphs(20, fail_at=13), chunk_size=4)
+    # Hatadan onceki chunk'lar yazildi, producer thread kapandi
+    assert store.collection.count() == 12
+    assert producer_threads() == []
+
+
+def test_embed_error_reaches_caller(store, monkeypatch):
+    def embed(texts, **kwargs):
+        raise RuntimeError("encode hatasi")
+
+    monkeypatch.setattr(store.embedder, "embed", embed)
+    with pytest.raises(RuntimeError, match="encode hatasi"):
+        store.add_book("kitap", paragraphs(10), chunk_size=4)
+    assert store.collection.count() == 0
+    assert producer_threads() == []
+
+
+def test_writer_error_stops_producer(store):
+    def on_chunk(added, ids, chunk):
+        raise RuntimeError("index hatasi")
+
+    # Kuyruk dolu olsa bile producer beklemede kalmaz
+    with pytest.raises(RuntimeError, match="index hatasi"):
+        store.add_book("kitap", paragraphs(200), chunk_size=4, on_chunk=on_chunk)
+    assert store.collection.count() == 4
+    assert producer_threads() == []
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test: Division metadata'si ve index'in VectorStore islemleriyle senkronu
+Calistirma: python -m pytest tests/test_division_index.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.vector_store as vector_store_module
+from src.vector_store import division_update
+from src.query import DivisionQuery
+
+
+def add_book(store, book_id, paragraphs):
+    """(metin, tumenler) listesini kitap olarak ekle, index'i ingest gibi doldur"""
+    paragraphs = [
+        {"text": text, "page": page, "division": divisions, "book_name": book_id}
+        for page, (text, divisions) in enumerate(paragraphs, start=1)
+    ]
+    store.add_book(
+        book_id,
+        paragraphs,
+        on_chunk=lambda added, ids, chunk: store.division_index.add_paragraphs(book_id, ids, chunk)
+    )
+
+
+def indexed_ids(store, division):
+    return sorted(hit["id"] for hit in store.division_index.lookup(division))
+
+
+def test_delete_book_updates_index(store):
+    add_book(store, "kitap1", [("24. Tümen ilerledi.", ["24"])])
+    add_book(store, "kitap2", [("24. Tümen geri çekildi.", ["24"])])
+    assert indexed_ids(store, "24") == ["kitap1_para_0", "kitap2_para_0"]
+
+    assert store.delete_book("kitap1")
+    assert indexed_ids(store, "24") == ["kitap2_para_0"]
+
+    store.delete_paragraphs(["kitap2_para_0"])
+    assert store.division_index.get_stats()["paragraphs"] == 0
+
+
+def test_redetect_updates_index(store):
+    # Eski pattern'lerle kaydedilmis metadata: biri eksik, biri artik gecersiz
+    add_book(store, "kitap", [
+        ("36. Fırka kuzeyde savunmada.", []),
+        ("Ordu karargâhı ikmal istedi.", ["5"]),
+    ])
+    assert store.division_index.get_stats()["paragraphs"] == 1
+    assert indexed_ids(store, "36") == []
+
+    result = store.redetect_divisions()
+    assert result["updated"] == 2
+    assert indexed_ids(store, "36") == ["kitap_para_0"]
+    # Tumeni kalmayan paragrafin kaydi silindi
+    assert store.division_index.get_stats() == {"paragraphs": 1, "mentions": 1, "divisions": 1}
+
+
+def test_division_update_ignores_order():
+    meta = {"division": "36,5", "has_division": True, "div_5": True, "div_36": True}
+    assert division_update(meta, ["5", "36"]) is None
+    assert division_update(meta, ["5"]) == {"division": "5", "div_36": None}
+
+
+def test_division_filter_on_unmigrated_collection(store):
+    add_book(store, "kitap", [("24. Tümen ilerledi.", ["24"]), ("Hava soğuk.", [])])
+    # Eski koleksiyon: has_division / div_<no> anahtarlari yok
+    store.collection.update(
+        ids=["kitap_para_0", "kitap_para_1"],
+        metadatas=[{"has_division": None, "div_24": None}, {"has_division": None}]
+    )
+    assert store.missing_division_metadata()
+
+    query = DivisionQuery.__new__(DivisionQuery)
+    query.vector_store = store
+    paragraphs, embeddings = query.get_all_paragraphs(only_with_divisions=True, as_matrix=True)
+    assert [p["document"] for p in paragraphs] == ["24. Tümen ilerledi."]
+    assert embeddings.shape == (1, 8)
+
+    store.migrate_division_metadata()
+    assert not store.missing_division_metadata()
+    assert len(query.get_all_paragraphs(only_with_divisions=True)) == 1
+
+
+def test_search_divisions_on_unmigrated_collection(store, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", False)
+    monkeypatch.setattr(vector_store_module, "SEARCH_CACHE_ENABLED", False)
+    add_book(store, "kitap", [("24. Tümen ilerledi.", ["24"]), ("36. Fırka geri çekildi.", ["36"])])
+    store.collection.update(
+        ids=["kitap_para_0", "kitap_para_1"],
+        metadatas=[{"has_division": None, "div_24": None}, {"has_division": None, "div_36": None}]
+    )
+
+    assert [r["id"] for r in store.search("ilerleme", top_k=5, divisions=["24"])] == ["kitap_para_0"]
+    assert [r["id"] for r in store.search_many(["ilerleme"], top_k=5, divisions=["36"])[0]] == ["kitap_para_1"]
+    assert store.search("ilerleme", top_k=5, divisions=["9"]) == []
+    hybrid = store.hybrid_search("Tümen", top_k=5, divisions=["24"])
+    assert [r["id"] for r in hybrid] == ["kitap_para_0"]
+
+
+def test_redetect_is_idempotent(store):
+    add_book(store, "kitap1", [("5. Tümen 7 alay ile ilerledi.", []), ("Hava soğuk.", ["9"])])
+    add_book(store, "kitap2", [("24 üncü Tümen 1915 kışında.", ["24"])])
+
+    first = store.redetect_divisions()
+    assert first["scanned"] == 3 and first["updated"] == 3
+    metadata = store.collection.get(include=["metadatas"])
+    stats = store.division_index.get_stats()
+
+    # Degismeyen pattern'lerle ikinci tur hicbir kaydi yeniden yazmaz
+    second = store.redetect_divisions()
+    assert second["scanned"] == 3 and second["updated"] == 0
+    assert store.collection.get(include=["metadatas"]) == metadata
+    assert store.division_index.get_stats() == stats
+    assert indexed_ids(store, "7") == ["kitap1_para_0"]
+    assert indexed_ids(store, "9") == []
+
+    # Tek kitapla sinirli redetect diger kitaba dokunmaz
+    assert store.redetect_divisions(book_id="kitap2")["scanned"] == 1
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test: Embedder batch planlama ve backend fallback'i (model yuklenmez)
+Calistirma: python -m pytest tests/test_embedder.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+import src.embedder as embedder_module
+from src.embedder import Embedder, get_model, resolve_backend
+
+
+class FakeTokenizer:
+    """Kelime sayisi = token sayisi"""
+
+    def __call__(self, texts, **kwargs):
+        return {"input_ids": [[0] * len(text.split()) for text in texts]}
+
+
+class FakeModel:
+    """encode() cagrilarinin batch boyutlarini kaydeder"""
+    max_seq_length = 128
+
+    def __init__(self, sign=1.0, tokenizer=True):
+        self.sign = sign
+        self.tokenizer = FakeTokenizer() if tokenizer else None
+        self.batch_sizes = []
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False, convert_to_numpy=True):
+        self.batch_sizes.append(len(texts))
+        vectors = np.ones((len(texts), 4), dtype=np.float32)
+        vectors[:, 0] = self.sign
+        return vectors
+
+
+def test_token_batches_respect_batch_size():
+    model = FakeModel()
+    embedder_module._models["test/batch-model"] = model
+    embedder = Embedder(model_name="test/batch-model", backend="torch", use_cache=False)
+    texts = [f"kisa paragraf {i}" for i in range(300)]
+
+    embedder.embed(texts)
+    assert max(model.batch_sizes) == embedder_module.EMBEDDING_MAX_BATCH_SIZE
+
+    model.batch_sizes.clear()
+    embeddings = embedder.embed(texts, batch_size=16, as_numpy=True)
+    assert max(model.batch_sizes) == 16
+    assert sum(model.batch_sizes) == len(texts) == len(embeddings)
+
+
+def test_rejected_backend_uses_torch_key(monkeypatch):
+    model_name = "test/fallback-model"
+    loads = []
+
+    def load_backend(name, backend):
+        loads.append(backend)
+        # int8 torch ile ters yonde: uyum -1, backend reddedilir
+        return FakeModel(1.0 if backend == "torch" else -1.0, tokenizer=False)
+
+    monkeypatch.setattr(embedder_module, "_load_backend", load_backend)
+    embedder = Embedder(model_name=model_name, backend="int8", use_cache=False)
+
+    assert embedder.model_key == model_name
+    assert resolve_backend(model_name, "int8") == "torch"
+    # torch isteyen ikinci bir kopya yuklemez
+    assert get_model(model_name, backend="torch") is get_model(model_name, backend="int8")
+    assert loads == ["torch", "int8"]
+
+
+class PoolModel(FakeModel):
+    """Yeni API: encode(pool=...)"""
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False, convert_to_numpy=True, pool=None):
+        assert pool == "pool"
+        return np.array([[len(text), 0, 0, 0] for text in texts], dtype=np.float32)
+
+
+class LegacyPoolModel(FakeModel):
+    """Eski API: sadece encode_multi_process"""
+
+    def encode_multi_process(self, texts, pool, batch_size=32):
+        assert pool == "pool"
+        return np.array([[len(text), 0, 0, 0] for text in texts], dtype=np.float32)
+
+
+def test_pool_encode_uses_available_api(monkeypatch):
+    texts = ["a", "ccc", "bb"]
+    for name, model in [("test/pool-model", PoolModel()), ("test/legacy-pool-model", LegacyPoolModel())]:
+        embedder_module._models[name] = model
+        embedder = Embedder(model_name=name, backend="torch", use_cache=False)
+        monkeypatch.setattr(embedder, "start_pool", lambda: "pool")
+        # Uzunluga gore siralanip gonderilir, orijinal sirada doner
+        assert embedder._encode_pool(texts, 8)[:, 0].tolist() == [1, 3, 2]
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test: Sayfa hizali chunk'lama ve checkpoint'ten devam (resume)
+Calistirma: python -m pytest tests/test_ingest_resume.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.ingest import checkpoint_after, resume_page, skip_committed
+from src.vector_store import iter_chunks
+
+
+def make_paragraphs(page_sizes):
+    """Sayfa basina verilen sayida paragraf (para_index sirali)"""
+    paragraphs = []
+    for page, size in enumerate(page_sizes, start=1):
+        for i in range(size):
+            paragraphs.append({"text": f"s{page}p{i}", "page": page, "para_index": len(paragraphs)})
+    return paragraphs
+
+
+def parse_from(paragraphs, first_page):
+    """iter_paragraphs(page_range=(first_page, None)) yerine"""
+    return [para for para in paragraphs if para["page"] >= first_page]
+
+
+def simulate_crash_and_resume(page_sizes, chunk_size, max_size, crash_after):
+    """crash_after batch yazildiktan sonra cokme; resume'da uretilenleri dondur"""
+    paragraphs = make_paragraphs(page_sizes)
+    chunks = list(iter_chunks(paragraphs, chunk_size, page_aligned=True, max_size=max_size))
+
+    checkpoint = None
+    for batch_no, chunk in enumerate(chunks[:crash_after]):
+        checkpoint = checkpoint_after(batch_no, chunk, checkpoint)
+
+    committed = [para for chunk in chunks[:crash_after] for para in chunk]
+    resumed = list(skip_committed(parse_from(paragraphs, resume_page(checkpoint)), checkpoint))
+    return paragraphs, committed, resumed, checkpoint
+
+
+def test_iter_chunks_page_aligned():
+    paragraphs = make_paragraphs([3] * 7)
+    sizes = [len(c) for c in iter_chunks(paragraphs, 4, page_aligned=True)]
+    assert sizes == [6, 6, 6, 3]
+    for chunk in iter_chunks(paragraphs, 4, page_aligned=True):
+        assert chunk[-1]["para_index"] % 3 == 2  # her chunk sayfa sonunda biter
+
+
+def test_iter_chunks_not_aligned():
+    paragraphs = make_paragraphs([3] * 7)
+    assert [len(c) for c in iter_chunks(paragraphs, 4)] == [4, 4, 4, 4, 4, 1]
+
+
+def test_iter_chunks_max_size_splits_page():
+    paragraphs = make_paragraphs([10, 2])
+    sizes = [len(c) for c in iter_chunks(paragraphs, 4, page_aligned=True, max_size=4)]
+    assert sizes == [4, 4, 4]
+    assert sum(sizes) == len(paragraphs)
+
+
+def test_resume_after_page_boundary():
+    paragraphs, committed, resumed, checkpoint = simulate_crash_and_resume([3] * 7, 4, None, 2)
+    assert checkpoint["page"] == 4 and checkpoint["page_paragraphs"] == 3
+    assert committed + resumed == paragraphs
+
+
+def test_resume_after_mid_page_split():
+    # chunk_size == client siniri: 10 paragraflik sayfa iki batch'e bolunur
+    paragraphs, committed, resumed, checkpoint = simulate_crash_and_resume([2, 10, 3], 4, 4, 2)
+    assert checkpoint["page"] == 2 and checkpoint["page_paragraphs"] == 6
+    assert committed + resumed == paragraphs
+    assert resumed[0]["para_index"] == checkpoint["paragraphs"]
+
+
+def test_resume_page_spanning_several_batches():
+    for crash_after in range(1, 6):
+        paragraphs, committed, resumed, _ = simulate_crash_and_resume([1, 13, 2], 3, 3, crash_after)
+        assert committed + resumed == paragraphs
+
+
+def test_resume_legacy_checkpoint():
+    # page_paragraphs olmayan eski checkpoint: sayfa tamamen yazilmis sayilir
+    paragraphs = make_paragraphs([2, 2, 2])
+    checkpoint = {"batch": 0, "page": 1, "paragraphs": 2}
+    resumed = list(skip_committed(parse_from(paragraphs, resume_page(checkpoint)), checkpoint))
+    assert resumed == paragraphs[2:]
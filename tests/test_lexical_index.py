@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test: BM25 index (toplu ekle/sil) ve hybrid_search tumen filtresi
+Calistirma: python -m pytest tests/test_lexical_index.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.vector_store as vector_store_module
+from src.lexical_index import LexicalIndex
+
+
+def test_add_replaces_and_delete(tmp_path):
+    index = LexicalIndex(tmp_path / "lexical.sqlite")
+    ids = [f"kitap_para_{i}" for i in range(2000)]
+    index.add("kitap", ids, [f"rapor {i}" for i in range(2000)])
+    index.add("kitap", ids[:3], ["Sarıkamış", "Erzurum", "Kars"])
+    assert index.get_stats() == {"paragraphs": 2000, "books": 1}
+    assert [para_id for para_id, _ in index.search("Sarikamis", 5)] == ["kitap_para_0"]
+
+    index.delete(ids[:1500])
+    assert index.get_stats()["paragraphs"] == 500
+    assert index.search("Sarikamis", 5) == []
+    assert len(index.search("rapor", 1000)) == 500
+
+
+def test_hybrid_division_filter_beyond_lexical_depth(store, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", False)
+    monkeypatch.setattr(vector_store_module, "SEARCH_CACHE_ENABLED", False)
+
+    # BM25'te en iyi 30 eslesme tumensiz; tumenli paragraf uzun (dusuk skor)
+    paragraphs = [{"text": f"Sarıkamış raporu {i}", "page": 1, "division": []} for i in range(30)]
+    paragraphs.append({
+        "text": "Sarıkamış yonunde 24. Tümen " + " ".join(["ilerledi"] * 40),
+        "page": 2,
+        "division": ["24"]
+    })
+    store.add_book("kitap", paragraphs)
+
+    results = store.hybrid_search("Sarıkamış", top_k=5, divisions=["24"], candidates=5)
+    assert [result["id"] for result in results] == ["kitap_para_30"]
+    assert results[0]["lexical_rank"] == 1
+
+
+def test_sidecars_follow_persist_dir(tmp_path, make_store):
+    first = make_store("a")
+    second = make_store("b")
+    assert first.lexical_index.db_path == tmp_path / "a" / "lexical_index.sqlite"
+    assert first.division_index.db_path != second.division_index.db_path
+
+    first.lexical_index.add("kitap", ["kitap_para_0"], ["Sarıkamış"])
+    assert second.lexical_index.get_stats()["paragraphs"] == 0
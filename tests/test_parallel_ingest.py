@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test: Paralel ingest_folder sirali ingest ile ayni sonucu uretir
+Calistirma: python -m pytest tests/test_parallel_ingest.py
+"""
+
+import sys
+import shutil
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import config
+import src.ingest as ingest_module
+
+
+@pytest.fixture
+def folder(tmp_path, make_pdf, monkeypatch):
+    monkeypatch.setattr(config, "PROCESSED_DIR", tmp_path / "processed")
+    config.PROCESSED_DIR.mkdir()
+    # Kitap basina birkac chunk
+    monkeypatch.setattr(ingest_module, "INGEST_BATCH_SIZE", 2)
+
+    folder = tmp_path / "input"
+    folder.mkdir()
+    for book in ("a", "b", "c"):
+        make_pdf(f"input/{book}.pdf", [f"{book} kitabi {n}. Tumen sayfa {n}" for n in range(1, 6)])
+    shutil.copy(folder / "a.pdf", folder / "a_kopya.pdf")
+    (folder / "bozuk.pdf").write_bytes(b"pdf degil")
+    return folder
+
+
+def summary(result):
+    return [(r["status"], r["book_id"], r.get("paragraphs"), r.get("pages")) for r in result["results"]]
+
+
+def stored(pipeline):
+    records = pipeline.vector_store.collection.get(include=["documents", "metadatas"])
+    return sorted(zip(records["ids"], records["documents"], [sorted(m.items()) for m in records["metadatas"]]))
+
+
+def test_parallel_matches_sequential(folder, make_pipeline):
+    sequential = make_pipeline("sirali")
+    parallel = make_pipeline("paralel")
+
+    expected = sequential.ingest_folder(folder)
+    result = parallel.ingest_folder(folder, parallel=True, parse_workers=2)
+
+    assert summary(result) == summary(expected)
+    assert (result["processed"], result["skipped"], result["errors"]) == (3, 1, 1)
+    assert stored(parallel) == stored(sequential)
+    assert len(stored(parallel)) == 15
+    assert parallel.division_index.get_stats() == sequential.division_index.get_stats()
+    assert parallel.vector_store.lexical_index.get_stats() == sequential.vector_store.lexical_index.get_stats()
+    assert parallel.registry.get_stats() == sequential.registry.get_stats()
+
+    # Ikinci calisma: yuklu kitaplar parse edilmeden atlanir
+    again = parallel.ingest_folder(folder, parallel=True, parse_workers=2)
+    assert (again["processed"], again["skipped"], again["errors"]) == (0, 4, 1)
+    assert len(stored(parallel)) == 15
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test: PDF parser (paralel/sıralı parse, sayfa cache'i) ve division detection
+Calistirma: python -m pytest tests/test_pdf_parser.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import src.pdf_parser as pdf_parser_module
+from src.page_cache import PageTextCache
+from src.pdf_parser import PDFParser, detect_divisions, detect_many, get_detector
+
+PAGES = [f"{n}. Tumen sayfa {n}\n\nHava soguk {n}" for n in range(1, 8)]
+
+
+def test_parallel_parse_matches_sequential(make_pdf):
+    pdf_path = make_pdf("kitap.pdf", PAGES)
+    sequential = list(PDFParser(workers=1, use_cache=False).iter_pages(pdf_path))
+    parallel = list(PDFParser(workers=3, pages_per_task=2, use_cache=False).iter_pages(pdf_path))
+
+    assert parallel == sequential
+    assert [page_no for page_no, _, _ in sequential] == list(range(1, 8))
+    assert sequential[1][2][0]["division"] == ["2"]
+
+
+def test_page_range_with_page_cache(tmp_path, make_pdf, monkeypatch):
+    pdf_path = make_pdf("kitap.pdf", PAGES)
+    expected = list(PDFParser(workers=1, use_cache=False).iter_pages(pdf_path))
+    parser = PDFParser(workers=2, pages_per_task=2, use_cache=False)
+    parser.page_cache = PageTextCache(tmp_path / "page_cache.sqlite")
+
+    assert list(parser.iter_pages(pdf_path, page_range=(3, 5))) == expected[2:5]
+    assert parser.page_cache.get_stats()["entries"] == 3
+
+    # Kalan sayfalar cikarilir, cache'tekiler pypdf'e gitmez
+    assert list(parser.iter_pages(pdf_path)) == expected
+    assert parser.page_cache.get_stats()["entries"] == 7
+
+    def no_extract(*args):
+        raise AssertionError("cache'teki sayfa yeniden cikarildi")
+
+    monkeypatch.setattr(pdf_parser_module, "_extract_pages", no_extract)
+    assert list(parser.iter_pages(pdf_path, page_range=(6, None))) == expected[5:]
+    assert [p["page"] for p in parser.iter_paragraphs(pdf_path, page_range=(2, 2))] == [2]
+
+
+def test_overlapping_patterns_all_match():
+    # Farklı pattern'lerin örtüşen eşleşmeleri eski findall davranışıyla aynı
+    assert set(detect_divisions("5. Tümen 7 alay")[0]) == {"5", "7"}
+    assert set(detect_divisions("24 üncü Tümen 1915")[0]) == {"24", "191"}
+
+
+def test_detect_many_matches_detect():
+    texts = ["Sarıkamış harekâtı", "9 uncu Tümen ve 10th Division", "5. Tümen 7 alay", ""]
+    assert detect_many(texts) == [detect_divisions(text) for text in texts]
+    assert detect_many(texts)[0] == ([], 0.0)
+
+
+def test_find_spans_sorted():
+    text = "5. Tümen 7 alay"
+    spans = get_detector().find(text)
+    assert [div for div, _, _ in spans] == ["5", "7"]
+    assert all(text[start:end].lower().count("tümen") == 1 for _, start, end in spans)
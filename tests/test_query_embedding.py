@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Test: Sorgu embedding'leri (kalici cache'e yazilmaz, paylasilan kayit korunur)
+Calistirma: python -m pytest tests/test_query_embedding.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+import pytest
+
+import src.embedder as embedder_module
+import src.vector_store as vector_store_module
+from src.embedder import Embedder
+from src.embedding_cache import EmbeddingCache
+
+MODEL_NAME = "test/fake-model"
+
+
+class FakeModel:
+    """Metin uzunlugundan turetilen 4 boyutlu vektorler"""
+
+    def encode(self, texts, batch_size=None, show_progress_bar=False, convert_to_numpy=True):
+        return np.array([[len(text), 1.0, 2.0, 3.0] for text in texts], dtype=np.float32)
+
+
+@pytest.fixture
+def query_store(tmp_path, store):
+    """Gercek Embedder (sahte model) ve gecici kalici cache ile VectorStore"""
+    embedder_module._models[MODEL_NAME] = FakeModel()
+    embedder = Embedder(model_name=MODEL_NAME, backend="torch", use_cache=False)
+    embedder.cache = EmbeddingCache(tmp_path / "embedding_cache.sqlite")
+    store._embedder = embedder
+    return store
+
+
+def cached_entries(store):
+    return store.embedder.cache.get_stats()["entries"]
+
+
+def test_query_embeddings_skip_persistent_cache(query_store, monkeypatch):
+    store = query_store
+    vector_store_module._query_embedding_cache.clear()
+
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", False)
+    assert store._embed_query("24. tumen nerede?")[0] == len("24. tumen nerede?")
+
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", True)
+    store._embed_query("36. firka nerede?")
+    assert cached_entries(store) == 0
+
+    # Ingest yolu cache'i kullanmaya devam eder
+    store.embedder.embed(["5 nci Kafkas Tumeni"])
+    assert cached_entries(store) == 1
+
+
+def test_cached_query_embedding_is_a_copy(query_store, monkeypatch):
+    store = query_store
+    vector_store_module._query_embedding_cache.clear()
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", False)
+
+    first = store._embed_query("Sarikamis")
+    first[0] = -1.0
+    assert store._embed_query("Sarikamis")[0] == len("Sarikamis")
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test: Arama sonuc cache'i (koleksiyon degisince gecersiz olur)
+Calistirma: python -m pytest tests/test_search_cache.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+import src.vector_store as vector_store_module
+from src.vector_store import VectorStore
+
+
+@pytest.fixture
+def cached_store(store, monkeypatch):
+    monkeypatch.setattr(vector_store_module, "QUERY_BATCHING_ENABLED", False)
+    monkeypatch.setattr(vector_store_module, "SEARCH_CACHE_ENABLED", True)
+    vector_store_module._search_result_cache.clear()
+    store.add_book("kitap1", [{"text": "24. Tümen Sarıkamış", "page": 1, "division": ["24"]}])
+    return store
+
+
+def ids(results):
+    return sorted(result["id"] for result in results)
+
+
+def hits():
+    return vector_store_module._search_result_cache.get_stats()["hits"]
+
+
+def test_repeated_search_is_cached(cached_store):
+    first = cached_store.search("Sarıkamış", top_k=5)
+    assert cached_store.search("Sarıkamış", top_k=5) == first
+    cached_store.hybrid_search("Sarıkamış", top_k=5)
+    cached_store.hybrid_search("Sarıkamış", top_k=5)
+    assert hits() == 2
+
+
+def test_add_invalidates(cached_store):
+    assert ids(cached_store.search("Sarıkamış", top_k=5)) == ["kitap1_para_0"]
+    assert ids(cached_store.hybrid_search("Sarıkamış", top_k=5)) == ["kitap1_para_0"]
+
+    cached_store.add_book("kitap2", [{"text": "Sarıkamış kış", "page": 1, "division": []}])
+    assert ids(cached_store.search("Sarıkamış", top_k=5)) == ["kitap1_para_0", "kitap2_para_0"]
+    assert ids(cached_store.hybrid_search("Sarıkamış", top_k=5)) == ["kitap1_para_0", "kitap2_para_0"]
+    assert hits() == 0
+
+
+def test_delete_invalidates(cached_store):
+    cached_store.add_book("kitap2", [{"text": "Sarıkamış kış", "page": 1, "division": []}])
+    assert len(cached_store.search_many(["Sarıkamış"], top_k=5)[0]) == 2
+
+    cached_store.delete_book("kitap2")
+    assert ids(cached_store.search_many(["Sarıkamış"], top_k=5)[0]) == ["kitap1_para_0"]
+
+    cached_store.delete_paragraphs(["kitap1_para_0"])
+    assert cached_store.search("Sarıkamış", top_k=5) == []
+    assert hits() == 0
+
+
+def test_metadata_update_invalidates(cached_store):
+    assert ids(cached_store.search("Sarıkamış", top_k=5, divisions=["36"])) == []
+
+    cached_store.update_paragraph_metadata(["kitap1_para_0"], [{"division": "24,36", "div_36": True}])
+    assert ids(cached_store.search("Sarıkamış", top_k=5, divisions=["36"])) == ["kitap1_para_0"]
+
+    # Ayni dizini kullanan baska bir VectorStore da ayni versiyonu gorur
+    other = VectorStore(persist_dir=cached_store.persist_dir)
+    other._embedder = cached_store.embedder
+    assert other.search("Sarıkamış", top_k=5, divisions=["36"])[0]["division"] == ["24", "36"]
+    cached_store.update_paragraph_metadata(["kitap1_para_0"], [{"division": "24", "div_36": None}])
+    assert other.search("Sarıkamış", top_k=5, divisions=["36"]) == []
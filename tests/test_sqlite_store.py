@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test: SQLite yan depolarinin ortak iskeleti (lazy baglanti, transaction)
+Calistirma: python -m pytest tests/test_sqlite_store.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import pytest
+
+from src.sqlite_store import SQLiteStore
+
+
+class CounterStore(SQLiteStore):
+    SCHEMA = ("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER NOT NULL)",)
+
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.opened = 0
+
+    def _on_open(self):
+        self.opened += 1
+
+    def values(self):
+        with self._lock:
+            return dict(self.conn.execute("SELECT name, value FROM counters").fetchall())
+
+
+def test_lazy_connection_and_write(tmp_path):
+    store = CounterStore(tmp_path / "sub" / "store.sqlite")
+    assert store._conn is None
+    assert store._write("INSERT INTO counters VALUES (?, ?)", ("a", 1)) == 1
+    assert store.values() == {"a": 1}
+    assert store.opened == 1
+    assert store.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_transaction_rolls_back_on_error(tmp_path):
+    store = CounterStore(tmp_path / "store.sqlite")
+    store._write("INSERT INTO counters VALUES (?, ?)", ("a", 1))
+
+    with pytest.raises(RuntimeError):
+        with store._transaction() as conn:
+            conn.execute("UPDATE counters SET value = 2 WHERE name = 'a'")
+            conn.execute("INSERT INTO counters VALUES ('b', 1)")
+            raise RuntimeError("yarida kaldi")
+
+    assert store.values() == {"a": 1}
+    # Baska bir baglanti da sadece commit edilmis veriyi gorur
+    assert CounterStore(tmp_path / "store.sqlite").values() == {"a": 1}
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Test: Sayfa bazli update ingest (tekrarlanan sayfalar, ID cakismalari)
+Calistirma: python -m pytest tests/test_update_ingest.py
+"""
+
+import sys
+from pathlib import Path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.vector_store import content_paragraph_id
+
+PAGES = {"A": ["a1", "a2"], "X": ["x1"], "Y": ["y1"]}
+
+
+def set_edition(pipeline, pdf_path, edition, layout):
+    """PDF yerine sayfa duzeni (or. "XXA"): her baski farkli bayt = farkli hash"""
+    pdf_path.write_bytes(f"baski {edition}".encode())
+    pages = [PAGES[name] for name in layout]
+
+    def iter_pages(pdf_path, page_range=None, pdf_hash=None):
+        first = (page_range[0] if page_range else None) or 1
+        for page_no, texts in enumerate(pages, start=1):
+            if page_no >= first:
+                paragraphs = [{"text": text, "page": page_no, "division": [], "confidence": 0.0} for text in texts]
+                yield page_no, "\n\n".join(texts), paragraphs
+
+    pipeline.parser.iter_pages = iter_pages
+    pipeline.parser.get_page_count = lambda pdf_path, pdf_hash=None: len(pages)
+    pipeline.parser.iter_paragraphs = lambda pdf_path, page_range=None, write_markdown=False, pdf_hash=None: (
+        para for _, _, paragraphs in iter_pages(pdf_path, page_range) for para in paragraphs
+    )
+    return [text for texts in pages for text in texts]
+
+
+def stored(pipeline, book_id):
+    records = pipeline.vector_store.collection.get(where={"book_id": book_id})
+    return records["ids"], sorted(records["documents"])
+
+
+def test_content_id_skips_taken():
+    base = content_paragraph_id("book", "digest", 1, 0)
+    taken = {base, f"{base}-1"}
+    para_id = content_paragraph_id("book", "digest", 1, 0, taken)
+    assert para_id == f"{base}-2"
+    assert para_id in taken
+    assert content_paragraph_id("book", "digest", 1, 0, set()) == base
+
+
+def test_update_duplicate_pages(tmp_path, pipeline):
+    pdf_path = tmp_path / "kitap.pdf"
+
+    set_edition(pipeline, pdf_path, 0, "AX")
+    book_id = pipeline.ingest_pdf(pdf_path, "Kitap")["book_id"]
+
+    for edition, layout in enumerate(["AAX", "XAAA", "AYA"], start=1):
+        expected = set_edition(pipeline, pdf_path, edition, layout)
+        assert pipeline.update_pdf(pdf_path, book_id)["status"] == "success"
+        ids, documents = stored(pipeline, book_id)
+        assert len(ids) == len(set(ids)) == len(expected)
+        assert documents == sorted(expected)
+
+
+def test_update_after_interrupted_update(tmp_path, pipeline):
+    # Yarida kalan update: yeni sayfalar yazildi, eskiler silinmedi ve sayfa
+    # numaralari guncellenmedi -> ayni hash'li sayfalarin sirasi degisir
+    pdf_path = tmp_path / "kitap.pdf"
+
+    set_edition(pipeline, pdf_path, 0, "XXA")
+    book_id = pipeline.ingest_pdf(pdf_path, "Kitap")["book_id"]
+
+    set_edition(pipeline, pdf_path, 1, "AA")
+    delete_paragraphs = pipeline.vector_store.delete_paragraphs
+
+    def failing_delete(ids):
+        raise RuntimeError("disk dolu")
+
+    pipeline.vector_store.delete_paragraphs = failing_delete
+    assert pipeline.update_pdf(pdf_path, book_id)["status"] == "error"
+    pipeline.vector_store.delete_paragraphs = delete_paragraphs
+
+    # Iki ardisik update: tekrarlanan sayfaya verilen ID korunan bir kayitla cakismamali
+    for edition, layout in [(2, "A"), (3, "AA")]:
+        expected = set_edition(pipeline, pdf_path, edition, layout)
+        assert pipeline.update_pdf(pdf_path, book_id)["status"] == "success"
+        ids, documents = stored(pipeline, book_id)
+        assert len(ids) == len(set(ids)) == len(expected)
+        assert documents == sorted(expected)